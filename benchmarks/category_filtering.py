@@ -0,0 +1,68 @@
+"""
+Benchmark of the category filtering of the tokens of a large document.
+
+The hierarchy of `TokenCategory` is compiled once to bitmasks, so `TokenCategory.is_child` and
+`TokenCategory.valid` are bit operations. This benchmark compares them with the previous approach, which walked the
+hierarchy dictionary recursively on every call, and times the category filters of `get_all_tokens` and of the export.
+
+Usage:
+    python benchmarks/category_filtering.py
+    python benchmarks/category_filtering.py test/resources/legacy/chor048.krn --repeat 20
+"""
+import argparse
+import time
+
+import kernpy as kp
+
+FILTERS = [
+    [kp.TokenCategory.CORE],
+    [kp.TokenCategory.NOTE_REST, kp.TokenCategory.BARLINES],
+    [kp.TokenCategory.SIGNATURES, kp.TokenCategory.COMMENTS],
+]
+
+
+def recursive_is_child(parent: kp.TokenCategory, child: kp.TokenCategory, tree: dict) -> bool:
+    # Previous behaviour of TokenCategoryHierarchyMapper._is_child, kept here as the reference of the benchmark
+    if len(tree.keys()) == 0:
+        return False
+    return any(direct_child == child or recursive_is_child(direct_child, child, tree[parent])
+               for direct_child in tree.get(parent, {}))
+
+
+def timed(callback, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        callback()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the category filtering of the tokens.')
+    parser.add_argument('path', nargs='?', default='test/resources/merge/expected_merge_bach_x2.krn',
+                        help='The **kern file to filter.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of repetitions of every measure.')
+    args = parser.parse_args()
+
+    document = kp.Importer().import_file(args.path)
+    categories = [token.category for token in document.get_all_tokens()]
+    parents = [kp.TokenCategory.CORE, kp.TokenCategory.SIGNATURES, kp.TokenCategory.COMMENTS]
+    hierarchy = kp.TokenCategoryHierarchyMapper.hierarchy
+    print(f'{args.path}: {len(categories)} tokens')
+
+    elapsed_recursive = timed(lambda: [recursive_is_child(parent, category, hierarchy)
+                                       for category in categories for parent in parents], args.repeat)
+    elapsed_bits = timed(lambda: [kp.TokenCategory.is_child(child=category, parent=parent)
+                                  for category in categories for parent in parents], args.repeat)
+    print(f'is_child, recursive walk: {elapsed_recursive * 1000:8.2f} ms')
+    print(f'is_child, bitmasks:       {elapsed_bits * 1000:8.2f} ms')
+
+    for filter_by_categories in FILTERS:
+        names = ', '.join(category.name for category in filter_by_categories)
+        elapsed_tokens = timed(lambda: document.get_all_tokens(filter_by_categories), args.repeat)
+        options = kp.ExportOptions(token_categories=kp.TokenCategory.valid(include=set(filter_by_categories)))
+        elapsed_export = timed(lambda: kp.Exporter().export_string(document, options), args.repeat)
+        print(f'[{names}] get_all_tokens: {elapsed_tokens * 1000:8.2f} ms, export: {elapsed_export * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
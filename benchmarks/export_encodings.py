@@ -0,0 +1,90 @@
+"""
+Benchmark of the export of a corpus to every `Encoding`.
+
+The exporter keeps one tokenizer per encoding, category set and clef, and renders every token once per export.
+This benchmark compares the export of every document with the previous approach, which created a tokenizer (and its
+nested tokenizers) for every exported cell, and with the time spent writing the exported files. It also compares the
+export of every encoding one by one with `Exporter.export_many`, which traverses every document once.
+
+Usage:
+    python benchmarks/export_encodings.py
+    python benchmarks/export_encodings.py 'test/resources/mozart/*.krn'
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import kernpy as kp
+
+
+def export_per_cell(document: kp.Document, options: kp.ExportOptions) -> int:
+    # Previous behaviour of Exporter.export_token, kept here as the reference of the benchmark
+    cells = 0
+    for stage in document.tree.stages[1:]:
+        for node in stage:
+            last_clef = node.last_signature_nodes.nodes.get('ClefToken', None)
+            tokenizer = kp.TokenizerFactory.create(options.kern_type.value, token_categories=options.token_categories,
+                                                   last_clef_reference=last_clef.token if last_clef else None)
+            try:
+                tokenizer.tokenize(node.token)
+            except Exception:
+                pass  # e.g. the agnostic encodings of the tokens without a clef
+            cells += 1
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the export of a corpus to every encoding.')
+    parser.add_argument('pattern', nargs='?', default='test/resources/legacy/*.krn', help='Glob of the **kern files.')
+    args = parser.parse_args()
+
+    documents = []
+    for path in sorted(glob.glob(args.pattern)):
+        document, errors = kp.load(path)
+        if not errors:
+            documents.append(document)
+    print(f'{len(documents)} documents')
+
+    elapsed_one_by_one = 0
+    with tempfile.TemporaryDirectory() as output_dir:
+        for encoding in kp.Encoding:
+            options = kp.ExportOptions(kern_type=encoding)
+
+            start = time.perf_counter()
+            contents = []
+            for document in documents:
+                try:
+                    contents.append(kp.Exporter().export_string(document, options))
+                except Exception:
+                    contents.append('')  # e.g. the agnostic encodings of the scores without a clef
+            elapsed_export = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for document in documents:
+                export_per_cell(document, options)
+            elapsed_per_cell = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for index, content in enumerate(contents):
+                with open(os.path.join(output_dir, f'{index}.krn'), 'w') as file:
+                    file.write(content)
+            elapsed_write = time.perf_counter() - start
+
+            print(f'{encoding.name:21} export: {elapsed_export:7.3f} s, '
+                  f'tokenizer per cell (tokenize only): {elapsed_per_cell:7.3f} s, write: {elapsed_write:7.3f} s')
+            elapsed_one_by_one += elapsed_export
+
+        start = time.perf_counter()
+        for document in documents:
+            try:
+                kp.Exporter().export_many(document, kp.ExportOptions())
+            except Exception:
+                pass  # e.g. the agnostic encodings of the scores without a clef
+        elapsed_many = time.perf_counter() - start
+        print(f'all the encodings, one by one: {elapsed_one_by_one:7.3f} s, export_many: {elapsed_many:7.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of the conversion of a document to the integer ids of a vocabulary.
+
+`Exporter.export_ids` converts every exported cell to its id while it is rendered: the exported text is not built.
+This benchmark compares it with the previous approach, which exported the text and split it again into tokens to look
+up their ids. Both traverse the document in the same way, so the difference is the cost of the text.
+
+Usage:
+    python benchmarks/export_ids.py
+    python benchmarks/export_ids.py test/resources/legacy/chor048.krn --repeat 20
+"""
+import argparse
+import time
+from array import array
+
+import kernpy as kp
+
+
+def ids_by_text(document: kp.Document, options: kp.ExportOptions, vocabulary: kp.Vocabulary) -> array:
+    # Previous approach (export the text and tokenize it again), kept here as the reference of the benchmark
+    ids = array('i')
+    for line in kp.Exporter().export_string(document, options).splitlines():
+        for token in line.split('\t'):
+            ids.append(vocabulary.get_id(token))
+            ids.append(vocabulary.column_separator_id)
+        ids[-1] = vocabulary.row_separator_id
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the export of a document to integer ids.')
+    parser.add_argument('path', nargs='?', default='test/resources/merge/expected_merge_bach_x2.krn',
+                        help='The **kern file to export.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of exports of the document.')
+    args = parser.parse_args()
+
+    document, _ = kp.load(args.path)
+
+    for encoding in [kp.Encoding.normalizedKern, kp.Encoding.eKern, kp.Encoding.bEkern]:
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=encoding,
+                                   token_categories=kp.TokenCategory.valid(include=kp.BEKERN_CATEGORIES))
+        vocabulary = kp.Vocabulary().fit(document, options)
+        assert ids_by_text(document, options, vocabulary) == kp.Exporter().export_ids(document, options, vocabulary)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            ids_by_text(document, options, vocabulary)
+        elapsed_text = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            kp.Exporter().export_ids(document, options, vocabulary)
+        elapsed_ids = time.perf_counter() - start
+
+        print(f'{encoding.name:15} {args.repeat} exports, text and split: {elapsed_text:7.3f} s, '
+              f'export_ids: {elapsed_ids:7.3f} s')
+
+
+if __name__ == '__main__':
+    main()
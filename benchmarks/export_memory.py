@@ -0,0 +1,72 @@
+"""
+Benchmark of the memory and time used to export a large score to a file.
+
+`Exporter.export_to` writes every row to the stream as soon as it is exported, and `Exporter.export_string` is a
+wrapper over `io.StringIO`. This benchmark compares them with the previous approach, which collected all the rows in a
+list and concatenated them in a string before writing the file.
+
+Usage:
+    python benchmarks/export_memory.py
+    python benchmarks/export_memory.py --measures 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import kernpy as kp
+
+
+def export_concatenating(document: kp.Document, options: kp.ExportOptions) -> str:
+    # Previous behaviour of Exporter.export_string, kept here as the reference of the benchmark
+    rows = [line.split('\t') for line in kp.Exporter().export_lines(document, options)]
+    result = ""
+    for row in rows:
+        result += '\t'.join(row)
+    return result
+
+
+def measured(callback) -> (float, float):
+    tracemalloc.start()
+    start = time.perf_counter()
+    callback()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the memory used to export a large document.')
+    parser.add_argument('--measures', type=int, default=5000, help='Number of measures of the exported score.')
+    args = parser.parse_args()
+
+    measure = '4c\t4e\n8d\t4f\n8e\t.\n2f\t2g\n'
+    content = ('**kern\t**kern\n*clefF4\t*clefG2\n*M4/4\t*M4/4\n'
+               + ''.join(f'={number}\t={number}\n{measure}' for number in range(1, args.measures + 1))
+               + '*-\t*-\n')
+    document = kp.Importer().import_string(content)
+    options = kp.ExportOptions(kern_type=kp.Encoding.eKern)
+    print(f'{args.measures} measures: {len(document.tree.stages)} rows')
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, 'score.krn')
+
+        def write_concatenated():
+            with open(path, 'w') as f:
+                f.write(export_concatenating(document, options))
+
+        def write_streamed():
+            with open(path, 'w') as f:
+                kp.Exporter().export_to(document, options, f)
+
+        for name, callback in [('rows list + concatenation', write_concatenated),
+                               ('export_to (streamed)', write_streamed),
+                               ('export_string', lambda: kp.Exporter().export_string(document, options))]:
+            elapsed, peak = measured(callback)
+            print(f'{name:26} {elapsed:7.3f} s, peak memory: {peak:8.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark of many small exports of a document with the same options.
+
+`ExportOptions.compile` validates the options once and selects the exported spines of every stage once, so the exports
+that reuse the `ExportPlan` only render the tokens. This benchmark compares the export of every measure of a document
+with the options, which are compiled again by every export, and with one plan.
+
+Usage:
+    python benchmarks/export_plan.py
+    python benchmarks/export_plan.py test/resources/legacy/chor048.krn --repeat 20
+"""
+import argparse
+import time
+
+import kernpy as kp
+
+
+def export_measures(document: kp.Document, options, repeat: int) -> int:
+    exporter = kp.Exporter()
+    count = 0
+    for _ in range(repeat):
+        for measure in range(1, len(document.measure_index) + 1):
+            exporter.export_string(document.measure(measure), options)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the exports with a compiled ExportPlan.')
+    parser.add_argument('path', nargs='?', default='test/resources/merge/expected_merge_bach_x2.krn',
+                        help='The **kern file to export.')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of exports of every measure.')
+    args = parser.parse_args()
+
+    document, _ = kp.load(args.path)
+
+    for encoding in [kp.Encoding.normalizedKern, kp.Encoding.eKern, kp.Encoding.agnosticExtendedKern]:
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=encoding,
+                                   token_categories=kp.TokenCategory.valid(include=kp.BEKERN_CATEGORIES))
+
+        start = time.perf_counter()
+        count = export_measures(document, options, args.repeat)
+        elapsed_options = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plan = options.compile(document)
+        export_measures(document, plan, args.repeat)
+        elapsed_plan = time.perf_counter() - start
+
+        print(f'{encoding.name:21} {count} exports, ExportOptions: {elapsed_options:7.3f} s, '
+              f'ExportPlan: {elapsed_plan:7.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of the export of all the fragments of N measures of a document.
+
+`Exporter.export_fragments` exports all the windows of a document in one pass: the context of every window comes
+from the measure index, and every token is rendered once for all the windows. This benchmark compares it with the
+previous approach, which called `export_string` once per window.
+
+Usage:
+    python benchmarks/fragments.py
+    python benchmarks/fragments.py test/resources/legacy/chor048.krn --window 8 --stride 4
+"""
+import argparse
+import time
+
+import kernpy as kp
+
+
+def export_one_by_one(document: kp.Document, options: kp.ExportOptions, window: int, stride: int) -> int:
+    # Previous approach (one export per window, like extract_and_save_measures), kept here as the reference of the
+    # benchmark. The measure ranges of export_string do not include the barline that opens the window.
+    count = 0
+    for from_measure in range(1, len(document.measure_start_tree_stages) - window + 2, stride):
+        options.from_measure = from_measure
+        options.to_measure = from_measure + window - 1
+        kp.Exporter().export_string(document, options)
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the export of the fragments of a document.')
+    parser.add_argument('path', nargs='?', default='test/resources/merge/expected_merge_bach_x2.krn',
+                        help='The **kern file to export.')
+    parser.add_argument('--window', type=int, default=4, help='Number of measures of every fragment.')
+    parser.add_argument('--stride', type=int, default=1, help='Measures between consecutive fragments.')
+    args = parser.parse_args()
+
+    document, _ = kp.load(args.path)
+
+    for encoding in [kp.Encoding.normalizedKern, kp.Encoding.eKern, kp.Encoding.agnosticExtendedKern]:
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=encoding,
+                                   token_categories=kp.TokenCategory.valid(include=kp.BEKERN_CATEGORIES))
+
+        start = time.perf_counter()
+        count = export_one_by_one(document, options, args.window, args.stride)
+        elapsed_one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fragments = list(kp.Exporter().export_fragments(document, options, args.window, args.stride))
+        elapsed_fragments = time.perf_counter() - start
+
+        assert count == len(fragments)
+        print(f'{encoding.name:21} {count} fragments, export_string per window: {elapsed_one_by_one:7.3f} s, '
+              f'export_fragments: {elapsed_fragments:7.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark of the memory used by the nodes of the imported documents.
+
+Every file is imported once to warm up the parse caches, and then imported again while tracemalloc traces the
+allocations. The memory still allocated after the import (the document) is divided by the number of nodes of its tree.
+It also counts the distinct `SignatureNodes` instances, which are shared between nodes until a signature changes.
+The tokens are shared through the `TokenPool` when --intern-tokens is given.
+
+Usage:
+    python benchmarks/node_memory.py
+    python benchmarks/node_memory.py test/resources/mozart/*.krn
+    python benchmarks/node_memory.py --intern-tokens
+"""
+import argparse
+import gc
+import glob
+import tracemalloc
+
+import kernpy as kp
+
+
+def measure(path: str, intern_tokens: bool):
+    warm_up_document = kp.Importer().import_file(path)  # warm up the parse caches, so they are not traced
+
+    gc.collect()
+    tracemalloc.start()
+    document = kp.Importer(intern_tokens=intern_tokens).import_file(path)
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = [node for stage in document.tree.stages for node in stage]
+    signature_nodes = {id(node.last_signature_nodes) for node in nodes}
+    del warm_up_document
+    return allocated, len(nodes), len(signature_nodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the memory used by the nodes of the documents.')
+    parser.add_argument('paths', nargs='*', default=sorted(glob.glob('test/resources/grandstaff/*.krn')),
+                        help='The **kern files. By default, the grandstaff test resources.')
+    parser.add_argument('--intern-tokens', action='store_true', help='Share the equal tokens through the TokenPool.')
+    args = parser.parse_args()
+
+    total_allocated = total_nodes = 0
+    for path in args.paths:
+        allocated, nodes, signature_nodes = measure(path, args.intern_tokens)
+        total_allocated += allocated
+        total_nodes += nodes
+        print(f'{path}: {nodes} nodes, {signature_nodes} SignatureNodes, {allocated / nodes:,.0f} bytes/node')
+
+    print(f'Total: {total_nodes} nodes, {total_allocated / total_nodes:,.0f} bytes/node')
+
+
+if __name__ == '__main__':
+    main()
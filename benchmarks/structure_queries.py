@@ -0,0 +1,61 @@
+"""
+Benchmark of the queries about the spines of a document.
+
+`kp.spine_types`, `kp.is_monophonic` and `Document.match` read the structural summary of the document \
+(see `Document.structure`), which is computed once. This benchmark compares them with the previous approach, which \
+exported the headers of the whole document and listed all its chords and notes for every query.
+
+Usage:
+    python benchmarks/structure_queries.py
+    python benchmarks/structure_queries.py test/resources/legacy/chor048.krn --repeat 1000
+"""
+import argparse
+import time
+
+import kernpy as kp
+
+
+def spine_types_by_export(document: kp.Document) -> list:
+    # Previous behaviour of Exporter.get_spine_types, kept here as the reference of the benchmark
+    options = kp.ExportOptions(token_categories=[kp.TokenCategory.HEADER])
+    tokens = kp.Exporter().export_string(document, options).split('\n')[0].split('\t')
+    return tokens if tokens not in [[], ['']] else []
+
+
+def is_monophonic_by_tokens(document: kp.Document) -> bool:
+    # Previous behaviour of kp.is_monophonic, kept here as the reference of the benchmark
+    number_of_kern_spines = sum(1 for header in document.get_header_nodes() if header.encoding == '**kern')
+    number_of_chord_tokens = len(document.get_all_tokens(filter_by_categories=[kp.TokenCategory.CHORD]))
+    there_is_any_note_rest_token = len(document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])) > 0
+    return number_of_kern_spines == 1 and number_of_chord_tokens == 0 and there_is_any_note_rest_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the queries about the spines of a document.')
+    parser.add_argument('path', nargs='?', default='test/resources/merge/expected_merge_bach_x2.krn',
+                        help='The **kern file to query.')
+    parser.add_argument('--repeat', type=int, default=100, help='Number of times every query is run.')
+    args = parser.parse_args()
+
+    document, _ = kp.load(args.path)
+    assert spine_types_by_export(document) == kp.spine_types(document)
+    assert is_monophonic_by_tokens(document) == kp.is_monophonic(document)
+
+    for name, previous, current in [('spine_types', spine_types_by_export, kp.spine_types),
+                                    ('is_monophonic', is_monophonic_by_tokens, kp.is_monophonic)]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            previous(document)
+        elapsed_previous = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            current(document)
+        elapsed_current = time.perf_counter() - start
+
+        print(f'{name:14} {args.repeat} queries, previous: {elapsed_previous:8.4f} s, '
+              f'structure: {elapsed_current:8.4f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the import of lyric-heavy scores.
+
+Every cell of a **text spine that is not an interpretation, barline, comment or null is directly imported as lyrics
+by the pre-classifier of the spine importers. This benchmark compares it with the previous approach, which ran the
+full ANTLR **kern parser on every cell and relied on the exception to mark the cell as lyrics.
+
+Usage:
+    python benchmarks/text_spines.py --measures 500 --text-spines 4
+"""
+import argparse
+import random
+import string
+import time
+
+import kernpy as kp
+
+
+def build_score(measures: int, text_spines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    headers = ['**kern'] + ['**text'] * text_spines
+    rows = ['\t'.join(headers), '\t'.join(['*clefG2'] + ['*'] * text_spines), '\t'.join(['*M4/4'] * (text_spines + 1))]
+    for measure in range(1, measures + 1):
+        for _ in range(4):
+            syllables = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) + rng.choice(['', '-'])
+                         for _ in range(text_spines)]
+            rows.append('\t'.join(['4' + rng.choice('cdefgab')] + syllables))
+        rows.append('\t'.join([f'={measure}'] * (text_spines + 1)))
+    rows.append('\t'.join(['*-'] * (text_spines + 1)))
+    return '\n'.join(rows) + '\n'
+
+
+def parse_then_catch(encoding: str, kern_spine_importer: kp.KernSpineImporter) -> kp.AbstractToken:
+    # Previous behaviour of the **text spine importer, kept here as the reference of the benchmark
+    try:
+        return kern_spine_importer.import_token(encoding)
+    except Exception:
+        return kp.SimpleToken(encoding, kp.TokenCategory.LYRICS)
+
+
+def timed(callback, *args):
+    start = time.perf_counter()
+    result = callback(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the import of lyric-heavy scores.')
+    parser.add_argument('--measures', type=int, default=500, help='Number of measures of the synthetic score.')
+    parser.add_argument('--text-spines', type=int, default=4, help='Number of **text spines of the synthetic score.')
+    args = parser.parse_args()
+
+    content = build_score(args.measures, args.text_spines)
+    lyrics = [cell for row in content.splitlines()[3:] for cell in row.split('\t')[1:]
+              if not cell.startswith(kp.TextSpineImporter.STRUCTURAL_PREFIXES)]
+
+    text_spine_importer = kp.TextSpineImporter()
+    elapsed_pre_classifier, _ = timed(lambda: [text_spine_importer.import_token(cell) for cell in lyrics])
+
+    kern_spine_importer = kp.KernSpineImporter(cache=False)
+    elapsed_parse_then_catch, _ = timed(lambda: [parse_then_catch(cell, kern_spine_importer) for cell in lyrics])
+
+    elapsed_load, (document, errors) = timed(kp.loads, content)
+
+    print(f'Lyric cells: {len(lyrics)}')
+    print(f'Parse then catch: {elapsed_parse_then_catch:.3f} s ({len(lyrics) / elapsed_parse_then_catch:,.0f} cells/s)')
+    print(f'Pre-classifier:   {elapsed_pre_classifier:.3f} s ({len(lyrics) / elapsed_pre_classifier:,.0f} cells/s)')
+    print(f'kp.loads of the whole score ({args.measures} measures, {args.text_spines} **text spines): '
+          f'{elapsed_load:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
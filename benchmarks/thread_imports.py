@@ -0,0 +1,75 @@
+"""
+Benchmark of the ANTLR parsing of **kern tokens from several threads.
+
+Every thread of `KernSpineImporter` runs its own ANTLR parser with its own DFA caches, so the threads parse without
+a lock. This benchmark parses the same encodings (without the parse cache and the fast path, so every encoding runs
+the ANTLR parser) from 1 thread and from several threads, with and without the previous class-wide lock. On regular
+CPython builds the threads share the GIL, so more threads do not parse faster: the parallel speedup needs a
+free-threaded build (python3.13t or later). Use `kp.load_many` (processes) to load a corpus on several cores.
+
+Usage:
+    python benchmarks/thread_imports.py
+    python benchmarks/thread_imports.py test/resources/legacy/*.krn --threads 8
+"""
+import argparse
+import glob
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import kernpy as kp
+
+
+class LockedKernSpineImporter(kp.KernSpineImporter):
+    # Previous behaviour (one class-wide lock around the ANTLR parser), kept here as the reference of the benchmark
+    _lock = threading.Lock()
+
+    def _parse_antlr(self, encoding: str):
+        with self._lock:
+            return super()._parse_antlr(encoding)
+
+
+def collect_encodings(paths) -> list:
+    encodings = []
+    for path in paths:
+        document, _ = kp.load(path)
+        encodings.extend(token.encoding for token in document.get_all_tokens(
+            filter_by_categories=[kp.TokenCategory.NOTE_REST, kp.TokenCategory.CHORD]))
+    return encodings
+
+
+def parse_in_threads(importer_class, encodings: list, threads: int) -> float:
+    def parse(chunk):
+        importer = importer_class(cache=False, fast_path=False)
+        for encoding in chunk:
+            importer.import_token(encoding)
+
+    chunks = [encodings[i::threads] for i in range(threads)]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(parse, [chunk[:10] for chunk in chunks]))  # warm up the DFA caches of every thread
+        start = time.perf_counter()
+        list(executor.map(parse, chunks))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the ANTLR parsing from several threads.')
+    parser.add_argument('paths', nargs='*', default=sorted(glob.glob('test/resources/legacy/*.krn')),
+                        help='The **kern files whose notes and chords are parsed. By default, the legacy resources.')
+    parser.add_argument('--threads', type=int, default=4, help='Number of threads.')
+    args = parser.parse_args()
+
+    encodings = collect_encodings(args.paths)
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'{len(encodings)} encodings, GIL enabled: {gil_enabled}')
+
+    for name, importer_class in [('class-wide lock', LockedKernSpineImporter),
+                                 ('per-thread parsers', kp.KernSpineImporter)]:
+        one_thread = parse_in_threads(importer_class, encodings, 1)
+        many_threads = parse_in_threads(importer_class, encodings, args.threads)
+        print(f'{name:18} 1 thread: {one_thread:7.3f} s, {args.threads} threads: {many_threads:7.3f} s')
+
+
+if __name__ == '__main__':
+    main()
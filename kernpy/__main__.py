@@ -9,7 +9,7 @@ import argparse
 import sys
 from pathlib import Path
 
-from kernpy import polish_scores, ekern_to_krn, kern_to_ekern
+from kernpy import polish_scores, ekern_to_krn, kern_to_ekern, generate_fragments, Encoding, BEKERN_CATEGORIES
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -34,6 +34,13 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument('--kern_spines_filter', type=str, help='Polish: Filter for number of kern spines')
     parser.add_argument('--remove_empty_dirs', action='store_true', help='Polish: Remove empty directories')
 
+    # Fragments
+    parser.add_argument('--window', type=int, default=4, help='Fragments: Number of measures of every fragment')
+    parser.add_argument('--stride', type=int, default=1, help='Fragments: Measures between consecutive fragments')
+    parser.add_argument('--encoding', type=str, default=Encoding.normalizedKern.value,
+                        choices=[encoding.value for encoding in Encoding], help='Fragments: Encoding of the fragments')
+    parser.add_argument('--workers', type=int, default=None, help='Fragments: Number of worker processes')
+
 
     return parser
 
@@ -99,6 +106,39 @@ def handle_polish_exporter(args):
     )
 
 
+def handle_generate_fragments(args):
+    input_path = Path(args.input_path)
+    output_path = Path(args.output_path)
+    files = [input_path] if input_path.is_file() else sorted(
+        file for pattern in ["*.krn", "*.kern"] for file in input_path.rglob(pattern))
+
+    if args.verbose:
+        print(f"Generating fragments of {args.window} measures of {len(files)} files → {output_path}")
+
+    root = None if input_path.is_file() else input_path
+    try:
+        fragments = generate_fragments(
+            files,
+            output_path,
+            root=root,
+            window=args.window,
+            stride=args.stride,
+            workers=args.workers,
+            spine_types=['**kern'],
+            include=BEKERN_CATEGORIES,
+            encoding=Encoding(args.encoding),
+        )
+    except ValueError as e:
+        print(f"Error generating the fragments: {e}", file=sys.stderr)
+        return
+    for file, count, errors in fragments:
+        if count == 0 and errors:
+            print(f"Error generating the fragments of {file}: {errors[-1]}", file=sys.stderr)
+        elif args.verbose:
+            fragments_directory = output_path / (file.relative_to(root).with_suffix('') if root else file.stem)
+            print(f"Generated {count} fragments: {file} → {fragments_directory}")
+
+
 def main():
     parser = create_parser()
     args = parser.parse_args()
@@ -114,6 +154,8 @@ def main():
         handle_kern2ekern(args)
     elif args.polish:
         handle_polish_exporter(args)
+    elif args.generate_fragments:
+        handle_generate_fragments(args)
 
 
 if __name__ == "__main__":
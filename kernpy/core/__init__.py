@@ -7,9 +7,13 @@ This module contains the core functionality of the `kernpy` package.
 """
 
 from .tokens import *
+from .token_pool import *
 from .document import *
+from .measure_index import *
+from .document_structure import *
 from .importer import *
 from .exporter import *
+from .vocabulary import *
 from .graphviz_exporter import  *
 from .importer_factory import *
 from .dyn_importer import *
@@ -28,14 +32,19 @@ from .transposer import *
 from .pitch_models import *
 from .gkern import *
 from .measure_signature_validators import *
+from .document_cache import *
+from .columnar_document import *
 
 
 __all__ = [
     'Document',
+    'DocumentStructure',
     'TokenCategory',
     'Importer',
     'ExportOptions',
+    'ExportPlan',
     'Exporter',
+    'Vocabulary',
     'Encoding',
     'GraphvizExporter',
     'ekern_to_krn',
@@ -125,5 +134,11 @@ __all__ = [
     'MeasureSignatureToken',
     'MeasureSignatureValidator',
     'HorizontalRhythmValidator',
+    'BinaryDocumentFormat',
+    'DocumentCache',
+    'ColumnarDocument',
+    'TokenPool',
+    'MeasureIndex',
+    'MeasureView',
 ]
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, TextIO, Union
 
 
 def _write(path: Union[str, Path], content: str) -> None:
@@ -15,12 +15,24 @@ def _write(path: Union[str, Path], content: str) -> None:
 
     Returns: None
 
+    """
+    with _open_for_writing(path) as f:
+        f.write(content)
+
+
+def _open_for_writing(path: Union[str, Path]) -> TextIO:
+    """
+    Open a file to write text, creating its directory if it does not exist.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns (TextIO): The open file. It must be closed by the caller.
     """
     if not os.path.exists(os.path.dirname(Path(path).absolute())):
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
-    with open(path, 'w+') as f:
-        f.write(content)
+    return open(path, 'w+')
 
 
 def find_all_files(
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from kernpy.core import Importer, Document, ClefToken, KeySignatureToken, KeyToken, TimeSignatureToken, \
+    MeterSymbolToken, Node
+
+# Order of the signature rows written at the beginning of every fragment
+_SIGNATURE_ORDER = (ClefToken, KeySignatureToken, KeyToken, TimeSignatureToken, MeterSymbolToken)
+
+
+def _is_barline_row(row: List[str]) -> bool:
+    return row[0].startswith('=')
+
+
+def _has_core_cells(row: List[str]) -> bool:
+    # Same cells that start the first measure in the Importer: notes, rests, chords and null tokens
+    if row[0].startswith(('!', '**')):
+        return False
+    return any(cell == '*' or not cell.startswith(('*', '=')) for cell in row)
+
+
+def _split_rows(spine_sizes: List[int]) -> List[List[str]]:
+    """
+    Build the rows of spine splits (*^) that turn one column per spine into spine_sizes[i] columns for the spine i.
+    """
+    rows = []
+    current_sizes = [1] * len(spine_sizes)
+    while current_sizes != spine_sizes:
+        row = []
+        for spine, (current_size, size) in enumerate(zip(current_sizes, spine_sizes)):
+            splits = min(current_size, size - current_size)
+            row.extend(['*^'] * splits + ['*'] * (current_size - splits))
+            current_sizes[spine] = current_size + splits
+        rows.append(row)
+    return rows
+
+
+def _context_rows(columns: List[Node]) -> List[List[str]]:
+    """
+    Build the rows that restore the header, the spine layout and the active signatures of the columns.
+
+    Args:
+        columns (List[Node]): The nodes of the active columns, from left to right.
+
+    Returns (List[List[str]]): The rows.
+    """
+    headers = []
+    spine_sizes = []
+    for column in columns:
+        if headers and headers[-1] is column.header_node:
+            spine_sizes[-1] += 1
+        else:
+            headers.append(column.header_node)
+            spine_sizes.append(1)
+
+    rows = [[header.token.encoding for header in headers]]
+    rows.extend(_split_rows(spine_sizes))
+    for signature_class in _SIGNATURE_ORDER:
+        signature_nodes = [column.last_signature_nodes.nodes.get(signature_class.__name__) for column in columns]
+        if any(signature_nodes):
+            rows.append([node.token.encoding if node else '*' for node in signature_nodes])
+    return rows
+
+
+def _chunks(rows: Iterable[List[str]]) -> Iterator[List[List[str]]]:
+    """
+    Group the rows by measures, as the `Importer` splits the document in measures. Every chunk ends with the barline \
+    row that closes the measure, except the last one, that contains the remaining rows. The rows before the first \
+    measure are part of its chunk, and the rows without notes after the last barline (e.g. the termination of the \
+    spines) are part of the last chunk.
+    """
+    pending = None
+    chunk = []
+    started = False
+    for row in rows:
+        if len(row) <= 0:
+            continue
+        chunk.append(row)
+        started = started or _has_core_cells(row)
+        if started and _is_barline_row(row):
+            if pending is not None:
+                yield pending
+            pending = chunk
+            chunk = []
+
+    if pending is None:
+        pending = chunk
+    elif any(_has_core_cells(row) for row in chunk):
+        yield pending
+        pending = chunk
+    else:
+        pending.extend(chunk)
+    if pending:
+        yield pending
+
+
+def _fragments(rows: Iterable[List[str]], window: int, importer_options: dict) -> Iterator[Tuple[int, int, Document]]:
+    context = []
+    from_measure = 1
+    fragment_rows = []
+    measures = 0
+    chunks = _chunks(rows)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        fragment_rows.extend(chunk)
+        measures += 1
+        chunk = next(chunks, None)
+        if measures < window and chunk is not None:
+            continue
+
+        is_last = chunk is None
+        if not is_last:
+            fragment_rows.append(['*-'] * len(fragment_rows[-1]))
+
+        document = Importer(**importer_options).run(context + fragment_rows)
+        yield from_measure, from_measure + measures - 1, document
+
+        if not is_last:
+            # The barline nodes closing the fragment hold the active header, spine layout and signatures
+            context = _context_rows([node.parent for node in document.tree.stages[-1]])
+        from_measure += measures
+        fragment_rows = []
+        measures = 0
+
+
+def _file_fragments(path: Union[str, Path], window: int, importer_options: dict) -> Iterator[Tuple[int, int, Document]]:
+    with open(path, 'r', newline='', encoding='utf-8', errors='ignore') as file:
+        yield from _fragments(csv.reader(file, delimiter='\t'), window, importer_options)
+
+
+def iter_measures(
+        source: Union[str, Path, Iterable[str]],
+        *,
+        window: int = 1,
+        **importer_options,
+) -> Iterator[Tuple[int, int, Document]]:
+    """
+    Import a **kern score as a stream of fragments of `window` measures.
+
+    Only the rows of the current fragment are kept in memory. Every fragment is a self-contained document: \
+    it starts with the header, the spine splits and the signatures (clef, key signature, key, meter) active at its \
+    first measure, and it ends with the termination of all the spines.
+
+    Args:
+        source (Union[str, Path, Iterable[str]]): The path of the file, or an iterable of lines (e.g. a file object).
+        window (int): Number of measures of every fragment.
+        **importer_options: Keyword arguments of the `Importer` constructor.
+
+    Returns (Iterator[Tuple[int, int, Document]]): The tuples (from_measure, to_measure, document) of every fragment.
+    """
+    if window < 1:
+        raise ValueError(f"window must be a positive integer. Found {window}")
+
+    if isinstance(source, (str, Path)):
+        return _file_fragments(source, window, importer_options)
+    return _fragments(csv.reader(source, delimiter='\t'), window, importer_options)
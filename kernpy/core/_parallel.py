@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from kernpy.core import Importer, Document, Exporter, ExportOptions
+from kernpy.core._io import _open_for_writing
+
+_WARM_UP_CONTENT = (
+    "**kern\t**text\t**dynam\n"
+    "*clefG2\t*\t*\n"
+    "*k[b-]\t*\t*\n"
+    "*M4/4\t*\t*\n"
+    "=1\t=1\t=1\n"
+    "4.c#L\tla\tp\n"
+    "8r\t.\t.\n"
+    "4c 4e\tle\t.\n"
+    "4dd-J\tli\t.\n"
+    "==\t==\t==\n"
+    "*-\t*-\t*-\n"
+)
+
+def _initialize_worker() -> None:
+    """
+    Initialize a worker process: import a small score so the ANTLR parser and the parse caches are already warm \
+    when the first file arrives.
+    """
+    try:
+        Importer().import_string(_WARM_UP_CONTENT)
+    except Exception:
+        pass
+
+
+def _check_pool(workers: Optional[int], chunksize: int) -> int:
+    """
+    Validate the pool arguments of `load_many` and `generate_fragments`.
+
+    Returns (int): The number of worker processes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be a positive integer. Found {workers}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be a positive integer. Found {chunksize}")
+    return workers
+
+
+def _map_chunks(chunks: List[list], fn: Callable[[list, dict], list], importer_options: dict, workers: int,
+                ordered: bool) -> Iterator:
+    """
+    Run `fn(chunk, importer_options)` for every chunk, in the current process when `workers` is 1 or in a pool of \
+    warmed-up worker processes otherwise, and yield the items of the results.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield from fn(chunk, importer_options)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, max(len(chunks), 1)), initializer=_initialize_worker)
+    try:
+        process_chunk = partial(fn, importer_options=importer_options)
+        if ordered:
+            for results in executor.map(process_chunk, chunks):
+                yield from results
+        else:
+            futures = [executor.submit(process_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _load_file(path: Union[str, Path], importer_options: dict) -> Tuple[Union[str, Path], Optional[Document], List[str]]:
+    try:
+        importer = Importer(**importer_options)
+        document = importer.import_file(Path(path))
+        return path, document, importer.errors
+    except Exception as e:
+        return path, None, [f"{type(e).__name__}: {str(e).strip()}"]
+
+
+def _load_chunk(paths: List[Union[str, Path]],
+                importer_options: dict) -> List[Tuple[Union[str, Path], Optional[Document], List[str]]]:
+    return [_load_file(path, importer_options) for path in paths]
+
+
+def load_many(
+        paths: Iterable[Union[str, Path]],
+        *,
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        **importer_options,
+) -> Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]:
+    """
+    Load several **kern files in parallel using a pool of processes.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The paths of the files.
+        workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+            When 1, the files are loaded in the current process.
+        chunksize (int): Number of files sent to a worker at once.
+        ordered (bool): If True, the results are yielded in the same order as the paths. \
+            Otherwise, they are yielded as soon as they are ready.
+        **importer_options: Keyword arguments of the `Importer` constructor.
+
+    Returns (Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]): The tuples (path, document, errors). \
+        If a file could not be loaded, the document is None and the errors contain the exception message.
+
+    Raises:
+        ValueError: If the workers or the chunksize are not positive integers.
+    """
+    workers = _check_pool(workers, chunksize)
+    paths = list(paths)
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    return _map_chunks(chunks, _load_chunk, importer_options, workers, ordered)
+
+
+def _export_file_fragments(path: Union[str, Path], fragments_directory: Path, importer_options: dict, window: int,
+                           stride: int, options: ExportOptions,
+                           extension: str) -> Tuple[Union[str, Path], int, List[str]]:
+    path, document, errors = _load_file(path, importer_options)
+    if document is None:
+        return path, 0, errors
+    try:
+        count = 0
+        for from_measure, to_measure, content in Exporter().export_fragments(document, options, window, stride):
+            with _open_for_writing(fragments_directory / f'from-{from_measure}-to-{to_measure}.{extension}') as f:
+                f.write(content)
+            count += 1
+        return path, count, errors
+    except Exception as e:
+        return path, 0, errors + [f"{type(e).__name__}: {str(e).strip()}"]
+
+
+def _export_chunk_fragments(files: List[Tuple[Union[str, Path], Path]], importer_options: dict, window: int,
+                            stride: int, options: ExportOptions,
+                            extension: str) -> List[Tuple[Union[str, Path], int, List[str]]]:
+    return [_export_file_fragments(path, fragments_directory, importer_options, window, stride, options, extension)
+            for path, fragments_directory in files]
+
+
+def _fragments_directories(
+        paths: List[Union[str, Path]],
+        output_directory: Union[str, Path],
+        root: Optional[Union[str, Path]] = None,
+) -> List[Path]:
+    """
+    Get the directory of the fragments of every file (see `generate_fragments`).
+
+    Args:
+        paths (List[Union[str, Path]]): The paths of the files.
+        output_directory (Union[str, Path]): The directory of the fragments.
+        root (Optional[Union[str, Path]]): The directory of the files. When given, the directories of the \
+            fragments mirror the tree of the files under it. Otherwise, they are named by the stems of the files.
+
+    Returns (List[Path]): The directories, in the same order as the paths.
+
+    Raises:
+        ValueError: If two files get the same directory, or if a file is not under `root`.
+    """
+    directories = []
+    files_by_directory = {}
+    for path in paths:
+        if root is None:
+            directory = Path(output_directory) / Path(path).stem
+        else:
+            try:
+                relative_path = Path(path).resolve().relative_to(Path(root).resolve())
+            except ValueError:
+                raise ValueError(f"{path} is not in the root directory {root}")
+            directory = Path(output_directory) / relative_path.with_suffix('')
+        if directory in files_by_directory:
+            raise ValueError(f"The fragments of {files_by_directory[directory]} and {path} would be written to the same "
+                             f"directory {directory}. Pass the root directory of the files to keep their tree.")
+        files_by_directory[directory] = path
+        directories.append(directory)
+    return directories
+
+
+def generate_fragments(
+        paths: Iterable[Union[str, Path]],
+        output_directory: Union[str, Path],
+        options: ExportOptions,
+        *,
+        window: int,
+        stride: int = 1,
+        extension: str = 'krn',
+        root: Optional[Union[str, Path]] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        **importer_options,
+) -> Iterator[Tuple[Union[str, Path], int, List[str]]]:
+    """
+    Export the fragments of several **kern files in parallel using a pool of processes (see `load_many`).
+
+    The fragments of every file are written to `<output_directory>/<file stem>/from-<a>-to-<b>.<extension>` \
+    (see `Exporter.export_fragments`), or to `<output_directory>/<path relative to root>/...` when `root` is given.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The paths of the files.
+        output_directory (Union[str, Path]): The directory of the fragments.
+        options (ExportOptions): The export options of the fragments.
+        window (int): Number of measures of every fragment.
+        stride (int): Number of measures between the first measures of two consecutive fragments.
+        extension (str): The extension of the fragment files.
+        root (Optional[Union[str, Path]]): The directory of the files (see `_fragments_directories`).
+        workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+            When 1, the files are processed in the current process.
+        chunksize (int): Number of files sent to a worker at once.
+        **importer_options: Keyword arguments of the `Importer` constructor.
+
+    Returns (Iterator[Tuple[Union[str, Path], int, List[str]]]): The tuples (path, fragments count, errors), \
+        in the same order as the paths. If a file could not be exported, the errors contain the exception message.
+
+    Raises:
+        ValueError: If the window, the stride, the workers or the chunksize are not positive integers, or if the \
+            fragments of two files would be written to the same directory.
+    """
+    workers = _check_pool(workers, chunksize)
+    if not isinstance(window, int) or window < 1:
+        raise ValueError(f"window must be a positive integer. Found {window}")
+    if not isinstance(stride, int) or stride < 1:
+        raise ValueError(f"stride must be a positive integer. Found {stride}")
+
+    paths = list(paths)
+    files = list(zip(paths, _fragments_directories(paths, output_directory, root)))
+    chunks = [files[i:i + chunksize] for i in range(0, len(files), chunksize)]
+    export_chunk = partial(_export_chunk_fragments, window=window, stride=stride, options=options, extension=extension)
+    return _map_chunks(chunks, export_chunk, importer_options, workers, ordered=True)
@@ -43,6 +43,8 @@ class BaseANTLRSpineParserListener(kernSpineParserListener):
 
     def enterStart(self, ctx: kernSpineParser.StartContext):
         self.token = None
+        self.in_chord = False
+        self.chord_tokens = None
         self.duration_subtokens = []
         self.diatonic_pitch_and_octave_subtoken = None
         self.accidental_subtoken = None
@@ -9,6 +9,15 @@ from .tokens import SimpleToken, TokenCategory, Token
 
 
 class BasicSpineImporter(SpineImporter):
+    ACCEPTED_CATEGORIES_MASK = TokenCategory.valid_mask(include={
+        TokenCategory.STRUCTURAL,
+        TokenCategory.SIGNATURES,
+        TokenCategory.EMPTY,
+        TokenCategory.BARLINES,
+        TokenCategory.IMAGE_ANNOTATIONS,
+        TokenCategory.COMMENTS,
+    })
+
     def __init__(self, verbose: Optional[bool] = False):
         """
         KernSpineImporter constructor.
@@ -17,6 +26,7 @@ class BasicSpineImporter(SpineImporter):
             verbose (Optional[bool]): Level of verbosity for error messages.
         """
         super().__init__(verbose=verbose)
+        self.kern_spine_importer = KernSpineImporter(verbose=verbose)
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         return KernSpineListener()  # TODO: Create a custom functional listener for BasicSpineImporter
@@ -24,23 +34,15 @@ class BasicSpineImporter(SpineImporter):
     def import_token(self, encoding: str) -> Token:
         self._raise_error_if_wrong_input(encoding)
 
+        if not self._may_be_structural(encoding):
+            return SimpleToken(encoding, TokenCategory.OTHER)
+
         try:
-            kern_spine_importer = KernSpineImporter()
-            token = kern_spine_importer.import_token(encoding)
+            token = self.kern_spine_importer.import_token(encoding)
         except Exception as e:
             return SimpleToken(encoding, TokenCategory.OTHER)
 
-        ACCEPTED_CATEGORIES = {
-            TokenCategory.STRUCTURAL,
-            TokenCategory.SIGNATURES,
-            TokenCategory.EMPTY,
-            TokenCategory.BARLINES,
-            TokenCategory.IMAGE_ANNOTATIONS,
-            TokenCategory.BARLINES,
-            TokenCategory.COMMENTS,
-        }
-
-        if not any(TokenCategory.is_child(child=token.category, parent=cat) for cat in ACCEPTED_CATEGORIES):
+        if not token.category.bit & self.ACCEPTED_CATEGORIES_MASK:
             return SimpleToken(encoding, TokenCategory.OTHER)
 
         return token
\ No newline at end of file
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from copy import copy
+from typing import Dict, List, Optional, Sequence
+
+from kernpy.core.tokens import AbstractToken, TokenCategory, MetacommentToken, ClefToken, HeaderToken
+from kernpy.core.document import Document, MultistageTree
+from kernpy.core.document_structure import DocumentStructure
+from kernpy.core.document_cache import BinaryDocumentFormat
+from kernpy.core.transposer import Direction
+
+
+__all__ = ['ColumnarDocument']
+
+
+class ColumnarDocument(Document):
+    """
+    Read-only `Document` stored in contiguous arrays instead of a tree of `Node` objects.
+
+    Every node of the tree is an index of the arrays. The nodes are stored stage by stage, from left to right, \
+    and equal tokens are stored once in the `tokens` table. `get_all_tokens`, `get_unique_tokens`, `frequencies`, \
+    `get_metacomments` and the export of the whole document scan the arrays. The rest of the `Document` API \
+    works on a tree that is built from the arrays the first time `tree` is accessed.
+
+    The tokens are shared between the nodes: they must not be modified. `replace_token`, `clone` and `add` raise \
+    a ValueError: use `to_document` to get a `Document` that can be modified.
+
+    Attributes:
+        tokens (List[AbstractToken]): The interned tokens.
+        token_ids (array): Index in `tokens` of the token of every node. -1 for the root.
+        parent_indexes (array): Index of the parent of every node. -1 for the root.
+        header_indexes (array): Index of the header node of every node. -1 if there is no header node.
+        spine_operator_indexes (array): Index of the last spine operator node of every node. -1 if there is none.
+        signature_ids (array): Index in `signatures` of the last signature nodes of every node.
+        signatures (List[Dict[str, int]]): The last signature nodes: token class name -> node index.
+        categories (array): Value of the `TokenCategory` of the token of every node. 0 for the root.
+        stage_offsets (array): Index of the first node of every stage. The last value is the number of nodes.
+        dfs_order (array): The node indexes in depth-first order, the order of the tree traversals of `Document`.
+
+    Examples:
+        >>> document, _ = kp.load('score.krn')
+        >>> columnar_document = kp.ColumnarDocument(document)
+        >>> columnar_document.frequencies([kp.TokenCategory.NOTE_REST])
+        >>> kp.dumps(columnar_document)
+    """
+
+    def __init__(self, document: Document):
+        """
+        Create a ColumnarDocument with the content of a document.
+
+        Args:
+            document (Document): The imported document. It is not modified.
+        """
+        state = document._tree_state()
+        self.measure_start_tree_stages = list(document.measure_start_tree_stages)
+        self.page_bounding_boxes = dict(document.page_bounding_boxes)
+        self.header_stage = document.header_stage
+
+        self.tokens = []
+        self.token_ids = array('i')
+        self.parent_indexes = array('i')
+        self.header_indexes = array('i')
+        self.spine_operator_indexes = array('i')
+        self.signature_ids = array('i')
+        self.categories = array('B')
+        self.signatures = state['signatures']
+
+        token_ids_by_identity = {}
+        token_ids_by_value = {}
+        for _, token, parent, header_node, last_spine_operator_node, signature in state['nodes']:
+            if token is None:
+                token_id = -1
+            else:
+                token_id = token_ids_by_identity.get(id(token))
+                if token_id is None:
+                    # the value of the token, with its subtokens, is the key to intern it
+                    value = BinaryDocumentFormat._encode(token)
+                    token_id = token_ids_by_value.get(value)
+                    if token_id is None:
+                        token_id = token_ids_by_value[value] = len(self.tokens)
+                        self.tokens.append(token)
+                    token_ids_by_identity[id(token)] = token_id
+            self.token_ids.append(token_id)
+            self.parent_indexes.append(-1 if parent is None else parent)
+            self.header_indexes.append(-1 if header_node is None else header_node)
+            self.spine_operator_indexes.append(-1 if last_spine_operator_node is None else last_spine_operator_node)
+            self.signature_ids.append(signature)
+            self.categories.append(0 if token is None else token.category.value)
+
+        self.stage_offsets = array('i', [0])
+        for stage_size in state['stage_sizes']:
+            self.stage_offsets.append(self.stage_offsets[-1] + stage_size)
+
+        self.dfs_order = self._compute_dfs_order(self.parent_indexes)
+        self._tree = None
+        self._structure = None
+        self._replaced_tokens = {}  # the tokens of the arrays are the tokens of the document
+        self._clef_token_ids = None
+
+    @staticmethod
+    def _compute_dfs_order(parent_indexes: array) -> array:
+        # The children of every node were added in stage order, so they are in the same order as the node indexes
+        children = [[] for _ in range(len(parent_indexes))]
+        roots = []
+        for index, parent in enumerate(parent_indexes):
+            if parent < 0:
+                roots.append(index)
+            else:
+                children[parent].append(index)
+
+        order = array('i')
+        stack = list(reversed(roots))
+        while stack:
+            index = stack.pop()
+            order.append(index)
+            stack.extend(reversed(children[index]))
+        return order
+
+    @property
+    def tree(self) -> MultistageTree:
+        """
+        The tree of the document. It is built from the arrays the first time it is accessed.
+        """
+        if self._tree is None:
+            def index_or_none(index: int) -> Optional[int]:
+                return None if index < 0 else index
+
+            tree = MultistageTree.__new__(MultistageTree)
+            tree.__setstate__({
+                'nodes': [
+                    (stage,
+                     None if self.token_ids[index] < 0 else copy(self.tokens[self.token_ids[index]]),
+                     index_or_none(self.parent_indexes[index]),
+                     index_or_none(self.header_indexes[index]),
+                     index_or_none(self.spine_operator_indexes[index]),
+                     self.signature_ids[index])
+                    for stage in range(len(self.stage_offsets) - 1)
+                    for index in range(self.stage_offsets[stage], self.stage_offsets[stage + 1])
+                ],
+                'signatures': self.signatures,
+                'stage_sizes': [self.stage_offsets[stage + 1] - self.stage_offsets[stage]
+                                for stage in range(len(self.stage_offsets) - 1)],
+            })
+            self._tree = tree
+        return self._tree
+
+    def to_document(self) -> Document:
+        """
+        Create a `Document` with the content of this document. Every node of the new document has its own token.
+
+        Returns (Document): The new document.
+        """
+        tree = self.tree
+        self._tree = None  # the tree belongs to the new document
+        document = Document(tree)
+        document.measure_start_tree_stages = list(self.measure_start_tree_stages)
+        document.page_bounding_boxes = dict(self.page_bounding_boxes)
+        document.header_stage = self.header_stage
+        return document
+
+    def replace_token(self, node, token: AbstractToken) -> None:
+        """
+        Not supported: a ColumnarDocument is read-only.
+
+        Raises:
+            ValueError: Always. Replace the tokens of the `Document` returned by `to_document`.
+        """
+        raise ValueError('Cannot replace the tokens of a read-only ColumnarDocument. '
+                         'Use to_document() to get a Document that can be modified.')
+
+    def clone(self):
+        """
+        Not supported: a ColumnarDocument is read-only, so it does not need copy-on-write variants.
+
+        Raises:
+            ValueError: Always. Clone the `Document` returned by `to_document`.
+        """
+        raise ValueError('Cannot clone a read-only ColumnarDocument. '
+                         'Use to_document() to get a Document that can be cloned and modified.')
+
+    def _writable_copy(self) -> Document:
+        return self.to_document()
+
+    def add(self, other: Document, *, check_core_spines_only: Optional[bool] = False) -> Document:
+        """
+        Not supported: a ColumnarDocument is read-only. `Document.to_concat` returns a new `Document`.
+
+        Raises:
+            ValueError: Always. Concatenate to the `Document` returned by `to_document`.
+        """
+        raise ValueError('Cannot concatenate to a read-only ColumnarDocument. '
+                         'Use to_document() to get a Document that can be modified.')
+
+    def to_transposed(self, interval: str, direction: str = Direction.UP.value) -> Document:
+        # The transposed document replaces tokens: it is a Document (see `Document.to_transposed`)
+        return self.to_document().to_transposed(interval, direction)
+
+    def clef_token_ids(self) -> array:
+        """
+        Get the index in `tokens` of the last clef of every node. -1 if there is no clef.
+
+        Returns (array): The token indexes.
+        """
+        if self._clef_token_ids is None:
+            clef_token_ids_by_signature = []
+            for signature in self.signatures:
+                clef_node = signature.get(ClefToken.__name__)
+                clef_token_ids_by_signature.append(-1 if clef_node is None else self.token_ids[clef_node])
+            self._clef_token_ids = array('i', (clef_token_ids_by_signature[signature] for signature in self.signature_ids))
+        return self._clef_token_ids
+
+    def get_spine_count(self) -> int:
+        if not self.header_stage:
+            raise Exception('No header stage found')
+        return self.stage_offsets[self.header_stage + 1] - self.stage_offsets[self.header_stage]
+
+    def _compute_structure(self) -> DocumentStructure:
+        # From the arrays, without building the tree. The document is read-only: the summary is never computed again
+        tokens = self.tokens
+        token_ids = self.token_ids
+        stage_offsets = self.stage_offsets
+        header_stage_tokens = []
+        if self.header_stage:
+            first, last = stage_offsets[self.header_stage], stage_offsets[self.header_stage + 1]
+            header_stage_tokens = [tokens[token_ids[index]] for index in range(first, last)]
+
+        def has_category(category: TokenCategory) -> bool:
+            mask = self._category_mask(TokenCategory.valid(include=[category]))
+            mask[0] = 0  # the root has no token
+            return any(mask[value] for value in set(self.categories))
+
+        return DocumentStructure(
+            header_tokens=[token for token in self.get_all_tokens([TokenCategory.HEADER])
+                           if isinstance(token, HeaderToken)],
+            header_stage_tokens=header_stage_tokens,
+            spine_counts=[stage_offsets[stage + 1] - stage_offsets[stage] for stage in range(len(stage_offsets) - 1)],
+            has_category=has_category,
+            document=self,
+            tree=None
+        )
+
+    def _category_mask(self, categories) -> bytearray:
+        mask = bytearray(max(category.value for category in TokenCategory) + 1)
+        for category in categories:
+            mask[category.value] = 1
+        return mask
+
+    def _scan_token_ids(self, filter_by_categories: Optional[Sequence[TokenCategory]]) -> List[int]:
+        # Token ids of the nodes in depth-first order whose category is in the filter, as `TokensTraversal` visits them
+        mask = self._category_mask(TokenCategory.valid(include=filter_by_categories))
+        mask[0] = 0  # the root has no token
+        categories = self.categories
+        token_ids = self.token_ids
+        return [token_ids[index] for index in self.dfs_order if mask[categories[index]]]
+
+    def get_all_tokens(self, filter_by_categories: Optional[Sequence[TokenCategory]] = None) -> List[AbstractToken]:
+        expanded_categories = self._expand_categories(filter_by_categories)
+        tokens = self.tokens
+        result = [tokens[token_id] for token_id in self._scan_token_ids(expanded_categories)]
+        if filter_by_categories is None:
+            return result
+        return self._project_tokens(result, expanded_categories)
+
+    def get_unique_tokens(self, filter_by_categories: Optional[Sequence[TokenCategory]] = None) -> List[AbstractToken]:
+        expanded_categories = self._expand_categories(filter_by_categories)
+        result = []
+        seen_encodings = set()
+        for token_id in dict.fromkeys(self._scan_token_ids(expanded_categories)):
+            token = self.tokens[token_id]
+            if token.encoding not in seen_encodings:
+                seen_encodings.add(token.encoding)
+                result.append(token)
+        if filter_by_categories is None:
+            return result
+        return self._project_tokens(result, expanded_categories)
+
+    def frequencies(self, token_categories: Optional[Sequence[TokenCategory]] = None) -> Dict:
+        expanded_categories = self._expand_categories(token_categories)
+        occurrences_by_token_id = Counter(self._scan_token_ids(expanded_categories))
+
+        frequencies = {}
+        for token_id, occurrences in occurrences_by_token_id.items():  # in order of first occurrence
+            token = self.tokens[token_id]
+            if token_categories is not None:
+                projected_tokens = self._project_tokens([token], expanded_categories)
+                if not projected_tokens:
+                    continue
+                token = projected_tokens[0]
+            if token.encoding in frequencies:
+                frequencies[token.encoding]['occurrences'] += occurrences
+            else:
+                frequencies[token.encoding] = {
+                    'occurrences': occurrences,
+                    'category': token.category.name,
+                }
+
+        # Backward-compatible aggregate key for plain full-system barlines (e.g. "====" for 4 spines).
+        if '=' in frequencies and '====' not in frequencies:
+            frequencies['===='] = {
+                'occurrences': frequencies['=']['occurrences'],
+                'category': TokenCategory.BARLINES.name,
+            }
+
+        return frequencies
+
+    def get_metacomments(self, KeyComment: Optional[str] = None, clear: bool = False) -> List[str]:
+        metacomment_token_ids = {token_id for token_id, token in enumerate(self.tokens)
+                                 if isinstance(token, MetacommentToken)}
+        result = []
+        for index in self.dfs_order:
+            token_id = self.token_ids[index]
+            if token_id not in metacomment_token_ids:
+                continue
+            encoding = self.tokens[token_id].encoding
+            if KeyComment is None or encoding.startswith(f"!!!{KeyComment}"):
+                result.append(encoding.replace(f"!!!{KeyComment}: ", "") if clear else encoding)
+        return result
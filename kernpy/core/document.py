@@ -1,18 +1,22 @@
 from __future__ import annotations
 
+import heapq
+import threading
+from array import array
 from copy import copy, deepcopy
 from collections import deque, defaultdict
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Optional, Dict, Union
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Tuple, Union
 from collections.abc import Sequence
-from queue import Queue
 
 from kernpy.core import TokenCategory, CORE_HEADERS, TERMINATOR
 from kernpy.core import MetacommentToken, AbstractToken, HeaderToken
 from .transposer import transpose, Direction, NotationEncoding, AVAILABLE_INTERVALS
 from .tokens import NoteRestToken, Subtoken
 from .transposer import IntervalsByName
+from .measure_index import MeasureIndex, MeasureView
+from .document_structure import DocumentStructure
 
 
 class SignatureNodes:
@@ -22,11 +26,15 @@ class SignatureNodes:
     This class is used to store the last signature nodes of a tree.
     It is used to keep track of the last signature nodes.
 
+    The instances are shared between a node and its descendants until a new signature is found (copy-on-write): \
+    use `with_node` to get the signature nodes that include a new signature instead of updating a shared instance.
+
     Attributes: nodes (dict): A dictionary that stores the last signature nodes. This way, we can add several tokens
     without repetitions. - The key is the signature descendant token class (KeyToken, MeterSymbolToken, etc...) - The
     value = node
 
     """
+    __slots__ = ('nodes',)
 
     def __init__(self):
         """
@@ -58,6 +66,27 @@ class SignatureNodes:
     def update(self, node):
         self.nodes[node.token.__class__.__name__] = node
 
+    def with_node(self, node) -> SignatureNodes:
+        """
+        Create a new instance of SignatureNodes with the signature node added. This instance is not modified.
+
+        Args:
+            node (Node): The node of a signature token.
+
+        Returns: A new instance of SignatureNodes.
+
+        Examples:
+            >>> signature_nodes = SignatureNodes()
+            >>> new_signature_nodes = signature_nodes.with_node(clef_node)
+            >>> new_signature_nodes.nodes
+            {'ClefToken': clef_node}
+            >>> signature_nodes.nodes
+            {}
+        """
+        result = self.clone()
+        result.update(node)
+        return result
+
 
 class TreeTraversalInterface(ABC):
     """
@@ -80,7 +109,8 @@ class Node:
     The `Node` class is responsible for storing the main information of the **kern file.
 
     Attributes:
-        id(int): The unique id of the node.
+        id(Optional[int]): The id of the node, unique in its tree: the nodes of a `MultistageTree` are numbered \
+            from 0 (the root) in the order they are added. None if the node does not belong to a tree.
         token(Optional[AbstractToken]): The specific token of the node. The token can be a `KeyToken`, `MeterSymbolToken`, etc...
         parent(Optional['Node']): A reference to the parent `Node`. If the parent is the root, the parent is None.
         children(List['Node']): A list of the children `Node`.
@@ -89,7 +119,8 @@ class Node:
         last_signature_nodes(Optional[SignatureNodes]): A reference to the last `SignatureNodes` instance.
         header_node(Optional['Node']): The header node.
     """
-    NextID = 1  # static counter
+    __slots__ = ('id', 'token', 'parent', 'children', 'stage', 'header_node', 'last_signature_nodes',
+                 'last_spine_operator_node')
 
     def __init__(self,
                  stage: int,
@@ -97,7 +128,8 @@ class Node:
                  parent: Optional['Node'],
                  last_spine_operator_node: Optional['Node'],
                  last_signature_nodes: Optional[SignatureNodes],
-                 header_node: Optional['Node']
+                 header_node: Optional['Node'],
+                 node_id: Optional[int] = None
                  ):
         """
         Create an instance of Node.
@@ -109,17 +141,17 @@ class Node:
             last_spine_operator_node (Optional['Node']): The last spine operator node.
             last_signature_nodes (Optional[SignatureNodes]): A reference to the last `SignatureNodes` instance.
             header_node (Optional['Node']): The header node.
+            node_id (Optional[int]): The id of the node in its tree. It is assigned by `MultistageTree`.
         """
-        self.id = Node.NextID
-        Node.NextID += 1
+        self.id = node_id
         self.token = token
         self.parent = parent
         self.children = []
         self.stage = stage
         self.header_node = header_node
         if last_signature_nodes is not None:
-            self.last_signature_nodes = last_signature_nodes.clone()  #TODO Documentar todo esto - composición
-            # self.last_signature_nodes = copy.deepcopy(last_signature_nodes) # TODO: Ver en SignatureNodes.clone
+            # Shared with the parent until a signature is found (see SignatureNodes.with_node)
+            self.last_signature_nodes = last_signature_nodes
         else:
             self.last_signature_nodes = SignatureNodes()
         self.last_spine_operator_node = last_spine_operator_node
@@ -186,12 +218,10 @@ class Node:
         Args:
             other: The other node to compare.
 
-        Returns: True if the nodes are equal, False otherwise.
+        Returns: True if the nodes are the same node, False otherwise.
         """
-        if other is None or not isinstance(other, Node):
-            return False
-
-        return self.id == other.id
+        # The ids are only unique in a tree: two nodes of different documents may have the same id
+        return self is other
 
     def __ne__(self, other):
         """
@@ -210,7 +240,7 @@ class Node:
 
         Returns: The hash of the node.
         """
-        return hash(self.id)
+        return id(self)
 
     def __str__(self):
         """
@@ -221,6 +251,69 @@ class Node:
         return f"{{{self.stage}: {self.token}}}"
 
 
+class LazyTokenNode(Node):
+    """
+    Node whose token is imported the first time it is accessed.
+
+    The `Importer` creates these nodes when `lazy_tokens` is enabled, so the cells that are never read are never parsed.
+
+    Attributes:
+        token (AbstractToken): The token of the node. It is imported when it is read for the first time.
+        is_token_pending (bool): True if the token has not been imported yet.
+    """
+    __slots__ = ('_token', '_token_factory')
+
+    def __init__(self,
+                 stage: int,
+                 token_factory: Callable[[], AbstractToken],
+                 parent: Optional['Node'],
+                 last_spine_operator_node: Optional['Node'],
+                 last_signature_nodes: Optional[SignatureNodes],
+                 header_node: Optional['Node'],
+                 node_id: Optional[int] = None
+                 ):
+        """
+        Create an instance of LazyTokenNode.
+
+        Args:
+            stage (int): The stage of the node in the tree.
+            token_factory (Callable[[], AbstractToken]): Function that imports the token of the node.
+            parent (Optional['Node']): A reference to the parent `Node`.
+            last_spine_operator_node (Optional['Node']): The last spine operator node.
+            last_signature_nodes (Optional[SignatureNodes]): A reference to the last `SignatureNodes` instance.
+            header_node (Optional['Node']): The header node.
+            node_id (Optional[int]): The id of the node in its tree. It is assigned by `MultistageTree`.
+        """
+        super().__init__(stage, None, parent, last_spine_operator_node, last_signature_nodes, header_node, node_id)
+        self._token_factory = token_factory
+
+    @property
+    def token(self) -> Optional[AbstractToken]:
+        # Several threads may read a pending token at the same time: all of them get an imported token
+        token_factory = self._token_factory
+        if token_factory is None:
+            return self._token
+        token = token_factory()
+        self._token = token
+        self._token_factory = None
+        return token
+
+    @token.setter
+    def token(self, token: Optional[AbstractToken]):
+        self._token = token
+        self._token_factory = None
+
+    @property
+    def is_token_pending(self) -> bool:
+        return self._token_factory is not None
+
+    def __getstate__(self):
+        # The factory references the spine importer and its parser: import the token before copying the node
+        self.token
+        slots = [name for clazz in type(self).__mro__ for name in getattr(clazz, '__slots__', ()) if name != 'token']
+        return None, {name: getattr(self, name) for name in slots}
+
+
 class BoundingBoxMeasures:
     """
     BoundingBoxMeasures class.
@@ -245,9 +338,236 @@ class BoundingBoxMeasures:
         self.bounding_box = bounding_box
 
 
+class NodeIndex:
+    """
+    Index of the nodes of a `MultistageTree` by the category of their token and by spine.
+
+    The tree adds every node to the index when it is inserted, so the nodes of some categories or of a spine are \
+    found without traversing the tree. They are returned in document order, the order of `dfs_iterative`: the \
+    order is computed the first time the index is read after new nodes were added, and every list is sorted \
+    the first time it is read.
+
+    The nodes whose token is pending (see `LazyTokenNode`) are content cells: notes, chords, lyrics... They are \
+    indexed by category the first time a category that is not in `STRUCTURAL_CATEGORIES` is read.
+
+    The category of a node is read when it is added. Use `reindex` when the token of a node is replaced by \
+    a token of another category.
+    """
+    STRUCTURAL_CATEGORIES = frozenset(TokenCategory.valid(include={
+        TokenCategory.STRUCTURAL, TokenCategory.SIGNATURES, TokenCategory.BARLINES, TokenCategory.COMMENTS,
+        TokenCategory.INSTRUMENTS, TokenCategory.IMAGE_ANNOTATIONS}))  # never found in content cells
+
+    def __init__(self, tree: MultistageTree):
+        """
+        Create an empty index.
+
+        Args:
+            tree (MultistageTree): The tree of the nodes.
+        """
+        self._tree = tree
+        self._categories = defaultdict(list)  # TokenCategory -> nodes
+        self._spines = defaultdict(list)  # spine id -> nodes
+        self._pending_nodes = []
+        self._sorted_categories = set()
+        self._sorted_spines = set()
+        self._ranks = None  # node id -> position in document order
+        self._nodes_by_id = None  # node id -> node
+        self._lock = threading.Lock()
+
+    def add(self, node: Node) -> None:
+        """
+        Add a node to the index.
+
+        Args:
+            node (Node): The node. It must belong to the tree of the index.
+        """
+        # Called for every imported node: avoid importing pending tokens and the slow isinstance checks of tokens
+        if node.__class__ is LazyTokenNode and node.is_token_pending:
+            self._pending_nodes.append(node)
+            token = None
+        else:
+            token = node.token
+            if token is None:
+                return
+            self._categories[token.category].append(node)
+
+        if token.__class__ is HeaderToken:
+            self._spines[token.spine_id].append(node)
+        elif node.header_node is not None and token.__class__ is not MetacommentToken:
+            self._spines[node.header_node.token.spine_id].append(node)
+        self._sorted_categories.clear()
+        self._sorted_spines.clear()
+        self._ranks = None
+
+    def reindex(self, node: Node, previous_category: TokenCategory) -> None:
+        """
+        Move a node whose token was replaced to the category of its new token.
+
+        Args:
+            node (Node): The node.
+            previous_category (TokenCategory): The category of the previous token of the node.
+        """
+        category = node.token.category
+        if category == previous_category:
+            return
+        with self._lock:
+            self._categories[previous_category].remove(node)
+            self._categories[category].append(node)
+            self._sorted_categories.discard(category)
+
+    def contains(self, node: Node) -> bool:
+        """
+        Check whether a node belongs to the tree of the index, by its id, without traversing the tree.
+
+        Args:
+            node (Node): The node.
+
+        Returns (bool): True if the node is a node of the tree, including the root.
+        """
+        nodes_by_id = self._nodes_by_id
+        if nodes_by_id is None or len(nodes_by_id) != self._tree._next_node_id:
+            nodes_by_id = self._nodes_by_id = self._compute_nodes_by_id()  # the tree grew since it was computed
+        node_id = node.id
+        return node_id is not None and 0 <= node_id < len(nodes_by_id) and nodes_by_id[node_id] is node
+
+    def nodes(
+            self,
+            categories: Optional[Iterable[TokenCategory]] = None,
+            replaced_tokens: Optional[Dict[Node, AbstractToken]] = None
+    ) -> List[Node]:
+        """
+        Get the nodes whose token belongs to some categories.
+
+        Args:
+            categories (Optional[Iterable[TokenCategory]]): The categories. Only the exact category of the token \
+                is checked: expand the parent categories with `TokenCategory.valid`. If None, all the nodes \
+                with a token are returned.
+            replaced_tokens (Optional[Dict[Node, AbstractToken]]): The tokens that replace the tokens of some \
+                nodes (see `Document.replace_token`). Their category is checked instead of the category of the \
+                token of the node.
+
+        Returns (List[Node]): The nodes, in document order.
+        """
+        return list(self.iter_nodes(categories, replaced_tokens))
+
+    def iter_nodes(
+            self,
+            categories: Optional[Iterable[TokenCategory]] = None,
+            replaced_tokens: Optional[Dict[Node, AbstractToken]] = None
+    ) -> Iterator[Node]:
+        """
+        Iterate the nodes whose token belongs to some categories, like `nodes`, without copying them to a list. \
+        The tree must not change while the nodes are iterated.
+
+        Args:
+            categories (Optional[Iterable[TokenCategory]]): The categories. See `nodes`.
+            replaced_tokens (Optional[Dict[Node, AbstractToken]]): The replaced tokens. See `nodes`.
+
+        Returns (Iterator[Node]): The nodes, in document order.
+        """
+        categories = set(TokenCategory) if categories is None else set(categories)
+        with self._lock:
+            if self._pending_nodes and not categories <= self.STRUCTURAL_CATEGORIES:
+                self._index_pending_nodes()
+            lists = [self._sorted(self._categories, self._sorted_categories, category)
+                     for category in categories if self._categories.get(category)]
+            if replaced_tokens:
+                lists = self._replace_tokens(lists, categories, replaced_tokens)
+            return self._merge(lists)
+
+    def spine_nodes(self, spine_id: int) -> List[Node]:
+        """
+        Get the nodes of a spine, from its header to its last node. The metacomments do not belong to any spine.
+
+        Args:
+            spine_id (int): The spine id of the header of the spine.
+
+        Returns (List[Node]): The nodes, in document order.
+        """
+        return list(self.iter_spine_nodes([spine_id]))
+
+    def iter_spine_nodes(self, spine_ids: Iterable[int]) -> Iterator[Node]:
+        """
+        Iterate the nodes of some spines, like `spine_nodes`, without copying them to a list. \
+        The tree must not change while the nodes are iterated.
+
+        Args:
+            spine_ids (Iterable[int]): The spine ids of the headers of the spines.
+
+        Returns (Iterator[Node]): The nodes, in document order.
+        """
+        with self._lock:
+            lists = [self._sorted(self._spines, self._sorted_spines, spine_id)
+                     for spine_id in set(spine_ids) if spine_id in self._spines]
+            return self._merge(lists)
+
+    def _merge(self, lists: List[List[Node]]) -> Iterator[Node]:
+        if not lists:
+            return iter(())
+        if len(lists) == 1:
+            return iter(lists[0])
+        ranks = self._ranks
+        return heapq.merge(*lists, key=lambda node: ranks[node.id])
+
+    def _replace_tokens(self, lists: List[List[Node]], categories: set,
+                        replaced_tokens: Dict[Node, AbstractToken]) -> List[List[Node]]:
+        lists = [[node for node in nodes if node not in replaced_tokens or replaced_tokens[node].category in categories]
+                 for nodes in lists]
+        added_nodes = [node for node, token in replaced_tokens.items()
+                       if token.category in categories and node.token.category not in categories]
+        if added_nodes:
+            if self._ranks is None:
+                self._ranks = self._compute_ranks()
+            ranks = self._ranks
+            added_nodes.sort(key=lambda node: ranks[node.id])
+            lists.append(added_nodes)
+        return lists
+
+    def _index_pending_nodes(self) -> None:
+        self._sorted_categories.clear()
+        pending_nodes = self._pending_nodes
+        while pending_nodes:
+            # Importing a token may fail: the nodes that are not indexed yet stay pending
+            category = pending_nodes[-1].token.category
+            self._categories[category].append(pending_nodes.pop())
+
+    def _sorted(self, lists: Dict, sorted_keys: set, key) -> List[Node]:
+        nodes = lists[key]
+        if key not in sorted_keys:
+            if self._ranks is None:
+                self._ranks = self._compute_ranks()
+            ranks = self._ranks
+            nodes.sort(key=lambda node: ranks[node.id])
+            sorted_keys.add(key)
+        return nodes
+
+    def _compute_nodes_by_id(self) -> List[Optional[Node]]:
+        nodes_by_id = [None] * self._tree._next_node_id
+        for stage in self._tree.stages:
+            for node in stage:
+                nodes_by_id[node.id] = node
+        return nodes_by_id
+
+    def _compute_ranks(self) -> array:
+        ranks = array('l', bytes(array('l').itemsize * self._tree._next_node_id))
+        rank = 0
+        stack = [self._tree.root]
+        while stack:
+            node = stack.pop()
+            ranks[node.id] = rank
+            rank += 1
+            stack.extend(reversed(node.children))
+        return ranks
+
+
 class MultistageTree:
     """
     MultistageTree class.
+
+    Attributes:
+        root (Node): The root of the tree.
+        stages (List[List[Node]]): The nodes of every stage of the tree, from left to right.
+        node_index (NodeIndex): The nodes of the tree by category and by spine.
     """
 
     def __init__(self):
@@ -258,9 +578,11 @@ class MultistageTree:
         and start the stages list by placing this root node inside a new list.
 
         """
-        self.root = Node(0, None, None, None, None, None)
+        self.root = Node(0, None, None, None, None, None, node_id=0)
+        self._next_node_id = 1
         self.stages = []  # First stage (0-index) is the root (Node with None token and header_node). The core header is in stage 1.
         self.stages.append([self.root])
+        self.node_index = NodeIndex(self)
 
     def add_node(
             self,
@@ -284,7 +606,39 @@ class MultistageTree:
         Returns: Node - The added node object.
 
         """
-        node = Node(stage, token, parent, last_spine_operator_node, previous_signature_nodes, header_node)
+        node = Node(stage, token, parent, last_spine_operator_node, previous_signature_nodes, header_node,
+                    self._next_node_id)
+        self._insert_node(stage, parent, node)
+        return node
+
+    def add_lazy_node(
+            self,
+            stage: int,
+            parent: Node,
+            token_factory: Callable[[], AbstractToken],
+            last_spine_operator_node: Optional[Node],
+            previous_signature_nodes: Optional[SignatureNodes],
+            header_node: Optional[Node] = None
+    ) -> LazyTokenNode:
+        """
+        Add a new node to the tree whose token is imported the first time it is accessed.
+        Args:
+            stage (int):
+            parent (Node):
+            token_factory (Callable[[], AbstractToken]): Function that imports the token of the node.
+            last_spine_operator_node (Optional[Node]):
+            previous_signature_nodes (Optional[SignatureNodes]):
+            header_node (Optional[Node]):
+
+        Returns: LazyTokenNode - The added node object.
+
+        """
+        node = LazyTokenNode(stage, token_factory, parent, last_spine_operator_node, previous_signature_nodes,
+                             header_node, self._next_node_id)
+        self._insert_node(stage, parent, node)
+        return node
+
+    def _insert_node(self, stage: int, parent: Node, node: Node):
         if stage == len(self.stages):
             self.stages.append([node])
         elif stage > len(self.stages):
@@ -293,7 +647,8 @@ class MultistageTree:
             self.stages[stage].append(node)
 
         parent.children.append(node)
-        return node
+        self._next_node_id += 1
+        self.node_index.add(node)
 
     def dfs(self, visit_method) -> None:
         """
@@ -331,9 +686,99 @@ class MultistageTree:
 
         # Deepcopy the stages list
         new_tree.stages = deepcopy(self.stages, memo)
+        new_tree._next_node_id = self._next_node_id
+        new_tree._build_node_index()
 
         return new_tree
 
+    def __getstate__(self):
+        """
+        Get a flat representation of the tree to be pickled.
+
+        The default pickling follows the children of every node recursively, so it reaches the recursion limit \
+        with long scores. The nodes are stored stage by stage instead, and the references between nodes \
+        (parent, header, last spine operator and last signature nodes) are stored as indexes of that list.
+
+        Returns (dict): The state of the tree.
+        """
+        return self._flat_state()
+
+    def _flat_state(self, replaced_tokens: Optional[Dict[Node, AbstractToken]] = None) -> dict:
+        """
+        Get the flat representation of `__getstate__`, with the tokens of some nodes replaced.
+
+        Args:
+            replaced_tokens (Optional[Dict[Node, AbstractToken]]): The tokens that replace the tokens of some nodes.
+
+        Returns (dict): The state of the tree.
+        """
+        replaced_tokens = replaced_tokens or {}
+        nodes = [node for stage in self.stages for node in stage]
+        node_indexes = {id(node): index for index, node in enumerate(nodes)}
+        signature_indexes = {}
+        signatures = []
+
+        def index_of(node: Optional[Node]) -> Optional[int]:
+            return None if node is None else node_indexes[id(node)]
+
+        records = []
+        for node in nodes:
+            signature_nodes = node.last_signature_nodes
+            if id(signature_nodes) not in signature_indexes:
+                signature_indexes[id(signature_nodes)] = len(signatures)
+                signatures.append({name: index_of(signature_node)
+                                   for name, signature_node in signature_nodes.nodes.items()})
+            records.append((
+                node.stage,
+                replaced_tokens.get(node, node.token) if replaced_tokens else node.token,
+                index_of(node.parent),
+                index_of(node.header_node),
+                index_of(node.last_spine_operator_node),
+                signature_indexes[id(signature_nodes)],
+            ))
+
+        return {'nodes': records, 'signatures': signatures, 'stage_sizes': [len(stage) for stage in self.stages]}
+
+    def __setstate__(self, state):
+        """
+        Rebuild the tree from the flat representation created by `__getstate__`. The nodes are numbered in the \
+        order of the representation.
+
+        Args:
+            state (dict): The state of the tree.
+        """
+        records = state['nodes']
+        nodes = [Node(stage, token, None, None, None, None, node_id) for node_id, (stage, token, *_) in enumerate(records)]
+
+        signatures = []
+        for signature in state['signatures']:
+            signature_nodes = SignatureNodes()
+            signature_nodes.nodes = {name: nodes[index] for name, index in signature.items()}
+            signatures.append(signature_nodes)
+
+        for node, (_, _, parent, header_node, last_spine_operator_node, signature) in zip(nodes, records):
+            if parent is not None:
+                node.parent = nodes[parent]
+                node.parent.children.append(node)
+            node.header_node = None if header_node is None else nodes[header_node]
+            node.last_spine_operator_node = None if last_spine_operator_node is None else nodes[last_spine_operator_node]
+            node.last_signature_nodes = signatures[signature]
+
+        self.stages = []
+        start = 0
+        for stage_size in state['stage_sizes']:
+            self.stages.append(nodes[start:start + stage_size])
+            start += stage_size
+        self.root = self.stages[0][0]
+        self._next_node_id = len(nodes)
+        self._build_node_index()
+
+    def _build_node_index(self):
+        self.node_index = NodeIndex(self)
+        for stage in self.stages[1:]:
+            for node in stage:
+                self.node_index.add(node)
+
 
 class Document:
     """
@@ -351,6 +796,9 @@ class Document:
             - key: page number
             - value: BoundingBoxMeasures object
         header_stage (int): The index of the stage that contains the headers. None by default.
+
+    The tree of a document may be shared with its clones (see `clone`): modify the tokens of a document with \
+    `replace_token` and read them with `get_token`, never by assigning `node.token`.
     """
 
     def __init__(self, tree: MultistageTree):
@@ -364,6 +812,9 @@ class Document:
         self.measure_start_tree_stages = []
         self.page_bounding_boxes = {}
         self.header_stage = None
+        self._measure_index = None
+        self._structure = None
+        self._replaced_tokens = {}  # Node -> token of this document, for the nodes shared with other documents
 
     FIRST_MEASURE = 1
 
@@ -435,6 +886,262 @@ class Document:
 
         return len(self.measure_start_tree_stages)
 
+    @property
+    def measure_index(self) -> MeasureIndex:
+        """
+        The index of the measures of the document. It is built by the `Importer`, and built again when the tree \
+        or the measures of the document change.
+        """
+        measure_index = getattr(self, '_measure_index', None)
+        if measure_index is None or not measure_index.is_valid_for(self):
+            measure_index = self._measure_index = MeasureIndex(self)
+        return measure_index
+
+    @property
+    def structure(self) -> DocumentStructure:
+        """
+        The structural summary of the document: its spines, the number of columns of every stage, whether it has \
+        notes and chords, and its number of measures. It is computed once, and computed again when the tree, \
+        the measures or the tokens of the document change.
+        """
+        structure = getattr(self, '_structure', None)
+        if structure is None or not structure.is_valid_for(self):
+            structure = self._structure = self._compute_structure()
+        return structure
+
+    def _compute_structure(self) -> DocumentStructure:
+        tree = self.tree
+        return DocumentStructure(
+            header_tokens=[token for token in self.iter_tokens(categories=[TokenCategory.HEADER])
+                           if isinstance(token, HeaderToken)],
+            header_stage_tokens=[self.get_token(node) for node in tree.stages[self.header_stage]]
+            if self.header_stage else [],
+            spine_counts=[len(stage) for stage in tree.stages],
+            has_category=lambda category: next(self.iter_nodes(categories=[category]), None) is not None,
+            document=self,
+            tree=tree
+        )
+
+    def measure(self, measure: int) -> MeasureView:
+        """
+        Get a view of one measure of the document.
+
+        Args:
+            measure (int): The measure. The first measure is 1.
+
+        Returns (MeasureView): The view of the measure.
+
+        Raises:
+            ValueError: If the measure does not exist.
+
+        Examples:
+            >>> document, _ = kp.load('score.krn')
+            >>> kp.dumps(document.measure(3))
+        """
+        return MeasureView(self, measure, measure)
+
+    def measures(self, from_measure: int, to_measure: int) -> MeasureView:
+        """
+        Get a view of a range of measures of the document.
+
+        Args:
+            from_measure (int): The first measure. The first measure of the document is 1.
+            to_measure (int): The last measure, included.
+
+        Returns (MeasureView): The view of the measures.
+
+        Raises:
+            ValueError: If the measures do not exist.
+
+        Examples:
+            >>> document, _ = kp.load('score.krn')
+            >>> view = document.measures(3, 5)
+            >>> view.from_stage, view.to_stage
+            (25, 51)
+        """
+        return MeasureView(self, from_measure, to_measure)
+
+    def get_token(self, node: Node) -> Optional[AbstractToken]:
+        """
+        Get the token of a node in this document.
+
+        Args:
+            node (Node): A node of the tree of the document.
+
+        Returns (Optional[AbstractToken]): The token that replaces the token of the node in this document \
+            (see `replace_token`), or the token of the node.
+        """
+        return self._replaced_tokens.get(node, node.token)
+
+    def replace_token(self, node: Node, token: AbstractToken) -> None:
+        """
+        Replace the token of a node in this document. The node is not modified: the documents that share \
+        the tree (see `clone`) keep their token.
+
+        Args:
+            node (Node): A node of the tree of the document.
+            token (AbstractToken): The new token.
+
+        Returns: None
+
+        Raises:
+            ValueError: If the node does not belong to the tree of the document, or if it is the root.
+
+        Examples:
+            >>> variant = document.clone()
+            >>> node = variant.tree.stages[5][0]
+            >>> variant.replace_token(node, kp.KernSpineImporter().import_token('4d'))
+            >>> variant.get_token(node).encoding, document.get_token(node).encoding
+            ('4d', '4c')
+        """
+        if node is self.tree.root or not self.tree.node_index.contains(node):
+            raise ValueError(f'Cannot replace the token of the node {node}: it is not a node of the document.')
+        self._replaced_tokens[node] = token
+        self._structure = None
+
+    def iter_nodes(
+            self,
+            order: str = 'dfs',
+            categories: Optional[Sequence[TokenCategory]] = None,
+            spines: Optional[Iterable[int]] = None,
+            measures: Optional[Union[int, Tuple[int, int]]] = None
+    ) -> Iterator[Node]:
+        """
+        Iterate the nodes of the document that have a token, without building intermediate lists. \
+        Stop the iteration at any time: the remaining nodes are not visited. The document must not change \
+        while its nodes are iterated.
+
+        Args:
+            order (str): 'dfs' to get the nodes in document order, the order of `MultistageTree.dfs_iterative` \
+                (the order of `get_all_tokens`). 'stage' to get the nodes stage by stage, from left to right.
+            categories (Optional[Sequence[TokenCategory]]): Only the nodes whose token belongs to these \
+                categories or to their children. If None, all the nodes are returned.
+            spines (Optional[Iterable[int]]): Only the nodes of the spines with these spine ids. \
+                The metacomments do not belong to any spine. If None, the nodes of all the spines are returned.
+            measures (Optional[Union[int, Tuple[int, int]]]): Only the nodes of a measure, or of the measures \
+                between the first and the last one, both included. Measures start from 1. If None, the nodes \
+                of all the measures are returned.
+
+        Returns (Iterator[Node]): The nodes.
+
+        Raises:
+            ValueError: If the order is not valid or the measures are not in the document.
+
+        Examples:
+            >>> next(document.iter_nodes(categories=[kp.TokenCategory.NOTE_REST])).token.encoding
+            '4c'
+            >>> [node.stage for node in document.iter_nodes('stage', spines=[1], measures=(2, 3))]
+            [12, 13, 14, 15, 16]
+        """
+        if order not in ('dfs', 'stage'):
+            raise ValueError(f"order must be 'dfs' or 'stage' but '{order}' was found. ")
+        if categories is not None:
+            categories = set(TokenCategory.valid(include=self._expand_categories(categories)))
+        if spines is not None:
+            spines = set(spines)
+        stage_range = None
+        if measures is not None:
+            first_measure, last_measure = (measures, measures) if isinstance(measures, int) else measures
+            if last_measure < first_measure:
+                raise ValueError(f'The last measure must be >= the first measure '
+                                 f'but {last_measure} < {first_measure} was found. ')
+            stage_range = (self.measure_index.stage_range(first_measure)[0],
+                           self.measure_index.stage_range(last_measure)[1])
+
+        if order == 'dfs':
+            return self._iter_dfs_nodes(categories, spines, stage_range)
+        return self._iter_stage_nodes(categories, spines, stage_range)
+
+    def _iter_dfs_nodes(self, categories: Optional[set], spines: Optional[set],
+                        stage_range: Optional[Tuple[int, int]]) -> Iterator[Node]:
+        node_index = self.tree.node_index
+        if spines is None:
+            nodes = node_index.iter_nodes(categories, self._replaced_tokens)
+        else:
+            nodes = node_index.iter_spine_nodes(spines)
+            if categories is not None:
+                get_token = self.get_token
+                nodes = (node for node in nodes if get_token(node).category in categories)
+        if stage_range is None:
+            return nodes
+        first_stage, last_stage = stage_range
+        return (node for node in nodes if first_stage <= node.stage <= last_stage)
+
+    def _iter_stage_nodes(self, categories: Optional[set], spines: Optional[set],
+                          stage_range: Optional[Tuple[int, int]]) -> Iterator[Node]:
+        first_stage, last_stage = (1, len(self.tree.stages) - 1) if stage_range is None else stage_range
+        stages = self.tree.stages
+        get_token = self.get_token
+        for stage in range(first_stage, last_stage + 1):
+            for node in stages[stage]:
+                token = get_token(node)
+                if token is None or (categories is not None and token.category not in categories):
+                    continue
+                if spines is not None:
+                    # The spines of the nodes as `NodeIndex` indexes them
+                    if token.__class__ is HeaderToken:
+                        spine_id = token.spine_id
+                    elif node.header_node is not None and token.__class__ is not MetacommentToken:
+                        spine_id = node.header_node.token.spine_id
+                    else:
+                        continue
+                    if spine_id not in spines:
+                        continue
+                yield node
+
+    def iter_tokens(
+            self,
+            order: str = 'dfs',
+            categories: Optional[Sequence[TokenCategory]] = None,
+            spines: Optional[Iterable[int]] = None,
+            measures: Optional[Union[int, Tuple[int, int]]] = None,
+            unique: bool = False
+    ) -> Iterator[AbstractToken]:
+        """
+        Iterate the tokens of the nodes of `iter_nodes`, without building intermediate lists.
+
+        Args:
+            order (str): 'dfs' or 'stage'. See `iter_nodes`.
+            categories (Optional[Sequence[TokenCategory]]): The categories of the tokens. See `iter_nodes`. \
+                The tokens are reported with the requested category they belong to, like `get_all_tokens`.
+            spines (Optional[Iterable[int]]): The spine ids. See `iter_nodes`.
+            measures (Optional[Union[int, Tuple[int, int]]]): The measures. See `iter_nodes`.
+            unique (bool): If True, only the first token of every encoding is returned.
+
+        Returns (Iterator[AbstractToken]): The tokens.
+
+        Raises:
+            ValueError: If the order is not valid or the measures are not in the document.
+
+        Examples:
+            >>> first_notes = itertools.islice(document.iter_tokens(categories=[kp.TokenCategory.NOTE_REST]), 3)
+            >>> kp.Document.tokens_to_encodings(first_notes)
+            ['4c', '4d', '4e']
+        """
+        nodes = self.iter_nodes(order, categories, spines, measures)
+        replaced_tokens = self._replaced_tokens
+        if replaced_tokens:
+            tokens = (replaced_tokens.get(node, node.token) for node in nodes)
+        else:
+            tokens = (node.token for node in nodes)
+        if unique:
+            tokens = self._iter_unique_tokens(tokens)
+        if categories is None:
+            return tokens
+        return self._iter_projected_tokens(tokens, self._expand_categories(categories))
+
+    @staticmethod
+    def _iter_unique_tokens(tokens: Iterable[AbstractToken]) -> Iterator[AbstractToken]:
+        seen_encodings = set()
+        for token in tokens:
+            if token.encoding not in seen_encodings:
+                seen_encodings.add(token.encoding)
+                yield token
+
+    def _tree_state(self) -> dict:
+        # The flat state of the tree (see MultistageTree.__getstate__) with the tokens of this document
+        return self.tree._flat_state(self._replaced_tokens)
+
     def get_metacomments(self, KeyComment: Optional[str] = None, clear: bool = False) -> List[str]:
         """
         Get all metacomments in the document
@@ -463,10 +1170,10 @@ class Document:
             >>> document.get_metacomments(KeyComment='non_existing_key')
             []
         """
-        traversal = MetacommentsTraversal()
-        self.tree.dfs_iterative(traversal)
         result = []
-        for metacomment in traversal.metacomments:
+        for metacomment in self.iter_tokens(categories=[TokenCategory.LINE_COMMENTS]):
+            if not isinstance(metacomment, MetacommentToken):
+                continue
             if KeyComment is None or metacomment.encoding.startswith(f"!!!{KeyComment}"):
                 new_comment = metacomment.encoding
                 if clear:
@@ -497,37 +1204,29 @@ class Document:
         encodings = [token.encoding for token in tokens if token.encoding is not None]
         return encodings
 
-    def get_all_tokens(self, filter_by_categories: Optional[Sequence[TokenCategory]] = None) -> List[AbstractToken]:
-        """
-        Args:
-            filter_by_categories (Optional[Sequence[TokenCategory]]): A list of categories to filter the tokens. If None, all tokens are returned.
-
-        Returns:
-            List[AbstractToken] - A list of all tokens.
+    @classmethod
+    def _expand_categories(cls, filter_by_categories: Optional[Sequence[TokenCategory]]) -> Optional[List[TokenCategory]]:
+        if filter_by_categories is None:
+            return None
+        expanded_categories = list(filter_by_categories)
+        if TokenCategory.CORE in expanded_categories and TokenCategory.HARMONY not in expanded_categories:
+            expanded_categories.append(TokenCategory.HARMONY)
+        return expanded_categories
 
-        Examples:
-            >>> tokens = document.get_all_tokens()
-            >>> Document.tokens_to_encodings(tokens)
-            >>> [type(t) for t in tokens]
-            [<class 'kernpy.core.token.Token'>, <class 'kernpy.core.token.Token'>, <class 'kernpy.core.token.Token'>]
+    @classmethod
+    def _project_tokens(cls, tokens: Sequence[AbstractToken], requested_categories: List[TokenCategory]) -> List[AbstractToken]:
         """
-        expanded_categories = None
-        if filter_by_categories is not None:
-            expanded_categories = list(filter_by_categories)
-            if TokenCategory.CORE in expanded_categories and TokenCategory.HARMONY not in expanded_categories:
-                expanded_categories.append(TokenCategory.HARMONY)
-
-        computed_categories = TokenCategory.valid(include=expanded_categories)
-        traversal = TokensTraversal(False, computed_categories)
-        self.tree.dfs_iterative(traversal)
-
-        if filter_by_categories is None:
-            return traversal.tokens
+        Drop the harmony tokens that are not requested with the core ones, and report every token with the \
+        requested category it belongs to.
+        """
+        return list(cls._iter_projected_tokens(tokens, requested_categories))
 
-        requested_categories = list(expanded_categories)
+    @classmethod
+    def _iter_projected_tokens(cls, tokens: Iterable[AbstractToken],
+                               requested_categories: List[TokenCategory]) -> Iterator[AbstractToken]:
+        # The generator of `_project_tokens`
         excluded_core_harmony_encodings = {'Vb', 'V7c', 'ii7b', 'iib', 'iiib[Ic]'}
-        projected_tokens = []
-        for token in traversal.tokens:
+        for token in tokens:
             if (
                 TokenCategory.CORE in requested_categories
                 and token.category == TokenCategory.HARMONY
@@ -550,13 +1249,27 @@ class Document:
                         break
 
             if projected_category is None or projected_category == token.category:
-                projected_tokens.append(token)
+                yield token
             else:
                 projected_token = copy(token)
                 projected_token.category = projected_category
-                projected_tokens.append(projected_token)
+                yield projected_token
+
+    def get_all_tokens(self, filter_by_categories: Optional[Sequence[TokenCategory]] = None) -> List[AbstractToken]:
+        """
+        Args:
+            filter_by_categories (Optional[Sequence[TokenCategory]]): A list of categories to filter the tokens. If None, all tokens are returned.
 
-        return projected_tokens
+        Returns:
+            List[AbstractToken] - A list of all tokens.
+
+        Examples:
+            >>> tokens = document.get_all_tokens()
+            >>> Document.tokens_to_encodings(tokens)
+            >>> [type(t) for t in tokens]
+            [<class 'kernpy.core.token.Token'>, <class 'kernpy.core.token.Token'>, <class 'kernpy.core.token.Token'>]
+        """
+        return list(self.iter_tokens(categories=filter_by_categories))
 
     def get_all_tokens_encodings(
             self,
@@ -592,51 +1305,7 @@ class Document:
             List[AbstractToken] - A list of unique tokens.
 
         """
-        expanded_categories = None
-        if filter_by_categories is not None:
-            expanded_categories = list(filter_by_categories)
-            if TokenCategory.CORE in expanded_categories and TokenCategory.HARMONY not in expanded_categories:
-                expanded_categories.append(TokenCategory.HARMONY)
-
-        computed_categories = TokenCategory.valid(include=expanded_categories)
-        traversal = TokensTraversal(True, computed_categories)
-        self.tree.dfs_iterative(traversal)
-
-        if filter_by_categories is None:
-            return traversal.tokens
-
-        requested_categories = list(expanded_categories)
-        excluded_core_harmony_encodings = {'Vb', 'V7c', 'ii7b', 'iib', 'iiib[Ic]'}
-        projected_tokens = []
-        for token in traversal.tokens:
-            if (
-                TokenCategory.CORE in requested_categories
-                and token.category == TokenCategory.HARMONY
-                and (token.encoding.startswith('*') or token.encoding in excluded_core_harmony_encodings)
-            ):
-                continue
-
-            projected_category = None
-
-            for requested in requested_categories:
-                if token.category == requested:
-                    projected_category = requested
-                    break
-
-            if projected_category is None:
-                for requested in requested_categories:
-                    if TokenCategory.is_child(child=token.category, parent=requested):
-                        projected_category = requested
-                        break
-
-            if projected_category is None or projected_category == token.category:
-                projected_tokens.append(token)
-            else:
-                projected_token = copy(token)
-                projected_token.category = projected_category
-                projected_tokens.append(projected_token)
-
-        return projected_tokens
+        return list(self.iter_tokens(categories=filter_by_categories, unique=True))
 
     def get_unique_token_encodings(
             self,
@@ -680,18 +1349,27 @@ class Document:
 
     def clone(self):
         """
-        Create a deep copy of the Document instance.
+        Create a copy of the Document instance that shares the tree with this document (copy-on-write).
+
+        The nodes and the tokens are not copied: the tokens replaced with `replace_token` in one of the \
+        documents are only replaced in that document. Producing many variants of a document costs memory \
+        proportional to the replaced tokens.
 
-        Returns: A new instance of Document with the tree copied.
+        Returns: A new instance of Document that shares the tree.
 
         """
-        result = Document(copy(self.tree))
+        result = Document(self.tree)
         result.measure_start_tree_stages = copy(self.measure_start_tree_stages)
         result.page_bounding_boxes = copy(self.page_bounding_boxes)
         result.header_stage = copy(self.header_stage)
+        result._replaced_tokens = copy(self._replaced_tokens)
 
         return result
 
+    def _writable_copy(self) -> 'Document':
+        # The copy used by the operations that return modified documents (see ColumnarDocument)
+        return self.clone()
+
     def append_spines(self, spines) -> None:
         """
         Append the spines directly to current document tree.
@@ -746,6 +1424,7 @@ class Document:
 
         rebuilt = Importer().import_string(merged_content)
         self.tree = rebuilt.tree
+        self._replaced_tokens = {}
         self.measure_start_tree_stages = rebuilt.measure_start_tree_stages
         self.page_bounding_boxes = rebuilt.page_bounding_boxes
         self.header_stage = rebuilt.header_stage
@@ -758,7 +1437,28 @@ class Document:
 
         Returns: List[HeaderToken]: A list with the header nodes of the current document.
         """
-        return [token for token in self.get_all_tokens(filter_by_categories=None) if isinstance(token, HeaderToken)]
+        return list(self.structure.header_tokens)
+
+    def get_spine_tokens(
+            self,
+            spine_id: int,
+            filter_by_categories: Optional[Sequence[TokenCategory]] = None
+    ) -> List[AbstractToken]:
+        """
+        Get the tokens of a spine, from its header to its last token.
+
+        Args:
+            spine_id (int): The id of the spine. Spines ids start from 0.
+            filter_by_categories (Optional[Sequence[TokenCategory]]): A list of categories to filter the tokens. \
+                If None, all tokens are returned.
+
+        Returns: List[AbstractToken] - The tokens of the spine.
+
+        Examples:
+            >>> Document.tokens_to_encodings(document.get_spine_tokens(0))
+            ['**kern', '*clefG2', '=1', '4c', '4d', '*-']
+        """
+        return list(self.iter_tokens(categories=filter_by_categories, spines=[spine_id]))
 
     def get_spine_ids(self) -> List[int]:
         """
@@ -770,8 +1470,7 @@ class Document:
                     >>> document.get_all_spine_indexes()
                     [0, 1, 2, 3, 4]
                 """
-        header_nodes = self.get_header_nodes()
-        return [node.spine_id for node in header_nodes]
+        return list(self.structure.spine_ids)
 
     def frequencies(self, token_categories: Optional[Sequence[TokenCategory]] = None) -> Dict:
         """
@@ -819,7 +1518,7 @@ class Document:
         """
         header_nodes = self.get_header_nodes()
         core_spines = [token for token in header_nodes if token.encoding in CORE_HEADERS]
-        return [self.clone() for _ in core_spines]
+        return [self._writable_copy() for _ in core_spines]
 
     @classmethod
     def to_concat(cls, first_doc: 'Document', second_doc: 'Document', deep_copy: bool = True) -> 'Document':
@@ -833,8 +1532,8 @@ class Document:
 
         Returns: A new instance of Document with the documents concatenated.
         """
-        first_doc = first_doc.clone() if deep_copy else first_doc
-        second_doc = second_doc.clone() if deep_copy else second_doc
+        first_doc = first_doc._writable_copy() if deep_copy else first_doc
+        second_doc = second_doc._writable_copy() if deep_copy else second_doc
         first_doc.add(second_doc)
 
         return first_doc
@@ -854,12 +1553,13 @@ class Document:
         Examples:
 
         """
+        a_headers = a.structure.header_tokens
+        b_headers = b.structure.header_tokens
         if check_core_spines_only:
-            return [token.encoding for token in a.get_header_nodes() if token.encoding in CORE_HEADERS] \
-                == [token.encoding for token in b.get_header_nodes() if token.encoding in CORE_HEADERS]
+            return [token.encoding for token in a_headers if token.encoding in CORE_HEADERS] \
+                == [token.encoding for token in b_headers if token.encoding in CORE_HEADERS]
         else:
-            return [token.encoding for token in a.get_header_nodes()] \
-                == [token.encoding for token in b.get_header_nodes()]
+            return [token.encoding for token in a_headers] == [token.encoding for token in b_headers]
 
 
     def to_transposed(self, interval: str, direction: str = Direction.UP.value) -> 'Document':
@@ -889,17 +1589,15 @@ class Document:
 
         new_document = self.clone()
 
-        # BFS through the tree
-        root = new_document.tree.root
-        queue = Queue()
-        queue.put(root)
-
-        while not queue.empty():
-            node = queue.get()
-
-            if isinstance(node.token, NoteRestToken):
-                orig_token = node.token
+        # Only the notes are replaced in the clone: equal notes share the transposed token
+        transposed_tokens = {}
+        for node in self.iter_nodes():
+            orig_token = self.get_token(node)
+            if not isinstance(orig_token, NoteRestToken):
+                continue
 
+            new_token = transposed_tokens.get(id(orig_token))
+            if new_token is None:
                 new_subtokens = []
                 transposed_pitch_encoding = None
 
@@ -921,20 +1619,30 @@ class Document:
                         new_subtokens.append(Subtoken(subtoken.encoding, subtoken.category))
 
                 # Replace the node’s token with a new NoteRestToken
-                node.token = NoteRestToken(
+                new_token = transposed_tokens[id(orig_token)] = NoteRestToken(
                     encoding=transposed_pitch_encoding,
                     pitch_duration_subtokens=new_subtokens,
-                    decoration_subtokens=orig_token.decoration_subtokens,
+                    decoration_subtokens=list(orig_token.decoration_subtokens),
                 )
-
-            # enqueue children
-            for child in node.children:
-                queue.put(child)
+            new_document.replace_token(node, new_token)
 
         # Return the transposed clone
         return new_document
 
 
+    def __getstate__(self):
+        # The measure index references the nodes: it is built again after unpickling
+        state = self.__dict__.copy()
+        state['_measure_index'] = None
+        state['_structure'] = None
+        if self._replaced_tokens:
+            # The copy gets its own tree, with the tokens of this document
+            tree = MultistageTree.__new__(MultistageTree)
+            tree.__setstate__(self._tree_state())
+            state['tree'] = tree
+            state['_replaced_tokens'] = {}
+        return state
+
     def __iter__(self):
         """
         Get the indexes to export all the document.
@@ -975,7 +1683,7 @@ class TokensTraversal(TreeTraversalInterface):
             filter_by_categories: A list of categories to filter the tokens. If None, all tokens are returned.
         """
         self.tokens = []
-        self.seen_encodings = []
+        self.seen_encodings = set()
         self.non_repeated = non_repeated
         self.filter_by_categories = [t for t in TokenCategory] if filter_by_categories is None else filter_by_categories
 
@@ -986,7 +1694,7 @@ class TokensTraversal(TreeTraversalInterface):
         ):
             self.tokens.append(node.token)
             if self.non_repeated:
-                self.seen_encodings.append(node.token.encoding)
+                self.seen_encodings.add(node.token.encoding)
 
 
 class TraversalFactory:
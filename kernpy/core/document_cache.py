@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import tempfile
+import zlib
+from enum import Enum
+from importlib import metadata
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from kernpy.core import tokens
+from kernpy.core.document import Document, MultistageTree, BoundingBoxMeasures
+from kernpy.core.importer import Importer
+from kernpy.core.tokens import Subtoken, FreezableMixin, HeaderToken, SpineOperationToken, MetacommentToken, \
+    FieldCommentToken
+from kernpy.core.token_pool import TokenPool
+
+
+_TOKEN_CLASSES = {name: value for name, value in vars(tokens).items()
+                  if isinstance(value, type) and value.__module__ == tokens.__name__}
+
+
+__all__ = ['BinaryDocumentFormat', 'DocumentCache']
+
+
+def _kernpy_version() -> str:
+    try:
+        return metadata.version('kernpy')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class BinaryDocumentFormat:
+    """
+    Compact and versioned binary serialization of a `Document`.
+
+    The file starts with the `MAGIC` bytes and the `VERSION` of the format, followed by a zlib-compressed \
+    `marshal` payload with:
+        - the stages of the `MultistageTree`, where every node references its parent, header, \
+        last spine operator and last signature nodes by index,
+        - a table of interned tokens: equal tokens (with their subtokens) are stored once,
+        - the `measure_start_tree_stages`, `page_bounding_boxes` and `header_stage` of the document,
+        - the errors found when the document was imported.
+
+    Only the classes defined in `kernpy.core.tokens` can be restored, so loading a file never runs arbitrary code.
+
+    Examples:
+        >>> document, errors = Importer().import_string('**kern\\n4c\\n*-\\n'), []
+        >>> content = BinaryDocumentFormat.dumps(document, errors)
+        >>> restored_document, restored_errors = BinaryDocumentFormat.loads(content)
+    """
+    MAGIC = b'KERNPYDOC'
+    VERSION = 1
+
+    # Tokens that the Importer never takes from the TokenPool
+    _UNSHARED_TOKENS = (HeaderToken, SpineOperationToken, MetacommentToken, FieldCommentToken)
+
+    @classmethod
+    def dumps(cls, document: Document, errors: Optional[List[str]] = None) -> bytes:
+        """
+        Serialize a document.
+
+        Args:
+            document (Document): The document to serialize.
+            errors (Optional[List[str]]): The errors found when the document was imported.
+
+        Returns (bytes): The serialized document.
+
+        Raises:
+            TypeError: If a token contains a value that cannot be serialized.
+        """
+        state = document._tree_state()
+
+        token_values = []
+        token_value_indexes = {}
+        token_refs = []
+        token_ref_indexes = {}
+        nodes = []
+        for stage, token, *references in state['nodes']:
+            token_ref = None
+            if token is not None:
+                token_ref = token_ref_indexes.get(id(token))
+                if token_ref is None:
+                    value = cls._encode(token)
+                    value_index = token_value_indexes.get(value)
+                    if value_index is None:
+                        value_index = token_value_indexes[value] = len(token_values)
+                        token_values.append(value)
+                    token_ref = token_ref_indexes[id(token)] = len(token_refs)
+                    token_refs.append(value_index)
+            nodes.append((stage, token_ref, *references))
+
+        payload = {
+            'tokens': token_values,
+            'token_refs': token_refs,
+            'nodes': nodes,
+            'signatures': state['signatures'],
+            'stage_sizes': state['stage_sizes'],
+            'measure_start_tree_stages': list(document.measure_start_tree_stages),
+            'page_bounding_boxes': {page: (cls._encode(measures.bounding_box), measures.from_measure, measures.to_measure)
+                                    for page, measures in document.page_bounding_boxes.items()},
+            'header_stage': document.header_stage,
+            'errors': list(errors or []),
+        }
+        return cls.MAGIC + cls.VERSION.to_bytes(2, 'big') + zlib.compress(marshal.dumps(payload), 1)
+
+    @classmethod
+    def loads(cls, content: bytes, intern_tokens: bool = False) -> Tuple[Document, List[str]]:
+        """
+        Restore a document serialized with `dumps`.
+
+        Args:
+            content (bytes): The serialized document.
+            intern_tokens (bool): If True, the tokens of the cells are shared through `TokenPool.shared()`, \
+                as the `Importer` does. Otherwise, the tokens are restored as they were in the serialized document.
+
+        Returns ((Document, List[str])): The document and the errors found when it was imported.
+
+        Raises:
+            ValueError: If the content is not a serialized document or its version is not supported.
+        """
+        if not content.startswith(cls.MAGIC):
+            raise ValueError('The content is not a serialized kernpy document')
+        version = int.from_bytes(content[len(cls.MAGIC):len(cls.MAGIC) + 2], 'big')
+        if version != cls.VERSION:
+            raise ValueError(f'Unsupported serialized document version {version}. Expected {cls.VERSION}')
+
+        try:
+            payload = marshal.loads(zlib.decompress(content[len(cls.MAGIC) + 2:]))
+        except (zlib.error, ValueError, EOFError, TypeError) as e:
+            raise ValueError(f'Corrupted serialized document: {e}') from e
+
+        subtokens_memo = {}
+        token_values = [cls._decode(value, subtokens_memo) for value in payload['tokens']]
+        token_pool = TokenPool.shared() if intern_tokens else None
+        value_indexes = payload['token_refs']
+        token_refs = [None] * len(value_indexes)
+        nodes = []
+        for stage, token_ref, parent, header_node, *references in payload['nodes']:
+            token = None
+            if token_ref is not None:
+                token = token_refs[token_ref]
+                if token is None:
+                    value = token_values[value_indexes[token_ref]]
+                    if token_pool is not None and header_node is not None and not isinstance(value, cls._UNSHARED_TOKENS):
+                        header_token_ref = payload['nodes'][header_node][1]
+                        token = cls._intern(token_pool, token_values[value_indexes[header_token_ref]].encoding,
+                                            value, payload['tokens'][value_indexes[token_ref]])
+                    else:
+                        # Every other token of the original document gets its own object, as when it is imported
+                        token = cls._shallow_copy(value)
+                    token_refs[token_ref] = token
+            nodes.append((stage, token, parent, header_node, *references))
+
+        tree = MultistageTree.__new__(MultistageTree)
+        tree.__setstate__({
+            'nodes': nodes,
+            'signatures': payload['signatures'],
+            'stage_sizes': payload['stage_sizes'],
+        })
+
+        document = Document(tree)
+        document.measure_start_tree_stages = payload['measure_start_tree_stages']
+        document.page_bounding_boxes = {
+            page: BoundingBoxMeasures(cls._decode(bounding_box, subtokens_memo), from_measure, to_measure)
+            for page, (bounding_box, from_measure, to_measure) in payload['page_bounding_boxes'].items()}
+        document.header_stage = payload['header_stage']
+        return document, payload['errors']
+
+    @classmethod
+    def _intern(cls, token_pool: TokenPool, spine_type: str, token, encoded_token):
+        # Only the encoding of the token is stored, not the one of its cell: share the pooled token if it is equal
+        shared_token = token_pool.get(spine_type, token.encoding)
+        if shared_token is None:
+            return token_pool.intern(spine_type, token)
+        if cls._encode(shared_token) == encoded_token:
+            return shared_token
+        return token.freeze()
+
+    @staticmethod
+    def _shallow_copy(token):
+        # Same result as copy.copy, without the dispatch on the reduce protocol
+        result = object.__new__(type(token))
+        result.__dict__.update(token.__getstate__())
+        return result
+
+    @staticmethod
+    def _state(value) -> dict:
+        # The attributes of the object, without the flag of the frozen (shared) tokens
+        return value.__getstate__() if isinstance(value, FreezableMixin) else vars(value)
+
+    @classmethod
+    def _encode(cls, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, Enum):
+            return 'E', type(value).__name__, value.name
+        if isinstance(value, list):
+            return 'L', tuple(cls._encode(item) for item in value)
+        if isinstance(value, tuple):
+            return 'T', tuple(cls._encode(item) for item in value)
+        if _TOKEN_CLASSES.get(type(value).__name__) is type(value):
+            return 'O', type(value).__name__, tuple(sorted((name, cls._encode(attribute))
+                                                           for name, attribute in cls._state(value).items()))
+        raise TypeError(f'Cannot serialize the value {value!r} of type {type(value).__name__}')
+
+    @classmethod
+    def _decode(cls, value, subtokens_memo: dict):
+        if not isinstance(value, tuple):
+            return value
+        tag = value[0]
+        if tag == 'E':
+            return getattr(_TOKEN_CLASSES[value[1]], value[2])
+        if tag == 'L':
+            return [cls._decode(item, subtokens_memo) for item in value[1]]
+        if tag == 'T':
+            return tuple(cls._decode(item, subtokens_memo) for item in value[1])
+        if tag == 'O':
+            clazz = _TOKEN_CLASSES.get(value[1])
+            if clazz is None:
+                raise ValueError(f'Unknown class {value[1]} in the serialized document')
+            if clazz is Subtoken and value in subtokens_memo:
+                return subtokens_memo[value]  # subtokens are never modified, share them
+            result = clazz.__new__(clazz)
+            result.__dict__.update({name: cls._decode(attribute, subtokens_memo) for name, attribute in value[2]})
+            if clazz is Subtoken:
+                subtokens_memo[value] = result
+            return result
+        raise ValueError(f'Unknown tag {tag} in the serialized document')
+
+
+class DocumentCache:
+    """
+    Directory of documents serialized with `BinaryDocumentFormat`, keyed by the hash of the content of the files.
+
+    A cached document is used only if the bytes of the file, the options of the importer, the version of the \
+    binary format and the version of kernpy are the same. Otherwise, the file is imported and the cache is updated.
+
+    Examples:
+        >>> cache = DocumentCache('~/.cache/kernpy')
+        >>> document, errors = cache.load('score.krn')  # imported and stored in the cache
+        >>> document, errors = cache.load('score.krn')  # restored from the cache
+    """
+    EXTENSION = '.kpd'
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Create an instance of DocumentCache.
+
+        Args:
+            cache_dir (Union[str, Path]): The directory of the cache. It is created if it does not exist.
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+
+    def key(self, content: bytes, **importer_options) -> str:
+        """
+        Compute the key of the content of a file.
+
+        Args:
+            content (bytes): The content of the file.
+            **importer_options: The keyword arguments of the `Importer`.
+
+        Returns (str): The hexadecimal key.
+        """
+        digest = hashlib.sha256(content)
+        digest.update(f'|{BinaryDocumentFormat.VERSION}|{_kernpy_version()}|{sorted(importer_options.items())}'.encode())
+        return digest.hexdigest()
+
+    def load(self, path: Union[str, Path], **importer_options) -> Tuple[Document, List[str]]:
+        """
+        Load a document from the cache, or import it and store it in the cache.
+
+        Args:
+            path (Union[str, Path]): The path of the **kern file.
+            **importer_options: The keyword arguments of the `Importer`.
+
+        Returns ((Document, List[str])): The document and the errors found when it was imported.
+        """
+        path = Path(path)
+        cache_path = self.cache_dir / (self.key(path.read_bytes(), **importer_options) + self.EXTENSION)
+
+        if cache_path.exists():
+            try:
+                return BinaryDocumentFormat.loads(cache_path.read_bytes(),
+                                                  intern_tokens=importer_options.get('intern_tokens', False))
+            except (OSError, ValueError):
+                pass  # unreadable or stale entry: import the file again
+
+        importer = Importer(**importer_options)
+        document = importer.import_file(path)
+        errors = importer.errors
+
+        try:
+            self._store(cache_path, BinaryDocumentFormat.dumps(document, errors))
+        except (OSError, TypeError):
+            pass  # the cache is an optimization, a document that cannot be stored is still returned
+
+        return document, errors
+
+    def _store(self, cache_path: Path, content: bytes):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename it, so concurrent readers never see partial entries
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(content)
+            os.replace(temporary_path, cache_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Tuple
+
+from kernpy.core.tokens import HeaderToken, TokenCategory
+
+if TYPE_CHECKING:
+    from kernpy.core.document import Document, MultistageTree
+
+
+__all__ = ['DocumentStructure']
+
+
+class DocumentStructure:
+    """
+    Structural summary of a document: its spines, the number of columns of every stage, whether it has notes, rests \
+    and chords, and its number of measures.
+
+    The summary is computed once, so the queries about the spines of a document (`Exporter.get_spine_types`, \
+    `Document.get_header_nodes`, `Document.match`, `kp.is_monophonic`...) do not traverse or export the document. \
+    Use `Document.structure` to get an up-to-date summary: it is computed again when the tree, the measures \
+    or the tokens of the document change. `has_notes` and `has_chords` are computed the first time they are read: \
+    they import the pending tokens of a lazy document (see `LazyTokenNode`).
+
+    Attributes:
+        header_tokens (Tuple[HeaderToken, ...]): The header tokens of the document, in document order.
+        spine_types (Tuple[str, ...]): The encodings of the headers of the header stage, from left to right.
+        spine_ids (Tuple[int, ...]): The spine ids of `header_tokens`.
+        spine_counts (Tuple[int, ...]): The number of columns (nodes) of every stage. Stage 0 is the root.
+        has_notes (bool): Whether the document has any note or rest.
+        has_chords (bool): Whether the document has any chord.
+        measures_count (int): The number of measures.
+
+    Examples:
+        >>> document, _ = kp.load('score.krn')
+        >>> document.structure.spine_types
+        ('**kern', '**kern', '**root', '**harm')
+        >>> document.structure.spine_counts[:4]
+        (1, 4, 4, 4)
+    """
+
+    def __init__(
+            self,
+            *,
+            header_tokens: Sequence[HeaderToken],
+            header_stage_tokens: Sequence,
+            spine_counts: Sequence[int],
+            has_category: Callable[[TokenCategory], bool],
+            document: Document,
+            tree: Optional[MultistageTree]
+    ):
+        """
+        Create the summary of a document. Use `Document.structure` instead.
+
+        Args:
+            header_tokens (Sequence[HeaderToken]): The header tokens, in document order.
+            header_stage_tokens (Sequence): The tokens of the header stage, from left to right.
+            spine_counts (Sequence[int]): The number of columns of every stage.
+            has_category (Callable[[TokenCategory], bool]): Whether the document has any token of a category \
+                or of its children.
+            document (Document): The document.
+            tree (Optional[MultistageTree]): The tree of the document. The summary must be computed again if \
+                it changes. None if the document cannot change (see `ColumnarDocument`).
+        """
+        self.header_tokens = tuple(header_tokens)
+        self.spine_types = tuple(token.encoding for token in header_stage_tokens if isinstance(token, HeaderToken))
+        self.spine_ids = tuple(token.spine_id for token in self.header_tokens)
+        self.spine_counts = tuple(spine_counts)
+        self.measures_count = len(document.measure_start_tree_stages)
+
+        self._has_category = has_category
+        self._categories = {}  # TokenCategory -> whether the document has any token of the category
+        self._tree = tree
+        self._stage_count = len(self.spine_counts)
+        self._measure_start_tree_stages = document.measure_start_tree_stages
+
+    def _has(self, category: TokenCategory) -> bool:
+        result = self._categories.get(category)
+        if result is None:
+            result = self._categories[category] = self._has_category(category)
+        return result
+
+    @property
+    def has_notes(self) -> bool:
+        """
+        Whether the document has any note or rest.
+        """
+        return self._has(TokenCategory.NOTE_REST)
+
+    @property
+    def has_chords(self) -> bool:
+        """
+        Whether the document has any chord.
+        """
+        return self._has(TokenCategory.CHORD)
+
+    def is_valid_for(self, document: Document) -> bool:
+        """
+        Check whether the summary still describes the document.
+
+        Args:
+            document (Document): The document.
+
+        Returns (bool): True if the tree and the measures of the document are the ones the summary was computed \
+            from.
+        """
+        if self._tree is None:
+            return True  # a read-only document
+        return (self._tree is document.tree
+                and self._stage_count == len(document.tree.stages)
+                and self._measure_start_tree_stages is document.measure_start_tree_stages
+                and self.measures_count == len(document.measure_start_tree_stages))
+
+    def count_spines(self, spine_type: str) -> int:
+        """
+        Count the spines of a type in the document.
+
+        Args:
+            spine_type (str): The encoding of the header of the spines (e.g. '**kern').
+
+        Returns (int): The number of header tokens with that encoding.
+        """
+        return sum(1 for token in self.header_tokens if token.encoding == spine_type)
+
+    def __repr__(self) -> str:
+        return f'DocumentStructure(spine_types={list(self.spine_types)}, measures_count={self.measures_count})'
@@ -17,14 +17,14 @@ class DynSpineImporter(SpineImporter):
             verbose (Optional[bool]): Level of verbosity for error messages.
         """
         super().__init__(verbose=verbose)
+        self.dynam_importer = DynamSpineImporter(verbose=verbose)
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         return KernSpineListener()
 
     def import_token(self, encoding: str) -> Token:
         # TODO: Find out differences between **dyn vs **dynam and change this class. Using the same dor both for now.
-        dynam_importer = DynamSpineImporter()
-        return dynam_importer.import_token(encoding)
+        return self.dynam_importer.import_token(encoding)
 
 
 
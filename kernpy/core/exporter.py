@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from copy import deepcopy
+import io
+import itertools
+from array import array
+from copy import copy
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, TextIO, Tuple
 from collections.abc import Sequence
 from abc import ABC, abstractmethod
 
 from kernpy.core import Document, SpineOperationToken, HeaderToken, Importer, TokenCategory, InstrumentToken, \
     TOKEN_SEPARATOR, DECORATION_SEPARATOR, Token, NoteRestToken, HEADERS, BEKERN_CATEGORIES, ComplexToken, Node
 from kernpy.core.tokenizers import Encoding, TokenizerFactory, Tokenizer
+from kernpy.core.columnar_document import ColumnarDocument
+from kernpy.core.measure_index import MeasureView
 
+if TYPE_CHECKING:
+    from kernpy.core.vocabulary import Vocabulary
 
 
 class ExportOptions:
@@ -17,6 +24,10 @@ class ExportOptions:
     `ExportOptions` class.
 
     Store the options to export a **kern file.
+
+    Attributes:
+        token_categories_mask (int): The bitmask of `token_categories` (see `TokenCategory.mask`). It is compiled \
+            every time `token_categories` is set: assign a new collection instead of modifying it in place.
     """
 
     def __init__(
@@ -68,7 +79,7 @@ class ExportOptions:
             >>> exported_data = exporter.export_string(document, options)
 
         """
-        self.spine_types = spine_types if spine_types is not None else deepcopy(HEADERS)
+        self.spine_types = spine_types if spine_types is not None else set(HEADERS)
         self.from_measure = from_measure
         self.to_measure = to_measure
         self.token_categories = token_categories if token_categories is not None else [c for c in TokenCategory]
@@ -77,6 +88,18 @@ class ExportOptions:
         self.show_measure_numbers = show_measure_numbers
         self.spine_ids = spine_ids  # When exporting, if spine_ids=None all the spines will be exported.
 
+    @property
+    def token_categories(self):
+        """
+        The categories of the tokens to export.
+        """
+        return self._token_categories
+
+    @token_categories.setter
+    def token_categories(self, token_categories) -> None:
+        self._token_categories = token_categories
+        self.token_categories_mask = TokenCategory.mask(token_categories)
+
     def __eq__(self, other: 'ExportOptions') -> bool:
         """
         Compare two ExportOptions objects.
@@ -128,10 +151,37 @@ class ExportOptions:
         """
         return not self.__eq__(other)
 
+    def compile(self, document: Document) -> 'ExportPlan':
+        """
+        Compile the options for a document.
+
+        The plan can be used instead of the options to export the document any number of times: the options are \
+        validated once, and the spines of every stage are selected once for all the exports.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView`: the plan exports \
+                the measures of the view.
+
+        Returns (ExportPlan): The compiled options. Later changes of these options do not modify the plan.
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+
+        Examples:
+            >>> import kernpy as kp
+            >>> document, _ = kp.load('score.krn')
+            >>> plan = kp.ExportOptions(spine_types=['**kern'], kern_type=kp.Encoding.eKern).compile(document)
+            >>> exporter = kp.Exporter()
+            >>> contents = [exporter.export_string(document.measure(measure), plan) for measure in range(1, 5)]
+        """
+        if isinstance(document, MeasureView):
+            return ExportPlan(document.document, document.export_options(self))
+        return ExportPlan(document, self)
+
     @classmethod
     def default(cls):
         return cls(
-            spine_types=deepcopy(HEADERS),
+            spine_types=set(HEADERS),
             token_categories=[c for c in TokenCategory],
             from_measure=None,
             to_measure=None,
@@ -142,6 +192,195 @@ class ExportOptions:
         )
 
 
+class ExportPlan:
+    """
+    `ExportPlan` class.
+
+    The export options compiled for a document (see `ExportOptions.compile`). The plan keeps the validated \
+    options, the bitmask of the token categories, the tokenizer, and the nodes of every stage that belong to the \
+    exported spines. The exports that use the plan do not check the spine types and the spine ids of every node again.
+
+    A plan is immutable and hashable: it can be shared by several threads and used as a dictionary key. \
+    It is valid for its document until the tree or the measures of the document change. The exports with the plan \
+    render every token once: replace the tokens (see `Document.replace_token`) instead of modifying them in place.
+
+    Attributes:
+        document (Document): The document the plan was compiled for.
+        spine_types (frozenset): The exported spine types.
+        token_categories (frozenset): The exported token categories.
+        token_categories_mask (int): The bitmask of `token_categories` (see `TokenCategory.mask`).
+        from_measure (Optional[int]): The first exported measure.
+        to_measure (Optional[int]): The last exported measure.
+        kern_type (Encoding): The encoding of the export.
+        instruments (Optional[tuple]): The exported instruments.
+        show_measure_numbers (bool): Whether the measure numbers are shown.
+        spine_ids (Optional[frozenset]): The ids of the exported spines. None if all the spines are exported.
+        tokenizer (Optional[Tokenizer]): The tokenizer of the export. None for the agnostic encodings, whose \
+            tokenizer depends on the clef of every token.
+    """
+    _OPTIONS = ('spine_types', 'token_categories', 'from_measure', 'to_measure', 'kern_type', 'instruments',
+                'show_measure_numbers', 'spine_ids')
+    __slots__ = _OPTIONS + ('document', 'token_categories_mask', 'tokenizer', '_measure_index', '_key', '_cache')
+
+    def __init__(self, document: Document, options: ExportOptions):
+        """
+        Create a new ExportPlan object. Use `ExportOptions.compile` instead.
+
+        Args:
+            document (Document): The document to export.
+            options (ExportOptions): The export options.
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+        """
+        Exporter.export_options_validator(document, options)
+        set_slot = object.__setattr__
+        set_slot(self, 'document', document)
+        set_slot(self, 'spine_types', frozenset(options.spine_types))
+        set_slot(self, 'token_categories', frozenset(options.token_categories))
+        set_slot(self, 'from_measure', options.from_measure)
+        set_slot(self, 'to_measure', options.to_measure)
+        set_slot(self, 'kern_type', options.kern_type)
+        set_slot(self, 'instruments', tuple(options.instruments) if options.instruments is not None else None)
+        set_slot(self, 'show_measure_numbers', options.show_measure_numbers)
+        set_slot(self, 'spine_ids', frozenset(options.spine_ids) if options.spine_ids is not None else None)
+        set_slot(self, 'token_categories_mask', options.token_categories_mask)
+        # A ColumnarDocument is read-only, and its index would build its tree
+        set_slot(self, '_measure_index', None if isinstance(document, ColumnarDocument) else document.measure_index)
+        set_slot(self, '_cache', {})  # shared by the plans derived from this one, see _stage_cells
+        self._update()
+
+    def _update(self) -> None:
+        set_slot = object.__setattr__
+        set_slot(self, 'tokenizer', None)
+        if self.kern_type not in Exporter._AGNOSTIC_ENCODINGS:
+            set_slot(self, 'tokenizer', Exporter._tokenizer(self, None))
+        set_slot(self, '_key', tuple(getattr(self, name) for name in self._OPTIONS))
+
+    def _replace(self, **options) -> 'ExportPlan':
+        # A plan of the same document with other measures or encoding. The spine selection and the rendered
+        # tokens are shared
+        result = object.__new__(ExportPlan)
+        for name in self.__slots__:
+            object.__setattr__(result, name, options[name] if name in options else getattr(self, name))
+        result._update()
+        return result
+
+    def to_options(self) -> ExportOptions:
+        """
+        Get the export options of the plan.
+
+        Returns (ExportOptions): A new ExportOptions object with the options of the plan.
+        """
+        return ExportOptions(
+            spine_types=list(self.spine_types),
+            token_categories=list(self.token_categories),
+            from_measure=self.from_measure,
+            to_measure=self.to_measure,
+            kern_type=self.kern_type,
+            instruments=list(self.instruments) if self.instruments is not None else None,
+            show_measure_numbers=self.show_measure_numbers,
+            spine_ids=list(self.spine_ids) if self.spine_ids is not None else None
+        )
+
+    def is_valid_for(self, document: Document) -> bool:
+        """
+        Check whether the plan can export the document.
+
+        Args:
+            document (Document): The document.
+
+        Returns (bool): True if the plan was compiled for the document, and its tree and its measures have not \
+            changed since then.
+        """
+        return document is self.document and (self._measure_index is None or self._measure_index.is_valid_for(document))
+
+    def _stage_cells(self, tree, stage: int) -> tuple:
+        # The (node, clef node, empty cell) of the nodes of a stage in the exported spines. Every stage is computed the
+        # first time it is exported. The same cells can be computed by several threads at the same time
+        projection = self._cache.get('tree')
+        if projection is None or projection[0] is not tree:  # the tree of a ColumnarDocument can be built again
+            projection = self._cache['tree'] = (tree, [None] * len(tree.stages))
+        stage_cells = projection[1]
+        cells = stage_cells[stage]
+        if cells is None:
+            spine_types = self.spine_types
+            spine_ids = self.spine_ids
+            cells = []
+            for node in tree.stages[stage]:
+                header_type = node.token if isinstance(node.token, HeaderToken) else \
+                    node.header_node.token if node.header_node else None
+                if header_type is None or header_type.encoding not in spine_types \
+                        or (spine_ids is not None and header_type.spine_id not in spine_ids):
+                    continue
+                cells.append((node, node.last_signature_nodes.nodes.get('ClefToken', None),
+                              Exporter._retrieve_empty_token(node)))
+            cells = stage_cells[stage] = tuple(cells)
+        return cells
+
+    def _columnar_cells(self, document: ColumnarDocument) -> List[tuple]:
+        # The (index, empty cell) of the nodes of every stage in the exported spines, like _stage_cells
+        cells = self._cache.get('columnar')
+        if cells is not None:
+            return cells
+
+        tokens = document.tokens
+        token_ids = document.token_ids
+        header_indexes = document.header_indexes
+        stage_offsets = document.stage_offsets
+        cells = []
+        for stage in range(len(stage_offsets) - 1):
+            row = []
+            for index in range(stage_offsets[stage], stage_offsets[stage + 1]):
+                token_id = token_ids[index]
+                if token_id < 0:
+                    continue  # the root
+                token = tokens[token_id]
+                if isinstance(token, HeaderToken):
+                    header_type = token
+                elif header_indexes[index] >= 0:
+                    header_type = tokens[token_ids[header_indexes[index]]]
+                else:
+                    continue
+                if header_type.encoding not in self.spine_types \
+                        or (self.spine_ids is not None and header_type.spine_id not in self.spine_ids):
+                    continue
+                row.append((index, '*' if token.category.bit & SIGNATURES_MASK else '.'))
+            cells.append(tuple(row))
+        self._cache['columnar'] = cells
+        return cells
+
+    def _rendered_tokens(self) -> dict:
+        # The tokens rendered by the exports with the plan in its encoding, see Exporter._render_cell
+        return self._cache.setdefault(self.kern_type, {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Cannot set the attribute '{name}' of an ExportPlan: it is immutable. "
+                             f"Compile the options again instead (see ExportOptions.compile).")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Cannot delete the attribute '{name}' of an ExportPlan: it is immutable.")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ExportPlan) and self.document is other.document and self._key == other._key
+
+    def __ne__(self, other) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((id(self.document), self._key))
+
+    def __reduce__(self):
+        return ExportPlan, (self.document, self.to_options())
+
+    def __repr__(self) -> str:
+        return f'ExportPlan(kern_type={self.kern_type}, from_measure={self.from_measure}, ' \
+               f'to_measure={self.to_measure}, spine_types={sorted(self.spine_types)})'
+
+
+SIGNATURES_MASK = TokenCategory.valid_mask(include={TokenCategory.SIGNATURES})
+
+
 def empty_row(row):
     for col in row:
         if col != '.' and col != '' and col != '*':
@@ -181,11 +420,312 @@ class HeaderTokenGenerator:
 
 
 class Exporter:
+    """
+    Exporter of documents to strings in the **kern-based encodings.
+
+    Thread safety: an `Exporter` keeps no state between calls, so one instance can be shared by several threads. \
+    A document can be exported by several threads at the same time, as long as no thread modifies it.
+
+    The tokenizers are created once for every encoding, category set and clef, and shared by all the exports \
+    (they are not modified after they are created). Every export renders each token once: the cells with the same \
+    token (see `TokenPool`) reuse the rendered string. The exports with the same `ExportPlan` share the rendered \
+    tokens (see `ExportOptions.compile`).
+    """
+    _AGNOSTIC_ENCODINGS = frozenset({Encoding.agnosticKern, Encoding.agnosticExtendedKern})
+    _tokenizers = {}  # (encoding, token categories mask, clef encoding) -> tokenizer
+
     def export_string(self, document: Document, options: ExportOptions) -> str:
-        self.export_options_validator(document, options)
+        buffer = io.StringIO()
+        self.export_to(document, options, buffer)
+        return buffer.getvalue()
+
+    def export_to(self, document: Document, options: ExportOptions, fp: TextIO) -> None:
+        """
+        Export the document to a text stream, writing every row as soon as it is exported.
+
+        The exported rows are not kept in memory, so the memory used by the export does not grow with the length of \
+        the document. The options are validated before anything is written.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document \
+                (see `ExportOptions.compile`).
+            fp (TextIO): The text stream to write to (e.g. an open file or an `io.StringIO`). It is not closed.
+
+        Returns (None): None
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+
+        Examples:
+            >>> import kernpy as kp
+            >>> document, _ = kp.load('score.krn')
+            >>> with open('score_ekern.krn', 'w') as f:
+            ...     kp.Exporter().export_to(document, kp.ExportOptions(kern_type=kp.Encoding.eKern), f)
+        """
+        fp.writelines(self.export_lines(document, options))
+
+    def export_lines(self, document: Document, options: ExportOptions) -> Iterator[str]:
+        """
+        Export the document line by line. The lines are exported while they are consumed.
+
+        The options are validated when this method is called, before the first line is exported.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document \
+                (see `ExportOptions.compile`).
+
+        Returns (Iterator[str]): The exported lines, every one ended by '\\n'.
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+        """
+        return (lines[0] for lines in self._export_lines_by_encoding(document, options, [options.kern_type])
+                if lines[0] is not None)
+
+    def export_many(self, document: Document, options: ExportOptions,
+                    encodings: Optional[Sequence[Encoding]] = None) -> Dict[Encoding, str]:
+        """
+        Export the document to several encodings at once.
+
+        The document is traversed once: the rows, headers and signatures are computed once, and every token is \
+        rendered once for every encoding. The result is the same as calling `export_string` for every encoding.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document. Its `kern_type` is ignored.
+            encodings (Optional[Sequence[Encoding]]): The encodings to export. When None, all the encodings.
+
+        Returns (Dict[Encoding, str]): The exported content of every encoding.
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+
+        Examples:
+            >>> import kernpy as kp
+            >>> document, _ = kp.load('score.krn')
+            >>> contents = kp.Exporter().export_many(document, kp.ExportOptions(), [kp.Encoding.eKern, kp.Encoding.bKern])
+            >>> contents[kp.Encoding.bKern]
+        """
+        encodings = list(encodings) if encodings is not None else list(Encoding)
+        buffers = {encoding: io.StringIO() for encoding in encodings}
+        self.export_many_to(document, options, buffers)
+        return {encoding: buffer.getvalue() for encoding, buffer in buffers.items()}
+
+    def export_many_to(self, document: Document, options: ExportOptions, fps: Dict[Encoding, TextIO]) -> None:
+        """
+        Export the document to several encodings at once, writing every row to the stream of each encoding as soon \
+        as it is exported. See `export_many` and `export_to`.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document. Its `kern_type` is ignored.
+            fps (Dict[Encoding, TextIO]): The text stream of every encoding to export. They are not closed.
+
+        Returns (None): None
+
+        Raises:
+            ValueError: If the options are not valid for the document.
+        """
+        writes = [fp.write for fp in fps.values()]
+        for lines in self._export_lines_by_encoding(document, options, list(fps.keys())):
+            for write, line in zip(writes, lines):
+                if line is not None:
+                    write(line)
+
+    def export_ids(self, document: Document, options: ExportOptions, vocabulary: 'Vocabulary', *,
+                   unknown: str = 'map') -> array:
+        """
+        Export the document as a sequence of integer ids, for machine learning models.
+
+        The ids are the ids in the vocabulary of the cells exported by `export_string`, row by row: the cells of a row \
+        are separated by `Vocabulary.COLUMN_SEPARATOR` and every row ends with `Vocabulary.ROW_SEPARATOR`. Every token \
+        is rendered once and converted to its id: the exported text is not built.
+
+        Args:
+            document (Document): The document to export. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document \
+                (see `ExportOptions.compile`).
+            vocabulary (Vocabulary): The vocabulary of the ids.
+            unknown (str): What to do with the cells that are not in the vocabulary. 'map' to use the id of \
+                `Vocabulary.UNKNOWN`, 'add' to add them to the vocabulary, 'raise' to raise a ValueError.
+
+        Returns (array): The ids, an `array('i')`. Use `numpy.frombuffer(ids, dtype=numpy.intc)` to get a NumPy array \
+            without copying them.
+
+        Raises:
+            ValueError: If the options are not valid for the document, if `unknown` is not valid, or if \
+                `unknown` is 'raise' and a cell is not in the vocabulary.
+
+        Examples:
+            >>> import kernpy as kp
+            >>> document, _ = kp.load('score.krn')
+            >>> options = kp.ExportOptions(kern_type=kp.Encoding.eKern)
+            >>> vocabulary = kp.Vocabulary().fit(document, options)
+            >>> ids = kp.Exporter().export_ids(document, options, vocabulary)
+            >>> vocabulary.decode(ids) == kp.Exporter().export_string(document, options)
+            True
+        """
+        get_id = vocabulary.id_getter(unknown)
+        plan, rows = self._export_rows(document, options)
+        encoding_rows = _EncodingRows(self, plan)
+        column_separator_id = vocabulary.column_separator_id
+        row_separator_id = vocabulary.row_separator_id
+
+        ids = array('i')
+        row_ids = []
+        for skip_nullish_row, cells in rows:
+            row = encoding_rows.row(cells, skip_nullish_row)
+            if row is None:
+                continue
+            row_ids.clear()
+            for cell in row:
+                row_ids.append(get_id(cell))
+                row_ids.append(column_separator_id)
+            row_ids[-1] = row_separator_id
+            ids.extend(row_ids)
+
+        row = encoding_rows.terminate_row()
+        if row is not None:
+            for cell in row:
+                ids.append(get_id(cell))
+                ids.append(column_separator_id)
+            ids[-1] = row_separator_id
+        return ids
+
+    def export_fragments(self, document: Document, options: ExportOptions, window: int,
+                         stride: int = 1) -> Iterator[Tuple[int, int, str]]:
+        """
+        Export all the fragments of `window` measures of the document, starting every `stride` measures.
 
-        rows = []
+        Every fragment is self-contained: it starts with the headers, the spine layout and the signatures active at \
+        its first measure, it includes the barlines that open and close its measures, and it ends with the spine \
+        terminators. The document is exported in one pass: the context of every fragment comes from the measure \
+        index (see `Document.measure_index`), and every token is rendered once for all the fragments.
 
+        Args:
+            document (Document): The document to export.
+            options (ExportOptions): The export options, or an `ExportPlan` of the document. Its `from_measure` and \
+                `to_measure` are ignored.
+            window (int): Number of measures of every fragment.
+            stride (int): Number of measures between the first measures of two consecutive fragments.
+
+        Returns (Iterator[Tuple[int, int, str]]): The tuples (from_measure, to_measure, content) of every fragment, \
+            in order. The measures are numbered from 1. When the document has fewer than `window` measures, \
+            there are no fragments.
+
+        Raises:
+            ValueError: If the window or the stride are not positive integers, or the options are not valid for \
+                the document.
+
+        Examples:
+            >>> import kernpy as kp
+            >>> document, _ = kp.load('score.krn')
+            >>> for from_measure, to_measure, content in kp.Exporter().export_fragments(document, kp.ExportOptions(), 4):
+            ...     print(from_measure, to_measure)
+            1 4
+            2 5
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ValueError(f'window must be a positive integer. Found {window}')
+        if not isinstance(stride, int) or stride < 1:
+            raise ValueError(f'stride must be a positive integer. Found {stride}')
+
+        if isinstance(options, ExportPlan):
+            document, plan = self._compile(document, options)
+            plan = plan._replace(from_measure=None, to_measure=None)
+        else:
+            options = copy(options)
+            options.from_measure = None
+            options.to_measure = None
+            plan = ExportPlan(document, options)
+
+        return self._iter_fragments(document, plan, window, stride)
+
+    def _iter_fragments(self, document: Document, plan: ExportPlan, window: int, stride: int):
+        measure_index = document.measure_index
+        stages = document.tree.stages
+        stage_rows = {}  # stage -> row of the stage, shared by the overlapping fragments
+
+        def iter_stage_rows(first_stage: int, last_stage: int):
+            for stage in range(first_stage, last_stage + 1):
+                row = stage_rows.get(stage)
+                if row is None:
+                    row = stage_rows[stage] = next(self._iter_stage_rows(document, plan, stage, stage))
+                yield row
+
+        for from_measure in range(1, len(measure_index) - window + 2, stride):
+            to_measure = from_measure + window - 1
+            fragment_plan = plan._replace(from_measure=from_measure, to_measure=to_measure)
+
+            from_stage = measure_index.from_stage(from_measure)
+            to_stage = measure_index.stage_range(to_measure)[1]  # the barline that closes the fragment
+            first_stage = from_stage
+            if from_stage > 0 and any(node.token.category == TokenCategory.BARLINES for node in stages[from_stage - 1]):
+                first_stage = from_stage - 1  # the barline that opens the fragment
+
+            for stage in [stage for stage in stage_rows if stage < first_stage]:
+                del stage_rows[stage]  # the next fragments begin after this stage
+
+            rows = itertools.chain(self._iter_context_rows(document, fragment_plan, from_measure, from_stage, to_stage),
+                                   iter_stage_rows(first_stage, to_stage))
+            encoding_rows = [_EncodingRows(self, fragment_plan)]  # the rendered tokens are shared by the plans
+            content = ''.join(lines[0] for lines in self._iter_lines_by_encoding(rows, encoding_rows)
+                              if lines[0] is not None)
+            yield from_measure, to_measure, content
+
+    @staticmethod
+    def _compile(document: Document, options) -> Tuple[Document, ExportPlan]:
+        # The plan of the export, validated. The document of a MeasureView is exported with the measures of the view
+        if isinstance(document, MeasureView):
+            view = document
+            document = view.document
+            if isinstance(options, ExportPlan):
+                if not options.is_valid_for(document):
+                    raise ValueError('The export plan was not compiled for this document, or the document has '
+                                     'changed. Compile the options again (see ExportOptions.compile). ')
+                return document, options._replace(from_measure=view.from_measure, to_measure=view.to_measure)
+            options = view.export_options(options)
+
+        if isinstance(options, ExportPlan):
+            if not options.is_valid_for(document):
+                raise ValueError('The export plan was not compiled for this document, or the document has '
+                                 'changed. Compile the options again (see ExportOptions.compile). ')
+            return document, options
+        return document, ExportPlan(document, options)
+
+    def _export_rows(self, document: Document, options) -> Tuple[ExportPlan, Iterator]:
+        # Validate the options now, and return the generator of the rows
+        document, plan = self._compile(document, options)
+
+        if isinstance(document, ColumnarDocument) and not plan.from_measure and plan.to_measure is None:
+            return plan, self._iter_columnar_rows(document, plan)
+        return plan, self._iter_rows(document, plan)
+
+    def _export_lines_by_encoding(self, document: Document, options,
+                                  encodings: List[Encoding]) -> Iterator[List[Optional[str]]]:
+        # Validate the options now, and return the generator of the lines
+        plan, rows = self._export_rows(document, options)
+
+        encoding_rows = [_EncodingRows(self, plan if encoding == plan.kern_type else plan._replace(kern_type=encoding))
+                         for encoding in encodings]
+        return self._iter_lines_by_encoding(rows, encoding_rows)
+
+    @staticmethod
+    def _iter_lines_by_encoding(rows, encoding_rows: List['_EncodingRows']) -> Iterator[List[Optional[str]]]:
+        for skip_nullish_row, cells in rows:
+            yield [rendered_rows.line(cells, skip_nullish_row) for rendered_rows in encoding_rows]
+        yield [rendered_rows.terminate_line() for rendered_rows in encoding_rows]
+
+    def _iter_rows(self, document: Document, options: ExportPlan):
+        """
+        Generate the rows of the tree of the document, before rendering the tokens.
+
+        Every row is generated with a flag that tells whether the row must be skipped when all its cells are \
+        place holders. The cells are either the exported strings or `(token, last_clef, empty)` tuples to be \
+        rendered for every encoding (see `_EncodingRows`).
+        """
         if options.to_measure is not None and options.to_measure < len(document.measure_start_tree_stages):
 
             if options.to_measure < len(document.measure_start_tree_stages) - 1:
@@ -198,97 +738,112 @@ class Exporter:
 
         if options.from_measure:
             # In case of beginning not from the first measure, we recover the spine creation and the headers
-            # Traversed in reverse order to only include the active spines at the given measure...
-            from_stage = document.measure_start_tree_stages[options.from_measure - 1]
-            next_nodes = document.tree.stages[from_stage]
-            while next_nodes and len(next_nodes) > 0 and next_nodes[0] != document.tree.root:
-                row = []
-                new_next_nodes = []
-                non_place_holder_in_row = False
-                spine_operation_row = False
-                for node in next_nodes:
-                    if isinstance(node.token, SpineOperationToken):
-                        spine_operation_row = True
-                        break
-
-                for node in next_nodes:
-                    content = ''
-                    if isinstance(node.token, HeaderToken) and node.token.encoding in options.spine_types:
-                        content = self.export_token(node, options)
-                        non_place_holder_in_row = True
-                    elif spine_operation_row:
-                        # either if it is the split operator that has been cancelled, or the join one
-                        if isinstance(node.token, SpineOperationToken) and (node.token.is_cancelled_at(
-                                from_stage) or node.last_spine_operator_node and node.last_spine_operator_node.token.cancelled_at_stage == node.stage):
-                            content = '*'
-                        else:
-                            content = self.export_token(node, options)
-                            non_place_holder_in_row = True
-                    if content:
-                        row.append(content)
-                    new_next_nodes.append(node.parent)
-                next_nodes = new_next_nodes
-                if non_place_holder_in_row:  # if the row contains just place holders due to an ommitted place holder, don't add it
-                    rows.insert(0, row)
-
-            # now, export the signatures
-            node_signatures = None
-            for node in document.tree.stages[from_stage]:
-                if not node.header_node or node.header_node.token.encoding not in options.spine_types:
-                    continue
-                node_signature_rows = []
-                for signature_node in node.last_signature_nodes.nodes.values():
-                    if not self.is_signature_cancelled(signature_node, node, from_stage, to_stage):
-                        node_signature_rows.append(self.export_token(signature_node, options))
-                if len(node_signature_rows) > 0:
-                    if not node_signatures:
-                        node_signatures = []  # an array for each spine
-                    node_signatures.append(node_signature_rows)
-
-            if node_signatures:
-                max_signature_rows = max(len(signature_rows) for signature_rows in node_signatures)
-                for irow in range(max_signature_rows):
-                    row = []
-                    for icol in range(len(node_signatures)):  # len(node_signatures) = number of selected spines
-                        if irow < len(node_signatures[icol]):
-                            row.append(node_signatures[icol][irow])
-                        else:
-                            row.append('*')
-                    rows.append(row)
-
+            from_stage = document.measure_index.from_stage(options.from_measure)
+            yield from self._iter_context_rows(document, options, options.from_measure, from_stage, to_stage)
         else:
             from_stage = 0
-            rows = []
 
-        #if not node.token.category == TokenCategory.LINE_COMMENTS and not node.token.category == TokenCategory.FIELD_COMMENTS:
+        yield from self._iter_stage_rows(document, options, from_stage, to_stage)
+
+    def _iter_context_rows(self, document: Document, options: ExportPlan, from_measure: int, from_stage: int,
+                           to_stage: int):
+        """
+        Generate the header, spine operation and signature rows that precede the first stage of an export that does \
+        not begin from the first measure, like `_iter_rows`.
+        """
+        # The measure index keeps the header and spine operation rows of the active spines at the given measure...
+        measure_index = document.measure_index
+        for next_nodes in measure_index.context_rows(from_measure):
+            row = []
+            non_place_holder_in_row = False
+            spine_operation_row = False
+            for node in next_nodes:
+                if isinstance(node.token, SpineOperationToken):
+                    spine_operation_row = True
+                    break
+
+            for node in next_nodes:
+                if isinstance(node.token, HeaderToken) and node.token.encoding in options.spine_types:
+                    row.append(self._token_cell(node, document, None))
+                    non_place_holder_in_row = True
+                elif spine_operation_row:
+                    # either if it is the split operator that has been cancelled, or the join one
+                    if isinstance(node.token, SpineOperationToken) and (node.token.is_cancelled_at(
+                            from_stage) or node.last_spine_operator_node and node.last_spine_operator_node.token.cancelled_at_stage == node.stage):
+                        row.append('*')
+                    else:
+                        row.append(self._token_cell(node, document, None))
+                        non_place_holder_in_row = True
+            if non_place_holder_in_row:  # if the row contains just place holders due to an ommitted place holder, don't add it
+                yield False, row
+
+        # now, export the signatures
+        node_signatures = None
+        for node in measure_index.columns(from_measure):
+            if not node.header_node or node.header_node.token.encoding not in options.spine_types:
+                continue
+            node_signature_rows = []
+            for signature_node in node.last_signature_nodes.nodes.values():
+                override_stage = measure_index.signature_override_stage(node, signature_node.token.__class__)
+                if override_stage is None or override_stage > to_stage:  # see is_signature_cancelled
+                    node_signature_rows.append(self._token_cell(signature_node, document, ''))
+            if len(node_signature_rows) > 0:
+                if not node_signatures:
+                    node_signatures = []  # an array for each spine
+                node_signatures.append(node_signature_rows)
+
+        if node_signatures:
+            max_signature_rows = max(len(signature_rows) for signature_rows in node_signatures)
+            for irow in range(max_signature_rows):
+                row = []
+                for icol in range(len(node_signatures)):  # len(node_signatures) = number of selected spines
+                    if irow < len(node_signatures[icol]):
+                        row.append(node_signatures[icol][irow])
+                    else:
+                        row.append('*')
+                yield False, row
+
+    def _iter_stage_rows(self, document: Document, plan: ExportPlan, from_stage: int, to_stage: int):
+        """
+        Generate the rows of the stages of the tree from `from_stage` to `to_stage`, both included, like `_iter_rows`. \
+        Same cells as `append_row`, for the nodes of the exported spines selected by the plan.
+        """
+        tree = document.tree
+        get_token = document.get_token
+        token_categories_mask = plan.token_categories_mask
         for stage in range(from_stage, to_stage + 1):  # to_stage included
             row = []
-            for i_column, node in enumerate(document.tree.stages[stage]):
-                self.append_row(document=document, node=node, options=options, row=row)
-
-            nullish_tokens = {'.', '*', ''}
-            if len(row) > 0 and not all(token in nullish_tokens for token in row):
-                rows.append(row)
-
-        # now, add the spine terminate row
-        if options.to_measure is not None and len(rows) > 0 and rows[len(rows) - 1][
-            0] != '*-':  # if the terminate is not added yet
-            last_row = rows[len(rows) - 1]
-            spine_count = len(last_row)
-            merge_tokens_count = sum(1 for column in last_row if column == '*^')
-            join_tokens_count = sum(1 for column in last_row if column == '*v')
-            next_row_spine_count = spine_count + merge_tokens_count - join_tokens_count
+            for node, clef_node, empty in plan._stage_cells(tree, stage):
+                token = get_token(node)
+                if token.hidden or not (isinstance(token, ComplexToken) or token.category.bit & token_categories_mask):
+                    row.append(empty)  # the spine is kept, but this specific token is not exported
+                else:
+                    row.append((token, get_token(clef_node) if clef_node is not None else None, empty))
+            yield True, row
+
+    def _iter_columnar_rows(self, document: ColumnarDocument, plan: ExportPlan):
+        """
+        Generate the rows of the whole document scanning the arrays of a `ColumnarDocument`, like `_iter_rows`. \
+        Same rows as the tree traversal.
+        """
+        tokens = document.tokens
+        token_ids = document.token_ids
+        clef_token_ids = document.clef_token_ids()
+        token_categories_mask = plan.token_categories_mask
 
+        for stage_cells in plan._columnar_cells(document):
             row = []
-            for i in range(next_row_spine_count):
-                row.append('*-')
-            rows.append(row)
-
-        result = ""
-        for row in rows:
-            if not empty_row(row):
-                result += '\t'.join(row) + '\n'
-        return result
+            for index, empty in stage_cells:
+                token = tokens[token_ids[index]]
+                if token.hidden or not (isinstance(token, ComplexToken) or token.category.bit & token_categories_mask):
+                    row.append(empty)
+                    continue
+
+                last_clef = tokens[clef_token_ids[index]] if clef_token_ids[index] >= 0 else None
+                row.append((token, last_clef, empty))
+
+            yield False, row
+
 
     def compute_header_type(self, node) -> Optional[HeaderToken]:
         """
@@ -308,34 +863,82 @@ class Exporter:
             header_type = None
         return header_type
 
-    def export_token(self, node: Node, options: ExportOptions) -> str:
-        token = node.token
-        if isinstance(token, HeaderToken):
-            new_token = HeaderTokenGenerator.new(token=token, type=options.kern_type)
-        else:
-            new_token = token
+    def export_token(self, node: Node, options: ExportOptions, document: Optional[Document] = None) -> str:
+        """
+        Export the token of a node.
+
+        Args:
+            node (Node): The node.
+            options (ExportOptions): The export options.
+            document (Optional[Document]): The document of the node. Its tokens replace the tokens of the nodes \
+                (see `Document.replace_token`). If None, the token of the node is exported.
 
+        Returns (str): The exported token.
+        """
         last_clef_node = node.last_signature_nodes.nodes.get('ClefToken', None)
         if last_clef_node is not None:
-            last_clef = last_clef_node.token
+            last_clef = last_clef_node.token if document is None else document.get_token(last_clef_node)
         else:
             last_clef = None  # Any clef appears at this point of the score (e.g., metadata rows)
 
-        return (TokenizerFactory
-                .create(options.kern_type.value, token_categories=options.token_categories, last_clef_reference=last_clef)
-                .tokenize(new_token))
+        token = node.token if document is None else document.get_token(node)
+        return self._export_token_with_clef(token, last_clef, options)
+
+    @classmethod
+    def _export_token_with_clef(cls, token, last_clef, options: ExportOptions) -> str:
+        if isinstance(token, HeaderToken):
+            new_token = HeaderTokenGenerator.new(token=token, type=options.kern_type)
+        else:
+            new_token = token
+
+        return cls._tokenizer(options, last_clef).tokenize(new_token)
 
-    def append_row(self, document: Document, node, options: ExportOptions, row: list) -> bool:
+    @classmethod
+    def _tokenizer(cls, options: ExportOptions, last_clef) -> Tokenizer:
+        if options.__class__ is ExportPlan and options.tokenizer is not None:
+            return options.tokenizer
+        # Only the agnostic encodings depend on the clef
+        clef_encoding = getattr(last_clef, 'encoding', None) if options.kern_type in cls._AGNOSTIC_ENCODINGS else None
+        key = (options.kern_type, options.token_categories_mask, clef_encoding)
+        tokenizer = cls._tokenizers.get(key)
+        if tokenizer is None:
+            tokenizer = cls._tokenizers[key] = TokenizerFactory.create(
+                options.kern_type.value, token_categories=options.token_categories, last_clef_reference=last_clef)
+        return tokenizer
+
+    def _token_cell(self, node: Node, document: Document, empty: Optional[str]) -> tuple:
         """
-        Append a row to the row list if the node accomplishes the requirements.
+        The cell of a row that exports the token of a node, rendered for every encoding by `_render_cell`.
+
         Args:
-            document (Document): The document with the spines.
-            node (Node): The node to append.
-            options (ExportOptions): The export options to filter the token.
-            row (list): The row to append.
+            node (Node): The node.
+            document (Document): The document of the node (see `Document.get_token`).
+            empty (Optional[str]): The content of the cell when the token is rendered as an empty string. If None, \
+                the cell is removed from the row.
 
-        Returns (bool): True if the row was appended. False if the row was not appended.
+        Returns (tuple): The `(token, last_clef, empty)` cell.
         """
+        last_clef_node = node.last_signature_nodes.nodes.get('ClefToken', None)
+        last_clef = document.get_token(last_clef_node) if last_clef_node is not None else None
+        return document.get_token(node), last_clef, empty
+
+    def _render_cell(self, cell: tuple, options: ExportOptions, rendered_tokens: dict) -> str:
+        """
+        Export the token of a cell like `export_token`, rendering every token once per export plan.
+
+        The rendered strings are kept by token identity (and clef identity for the agnostic encodings). The memo \
+        keeps a reference to the tokens, so their ids are not reused while the memo exists even if a node \
+        imports its token again (see `LazyTokenNode`).
+        """
+        token, last_clef, _ = cell
+        key = (id(token), id(last_clef) if options.kern_type in self._AGNOSTIC_ENCODINGS else None)
+        rendered = rendered_tokens.get(key)
+        if rendered is None:
+            rendered = rendered_tokens[key] = (self._export_token_with_clef(token, last_clef, options), token, last_clef)
+        return rendered[0]
+
+    def _append_cell(self, document: Document, node: Node, options: ExportOptions, row: list) -> bool:
+        # See append_row. The token is appended as a cell to be rendered (see _token_cell)
         header_type = self.compute_header_type(node)
 
         if not (header_type is not None
@@ -344,26 +947,45 @@ class Exporter:
         ):
             return False  # All the spine must be filtered out
 
-        if not (not node.token.hidden
-                and (isinstance(node.token, ComplexToken) or node.token.category in options.token_categories)
+        token = document.get_token(node)
+        if not (not token.hidden
+                and (isinstance(token, ComplexToken) or token.category.bit & options.token_categories_mask)
                 # If None, all the spines will be exported. TODO: put all the spines as spine_ids = None
         ):
             row.append(self._retrieve_empty_token(node))
             return True  # The spine must be kept, but this specific token does not achieve the requirements
 
-        # Normal case
-        exported_token = self.export_token(node, options)
-        exported_token = exported_token if len(exported_token) > 0 else self._retrieve_empty_token(node) # just in the unexpected case, the tokenizer returns an empty string...
-        row.append(exported_token)
+        # Normal case. In the unexpected case the tokenizer returns an empty string, the cell will be a place holder
+        row.append(self._token_cell(node, document, self._retrieve_empty_token(node)))
+        return True
+
+    def append_row(self, document: Document, node, options: ExportOptions, row: list,
+                   rendered_tokens: Optional[dict] = None) -> bool:
+        """
+        Append a row to the row list if the node accomplishes the requirements.
+        Args:
+            document (Document): The document with the spines.
+            node (Node): The node to append.
+            options (ExportOptions): The export options to filter the token.
+            row (list): The row to append.
+            rendered_tokens (Optional[dict]): The tokens already rendered in this export, filled by the call. \
+                If None, the token is rendered again.
+
+        Returns (bool): True if the row was appended. False if the row was not appended.
+        """
+        if not self._append_cell(document, node, options, row):
+            return False
+
+        if isinstance(row[-1], tuple):
+            cell = row[-1]
+            exported_token = self._render_cell(cell, options, rendered_tokens if rendered_tokens is not None else {})
+            row[-1] = exported_token if len(exported_token) > 0 else cell[2]
         return True
 
 
     @classmethod
     def _is_token_in_a_signature_row(cls, node: Node) -> bool:
-        return bool(TokenCategory.is_child(
-            child=node.token.category,
-            parent=TokenCategory.SIGNATURES,
-        ))
+        return bool(node.token.category.bit & SIGNATURES_MASK)
 
     @classmethod
     def _retrieve_empty_token(cls, node: Optional[Node]) -> str:
@@ -399,15 +1021,9 @@ class Exporter:
         if spine_types is not None and len(spine_types) == 0:
             return []
 
-        options = ExportOptions(spine_types=spine_types, token_categories=[TokenCategory.HEADER])
-        content = self.export_string(document, options)
-
-        # Remove all after the first line: **kern, **mens, etc... are always in the first row
-        lines = content.split('\n')
-        first_line = lines[0:1]
-        tokens = first_line[0].split('\t')
-
-        return tokens if tokens not in [[], ['']] else []
+        # The headers of the first exported row, like the export of the HEADER category with these spine types
+        spine_types = spine_types if spine_types is not None else HEADERS
+        return [encoding for encoding in document.structure.spine_types if encoding in spine_types]
 
 
     @classmethod
@@ -438,6 +1054,20 @@ class Exporter:
                 f'option to_measure must be >= from_measure but {options.to_measure} < {options.from_measure} was found. ')
 
     def is_signature_cancelled(self, signature_node, node, from_stage, to_stage) -> bool:
+        """
+        Check whether a signature of the class of `signature_node` follows `node` before a note or a rest, \
+        walking the subtree of the node up to `to_stage`.
+
+        The exporter answers the same question by lookup with `MeasureIndex.signature_override_stage`.
+
+        Args:
+            signature_node (Node): The node of the active signature.
+            node (Node): The node where the export begins, at stage `from_stage`.
+            from_stage (int): The stage of the node.
+            to_stage (int): The last stage of the export.
+
+        Returns (bool): True if the signature is replaced in the export.
+        """
         if node.token.__class__ == signature_node.token.__class__:
             return True
         elif isinstance(node.token, NoteRestToken):
@@ -449,6 +1079,90 @@ class Exporter:
             return False
 
 
+class _EncodingRows:
+    """
+    The rows of one encoding in an export (see `Exporter.export_many`).
+
+    Renders the cells of the rows generated by the traversal of the document, and keeps the state of the export of \
+    this encoding: the rendered tokens and the last exported row.
+    """
+    NULLISH_TOKENS = frozenset({'.', '*', ''})
+
+    def __init__(self, exporter: Exporter, options: ExportPlan):
+        self.exporter = exporter
+        self.options = options
+        self.agnostic = options.kern_type in Exporter._AGNOSTIC_ENCODINGS
+        self.rendered_tokens = options._rendered_tokens()  # see Exporter._render_cell
+        self.last_row = None
+
+    def line(self, cells: list, skip_nullish_row: bool) -> Optional[str]:
+        """
+        Render the cells of a row.
+
+        Args:
+            cells (list): The cells of the row. Every cell is a string or a `(token, last_clef, empty)` tuple.
+            skip_nullish_row (bool): If True, the row is skipped when all its cells are place holders.
+
+        Returns (Optional[str]): The exported line. None if the row is not exported.
+        """
+        row = self.row(cells, skip_nullish_row)
+        return '\t'.join(row) + '\n' if row is not None else None
+
+    def row(self, cells: list, skip_nullish_row: bool) -> Optional[List[str]]:
+        """
+        Render the cells of a row, like `line`, without joining them.
+
+        Returns (Optional[List[str]]): The exported cells. None if the row is not exported.
+        """
+        rendered_tokens = self.rendered_tokens
+        agnostic = self.agnostic
+        row = []
+        for cell in cells:
+            if cell.__class__ is str:
+                row.append(cell)
+                continue
+            # Same key as Exporter._render_cell, which renders the tokens not rendered yet
+            rendered = rendered_tokens.get((id(cell[0]), id(cell[1]) if agnostic else None))
+            if rendered is not None:
+                exported_token = rendered[0]
+            else:
+                exported_token = self.exporter._render_cell(cell, self.options, rendered_tokens)
+            if len(exported_token) > 0:
+                row.append(exported_token)
+            elif cell[2] is not None:
+                row.append(cell[2])
+
+        if skip_nullish_row and (len(row) == 0 or all(token in self.NULLISH_TOKENS for token in row)):
+            return None
+        self.last_row = row
+        return None if empty_row(row) else row
+
+    def terminate_line(self) -> Optional[str]:
+        """
+        The spine terminate row of the exports that end before the end of the document.
+
+        Returns (Optional[str]): The exported line. None if the terminate row is not needed.
+        """
+        row = self.terminate_row()
+        return '\t'.join(row) + '\n' if row is not None else None
+
+    def terminate_row(self) -> Optional[List[str]]:
+        """
+        The cells of the spine terminate row, like `terminate_line`, without joining them.
+
+        Returns (Optional[List[str]]): The exported cells. None if the terminate row is not needed.
+        """
+        last_row = self.last_row
+        if self.options.to_measure is None or last_row is None or last_row[0] == '*-':  # if the terminate is added yet
+            return None
+
+        spine_count = len(last_row)
+        merge_tokens_count = sum(1 for column in last_row if column == '*^')
+        join_tokens_count = sum(1 for column in last_row if column == '*v')
+        next_row_spine_count = spine_count + merge_tokens_count - join_tokens_count
+        return ['*-'] * next_row_spine_count if next_row_spine_count > 0 else None
+
+
 def get_kern_from_ekern(ekern_content: str) -> str:
     """
     Read the content of a **ekern file and return the **kern content.
@@ -8,6 +8,15 @@ from .tokens import Token, SimpleToken, TokenCategory
 
 
 class FingSpineImporter(SpineImporter):
+    ACCEPTED_CATEGORIES_MASK = TokenCategory.valid_mask(include={
+        TokenCategory.STRUCTURAL,
+        TokenCategory.SIGNATURES,
+        TokenCategory.EMPTY,
+        TokenCategory.IMAGE_ANNOTATIONS,
+        TokenCategory.BARLINES,
+        TokenCategory.COMMENTS,
+    })
+
     def __init__(self, verbose: Optional[bool] = False):
         """
         KernSpineImporter constructor.
@@ -16,6 +25,7 @@ class FingSpineImporter(SpineImporter):
             verbose (Optional[bool]): Level of verbosity for error messages.
         """
         super().__init__(verbose=verbose)
+        self.kern_spine_importer = KernSpineImporter(verbose=verbose)
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         return KernSpineListener()
@@ -24,22 +34,15 @@ class FingSpineImporter(SpineImporter):
     def import_token(self, encoding: str) -> Token:
         self._raise_error_if_wrong_input(encoding)
 
+        if not self._may_be_structural(encoding):
+            return SimpleToken(encoding, TokenCategory.FINGERING)
+
         try:
-            kern_spine_importer = KernSpineImporter()
-            token = kern_spine_importer.import_token(encoding)
+            token = self.kern_spine_importer.import_token(encoding)
         except Exception as e:
             return SimpleToken(encoding, TokenCategory.FINGERING)
 
-        ACCEPTED_CATEGORIES = {
-            TokenCategory.STRUCTURAL,
-            TokenCategory.SIGNATURES,
-            TokenCategory.EMPTY,
-            TokenCategory.IMAGE_ANNOTATIONS,
-            TokenCategory.BARLINES,
-            TokenCategory.COMMENTS,
-        }
-
-        if not any(TokenCategory.is_child(child=token.category, parent=cat) for cat in ACCEPTED_CATEGORIES):
+        if not token.category.bit & self.ACCEPTED_CATEGORIES_MASK:
             return SimpleToken(encoding, TokenCategory.FINGERING)
 
         return token
@@ -7,10 +7,13 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import List, Optional, Any, Union, Tuple
-from collections.abc import Sequence
+from collections.abc import Sequence, Iterable, Iterator
 
 from kernpy.core import Importer, Document, Exporter, ExportOptions, GraphvizExporter, TokenCategoryHierarchyMapper
-from kernpy.core._io import _write
+from kernpy.core._io import _write, _open_for_writing
+from kernpy.core._parallel import load_many, generate_fragments
+from kernpy.core._measure_stream import iter_measures
+from kernpy.core.document_cache import DocumentCache
 from kernpy.util.helpers import deprecated
 
 
@@ -30,16 +33,28 @@ class Generic:
             strict: Optional[bool] = False,
             error_on_duration_mismatch: bool = False,
             meter_signature_fallback_if_not_found: Optional[str] = None,
+            cache_dir: Optional[Union[str, Path]] = None,
     ) -> (Document, List[str]):
         """
 
         Args:
             path:
             strict:
+            cache_dir:
 
         Returns:
 
         """
+        if cache_dir is not None:
+            document, errors = DocumentCache(cache_dir).load(
+                path,
+                error_on_duration_mismatch=error_on_duration_mismatch,
+                meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+            )
+            if strict and len(errors) > 0:
+                raise Exception(''.join(f'{error}\n' for error in errors))
+            return document, errors
+
         importer = Importer(
             error_on_duration_mismatch=error_on_duration_mismatch,
             meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
@@ -52,6 +67,159 @@ class Generic:
 
         return document, errors
 
+    @classmethod
+    def read_many(
+            cls,
+            paths: Iterable[Union[str, Path]],
+            workers: Optional[int] = None,
+            chunksize: int = 1,
+            ordered: bool = True,
+            error_on_duration_mismatch: bool = False,
+            meter_signature_fallback_if_not_found: Optional[str] = None,
+    ) -> Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]:
+        """
+        Load several **kern files in parallel using a pool of warmed-up processes. See `load_many`.
+
+        Args:
+            paths (Iterable[Union[str, Path]]): The paths of the files.
+            workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+                When 1, the files are loaded in the current process.
+            chunksize (int): Number of files sent to a worker at once.
+            ordered (bool): If True, the results are yielded in the same order as the paths. \
+                Otherwise, they are yielded as soon as they are ready.
+            error_on_duration_mismatch (bool): If True, validate the duration of every measure against its meter \
+                signature. The first mismatch fails the file: its document is None and its errors contain the \
+                ValueError message.
+            meter_signature_fallback_if_not_found (Optional[str]): Meter signature used in the validation when \
+                no time signature is available for a measure, e.g. '*M4/4'.
+
+        Returns (Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]): The tuples (path, document, \
+            errors). A file that cannot be loaded does not stop the others: its document is None and its errors \
+            contain the exception message.
+
+        Raises:
+            ValueError: If the workers or the chunksize are not positive integers.
+        """
+        return load_many(
+            paths,
+            workers=workers,
+            chunksize=chunksize,
+            ordered=ordered,
+            error_on_duration_mismatch=error_on_duration_mismatch,
+            meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+        )
+
+    @classmethod
+    def iter_measures(
+            cls,
+            path: Union[str, Path, Any],
+            window: int = 1,
+            error_on_duration_mismatch: bool = False,
+            meter_signature_fallback_if_not_found: Optional[str] = None,
+    ) -> Iterator[Tuple[int, int, Document]]:
+        """
+        Import a **kern score as a stream of self-contained documents of `window` measures. Only the rows of the \
+        current fragment are kept in memory. See `iter_measures`.
+
+        Args:
+            path (Union[str, Path, Any]): The path of the file, or an iterable of lines (e.g. a file object).
+            window (int): Number of measures of every fragment.
+            error_on_duration_mismatch (bool): If True, validate the duration of every measure against its meter \
+                signature and raise ValueError on mismatch.
+            meter_signature_fallback_if_not_found (Optional[str]): Meter signature used in the validation when \
+                no time signature is available for a measure, e.g. '*M4/4'.
+
+        Returns (Iterator[Tuple[int, int, Document]]): The tuples (from_measure, to_measure, document) of every \
+            fragment. The measures are numbered from 1.
+
+        Raises:
+            ValueError: If the window is not a positive integer, or on a duration mismatch when \
+                `error_on_duration_mismatch` is True.
+        """
+        return iter_measures(
+            path,
+            window=window,
+            error_on_duration_mismatch=error_on_duration_mismatch,
+            meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+        )
+
+    @classmethod
+    def iter_fragments(
+            cls,
+            document: Document,
+            options: ExportOptions,
+            window: int,
+            stride: int = 1,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Export all the self-contained fragments of `window` measures of a document, starting every `stride` \
+        measures. The document is exported in one pass. See `Exporter.export_fragments`.
+
+        Args:
+            document (Document): The document to export.
+            options (ExportOptions): The export options. Its `from_measure` and `to_measure` are ignored.
+            window (int): Number of measures of every fragment.
+            stride (int): Number of measures between the first measures of two consecutive fragments.
+
+        Returns (Iterator[Tuple[int, int, str]]): The tuples (from_measure, to_measure, content) of every fragment, \
+            in order. When the document has fewer than `window` measures, there are no fragments.
+
+        Raises:
+            ValueError: If the window or the stride are not positive integers, or the options are not valid for \
+                the document.
+        """
+        return Exporter().export_fragments(document, options, window, stride)
+
+    @classmethod
+    def generate_fragments(
+            cls,
+            paths: Iterable[Union[str, Path]],
+            output_directory: Union[str, Path],
+            options: ExportOptions,
+            window: int,
+            stride: int = 1,
+            extension: str = 'krn',
+            root: Optional[Union[str, Path]] = None,
+            workers: Optional[int] = None,
+            chunksize: int = 1,
+    ) -> Iterator[Tuple[Union[str, Path], int, List[str]]]:
+        """
+        Export the fragments of several **kern files in parallel using a pool of processes. The fragments of every \
+        file are written to `<output_directory>/<file stem>/from-<a>-to-<b>.<extension>`. See `generate_fragments`.
+
+        Args:
+            paths (Iterable[Union[str, Path]]): The paths of the files.
+            output_directory (Union[str, Path]): The directory of the fragments.
+            options (ExportOptions): The export options of the fragments.
+            window (int): Number of measures of every fragment.
+            stride (int): Number of measures between the first measures of two consecutive fragments.
+            extension (str): The extension of the fragment files.
+            root (Optional[Union[str, Path]]): The directory of the files. When given, the directories of the \
+                fragments mirror the tree of the files under it instead of being named by their stems.
+            workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+                When 1, the files are processed in the current process.
+            chunksize (int): Number of files sent to a worker at once.
+
+        Returns (Iterator[Tuple[Union[str, Path], int, List[str]]]): The tuples (path, fragments count, errors), \
+            in the same order as the paths. A file that cannot be exported does not stop the others: its errors \
+            contain the exception message.
+
+        Raises:
+            ValueError: If the window, the stride, the workers or the chunksize are not positive integers, or if the \
+                fragments of two files would be written to the same directory.
+        """
+        return generate_fragments(
+            paths,
+            output_directory,
+            options,
+            window=window,
+            stride=stride,
+            extension=extension,
+            root=root,
+            workers=workers,
+            chunksize=chunksize,
+        )
+
     @classmethod
     def create(
             cls,
@@ -115,8 +283,13 @@ class Generic:
 
         Returns:
         """
-        content = cls.export(document, options)
-        _write(path, content)
+        lines = Exporter().export_lines(document, options)  # validate the options before creating the file
+        if hasattr(path, 'write'):
+            path.writelines(lines)
+            return
+
+        with _open_for_writing(path) as f:
+            f.writelines(lines)
 
     @classmethod
     def store_graph(
@@ -3,14 +3,16 @@ from __future__ import annotations
 import csv
 import io
 from copy import copy
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
 from kernpy.core.tokens import TokenCategory, SignatureToken, MetacommentToken, HeaderToken, SpineOperationToken, \
     FieldCommentToken, \
     BoundingBoxToken, SPINE_OPERATIONS, HEADERS, Token, TimeSignatureToken, NoteRestToken, Subtoken
-from kernpy.core.document import Document, MultistageTree, BoundingBoxMeasures
+from kernpy.core.document import Document, MultistageTree, BoundingBoxMeasures, LazyTokenNode
 from kernpy.core.importer_factory import createImporter
+from kernpy.core.token_pool import TokenPool
 from kernpy.core.measure_signature_validators import MeasureSignatureValidator, HorizontalRhythmValidator
 
 class Importer:
@@ -18,16 +20,40 @@ class Importer:
     Importer class.
 
     Use this class to import the content from a file or a string to a `Document` object.
+
+    Thread safety: an `Importer` imports one document at a time. It can be reused to import several documents \
+    one after the other, but it must not be shared by threads that import at the same time: create one \
+    `Importer` per thread or per import, as `kp.load` and `kp.loads` do. Different `Importer` instances can \
+    import in parallel threads, including free-threaded Python builds. The imported documents can be read from \
+    several threads (even the lazy tokens), but they must not be modified while other threads read them.
     """
     def __init__(
             self,
             *,
             error_on_duration_mismatch: bool = False,
             meter_signature_fallback_if_not_found: Optional[str] = None,
+            lazy_tokens: bool = False,
+            intern_tokens: bool = False,
     ):
         """
         Create an instance of the importer.
 
+        Args:
+            error_on_duration_mismatch (bool): If True, validate the duration of every measure against its meter \
+                signature and raise ValueError on mismatch.
+            meter_signature_fallback_if_not_found (Optional[str]): Meter signature used in the validation when \
+                no time signature is available for a measure.
+            lazy_tokens (bool): If True, the notes, rests and other content cells after the first barline are \
+                not parsed while importing: the token of every node is parsed the first time it is accessed. \
+                Header, interpretation, barline, comment and null cells are always parsed, because the structure \
+                of the document depends on them. An invalid cell raises ValueError when its token is accessed. \
+                It has no effect when error_on_duration_mismatch is True.
+            intern_tokens (bool): If True, the equal cells of the same spine type share one frozen token, \
+                taken from `TokenPool.shared()`, in this document and in all the documents imported in the process. \
+                It saves memory when many documents are kept in memory. Frozen tokens cannot be modified: copy them \
+                (copy.copy) to change them. Header, spine operation and comment tokens are never shared. \
+                If False, every node has its own token, which can be modified.
+
         Raises:
             Exception: If the importer content is not a valid **kern file.
 
@@ -41,12 +67,22 @@ class Importer:
             # Import the content from a string
             >>> document = importer.import_string("**kern\n*clefF4\nc4\n4d\n4e\n4f\n*-")
         """
+        self._error_on_duration_mismatch = error_on_duration_mismatch
+        self._meter_signature_fallback_if_not_found = meter_signature_fallback_if_not_found
+        self._lazy_tokens = lazy_tokens and not error_on_duration_mismatch
+        self._token_pool = TokenPool.shared() if intern_tokens else None
+        self._measure_duration_validation_memo: Dict[Tuple[str, Tuple[str, ...]], Tuple[bool, str]] = {}
+        self._reset()
+
+    def _reset(self):
+        # State of the document being imported. Every import starts with a new one.
         self.last_measure_number = None
         self.last_bounding_box = None
         self.errors = []
 
         self._tree = MultistageTree()
         self._document = Document(self._tree)
+        # New spine importers for every document: the lazy tokens of the previous one may still use the old ones
         self._importers = {}
         self._header_row_number = None
         self._row_number = 1
@@ -55,11 +91,8 @@ class Importer:
         self._prev_stage_parents = None
         self._last_node_previous_to_header = self._tree.root
         self._terminated_spine_columns = {}
-        self._error_on_duration_mismatch = error_on_duration_mismatch
-        self._meter_signature_fallback_if_not_found = meter_signature_fallback_if_not_found
         self._current_measure_durations_by_column: Dict[int, List[Subtoken]] = {}
         self._current_measure_signature_by_column: Dict[int, str] = {}
-        self._measure_duration_validation_memo: Dict[Tuple[str, Tuple[str, ...]], Tuple[bool, str]] = {}
         self._seen_first_barline = False
         # Horizontal rhythm validation: track token types per spine
         self._current_measure_tokens_by_column: Dict[int, List[Token | Subtoken]] = {}
@@ -68,6 +101,8 @@ class Importer:
     def get_last_spine_operator(parent):
         if parent is None:
             return None
+        elif isinstance(parent, LazyTokenNode) and parent.is_token_pending:
+            return parent.last_spine_operator_node  # pending tokens are never spine operators
         elif isinstance(parent.token, SpineOperationToken):
             return parent
         else:
@@ -75,6 +110,9 @@ class Importer:
 
     #TODO Documentar cómo propagamos los header_node y last_spine_operator_node...
     def run(self, reader) -> Document:
+        if self._tree_stage > 0:
+            self._reset()  # the instance was already used to import another document
+
         for row in reader:
             if len(row) <= 0:
                 # Found an empty row, usually the last one. Ignore it.
@@ -129,19 +167,28 @@ class Importer:
                                 raise Exception(f'Cannot find a parent node for column #{icolumn} in row {self._row_number}')
                             if not parent.header_node:
                                 raise Exception(f'Cannot find a header node for column #{icolumn} in row {self._row_number}')
-                            importer = self._importers.get(parent.header_node.token.encoding)
+                            spine_type = parent.header_node.token.encoding
+                            importer = self._importers.get(spine_type)
                             if not importer:
-                                raise Exception(f'Cannot find an importer for header {parent.header_node.token.encoding}')
-                            try:
-                                token = importer.import_token(column)
-                            except Exception as error:
-                                original_error = str(error).strip() or type(error).__name__
-                                formatted_message = (
-                                    f"Invalid token at row {self._row_number}, column {icolumn} (spine #{icolumn}): "
-                                    f"'{column}'. Parsing detail: {original_error}"
-                                )
-                                self.errors.append(formatted_message)
-                                raise ValueError(formatted_message) from error
+                                raise Exception(f'Cannot find an importer for header {spine_type}')
+                            token = self._token_pool.get(spine_type, column) if self._token_pool is not None else None
+                            if token is None:
+                                create_token = partial(self._import_cell_token, importer, column, self._row_number, icolumn)
+                                if self._token_pool is not None:
+                                    create_token = partial(self._token_pool.request, spine_type, column, create_token)
+                                if self._lazy_tokens and self._seen_first_barline and self._is_content_cell(column):
+                                    node = self._tree.add_lazy_node(
+                                        self._tree_stage, parent, create_token,
+                                        self.get_last_spine_operator(parent), parent.last_signature_nodes,
+                                        parent.header_node)
+                                    self._next_stage_parents.append(node)
+                                    continue
+
+                                try:
+                                    token = create_token()
+                                except ValueError as error:
+                                    self.errors.append(str(error))
+                                    raise
                         if not token:
                             raise Exception(
                                 f'No token generated for input {column} in row number #{self._row_number} using importer {importer}')
@@ -165,7 +212,7 @@ class Importer:
                         elif isinstance(token, BoundingBoxToken):
                             self.handle_bounding_box(self._document, token)
                         elif isinstance(token, SignatureToken):
-                            node.last_signature_nodes.update(node)
+                            node.last_signature_nodes = node.last_signature_nodes.with_node(node)
 
                 if measure_start_stage is not None:
                     self._document.measure_start_tree_stages.append(measure_start_stage)
@@ -181,8 +228,25 @@ class Importer:
         ]
 
         self._validate_pending_measures_at_end()
+        self._document.measure_index  # build the index of the measures
         return self._document
 
+    @staticmethod
+    def _is_content_cell(column: str) -> bool:
+        # Cells that never change the structure of the document: notes, rests, chords, lyrics, dynamics...
+        return not column.startswith(('*', '=', '!')) and column != '.'
+
+    @staticmethod
+    def _import_cell_token(importer, encoding: str, row_number: int, column_index: int) -> Token:
+        try:
+            return importer.import_token(encoding)
+        except Exception as error:
+            original_error = str(error).strip() or type(error).__name__
+            raise ValueError(
+                f"Invalid token at row {row_number}, column {column_index} (spine #{column_index}): "
+                f"'{encoding}'. Parsing detail: {original_error}"
+            ) from error
+
     def _track_measure_validation_state(self, column_index: int, token: Token):
         if not self._error_on_duration_mismatch:
             return
@@ -305,7 +369,8 @@ class Importer:
         if last_page_bb is None:
             if self.last_measure_number is None:
                 self.last_measure_number = 0
-            self.last_bounding_box = BoundingBoxMeasures(token.bounding_box, self.last_measure_number,
+            # The bounding box of the page is extended with the next ones: never extend the one of the token
+            self.last_bounding_box = BoundingBoxMeasures(copy(token.bounding_box), self.last_measure_number,
                                                          self.last_measure_number)
             document.page_bounding_boxes[page_number] = self.last_bounding_box
         else:
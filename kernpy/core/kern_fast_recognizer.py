@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from typing import Optional, List
+
+from .tokens import Token, Subtoken, TokenCategory, SimpleToken, NoteRestToken, BarToken, ClefToken, \
+    TimeSignatureToken, KeySignatureToken
+
+
+# Decorations made of just one character whose meaning does not depend on the surrounding characters.
+# Combined decorations (e.g. 'TT', 'Ww', '&(', 'L>', '[y'), grace notes, appoggiaturas and alteration displays are left
+# to the ANTLR parser.
+_DECORATIONS = r"""[\^~`"s';(){}\[\]_/\\LJKkS$:NOlVMm]"""
+
+_NOTE_PATTERN = re.compile(
+    rf'(?P<before_duration>{_DECORATIONS}*)'
+    r'(?:(?P<duration>\d+)(?P<dots>\.*))?'
+    rf'(?P<before_pitch>{_DECORATIONS}*)'
+    r'(?P<pitch>(?P<treble>[a-g])(?P=treble)*|(?P<bass>[A-G])(?P=bass)*)'
+    rf'(?P<before_alteration>{_DECORATIONS}*)'
+    r'(?P<alteration>(?:#{1,3}|-{1,3}|n)X?)?'
+    rf'(?P<after_alteration>{_DECORATIONS}*)'
+)
+
+_REST_PATTERN = re.compile(
+    r"(?:(?P<duration>\d+)(?P<dots>\.*))?"
+    r"rr?"
+    r"(?P<decorations>[;(){}']*)"
+)
+
+_BARLINE_PATTERN = re.compile(
+    r'(?P<equals>==?)'
+    r'\d*'
+    r'(?P<hidden>-?)'
+    r'(?P<bar_line_type>\|\||:\|!\|:|:\|!|!\|:|:!:)?'
+    r'(?P<fermata>;?)'
+)
+
+_CLEF_PATTERN = re.compile(r'\*clef[CFGPT](?:vv?|\^\^?)?[1-5]?')
+_TIME_SIGNATURE_PATTERN = re.compile(r'\*M\d+/\d+')
+_KEY_SIGNATURE_PATTERN = re.compile(r'\*k\[(?:[a-g](?:#{1,3}|-{1,3}|n))*\]')
+
+
+class KernFastRecognizer:
+    """
+    Recognizer of the most frequent **kern encodings without running the ANTLR parser.
+
+    It builds the same tokens (type, encoding, category, subtokens and hidden flag) that \
+    `BaseANTLRSpineParserListener` builds for simple notes and rests (duration, pitch, alteration and \
+    single-character decorations), null tokens, barlines, clefs, time signatures and key signatures. \
+    Any other encoding is not recognized, and it must be parsed by the generated `kernSpineParser`.
+
+    Examples:
+        >>> recognizer = KernFastRecognizer()
+        >>> recognizer.recognize('4.cc#L').export()
+        '4@.@cc@#·L'
+        >>> recognizer.recognize('4c 4e') is None
+        True
+    """
+
+    def recognize(self, encoding: str) -> Optional[Token]:
+        """
+        Build the token of the encoding if it is a simple one.
+
+        Args:
+            encoding (str): The encoding of the cell.
+
+        Returns (Optional[Token]): The token, or None if the encoding must be parsed by the ANTLR parser.
+        """
+        first = encoding[0]
+        if first == '*':
+            return self._recognize_interpretation(encoding)
+        if first == '=':
+            return self._recognize_barline(encoding)
+        if encoding == '.':
+            return SimpleToken(encoding, TokenCategory.EMPTY)
+        if first == '!':
+            return None
+
+        match = _NOTE_PATTERN.fullmatch(encoding)
+        if match:
+            return self._build_note(encoding, match)
+
+        match = _REST_PATTERN.fullmatch(encoding)
+        if match:
+            return self._build_rest(encoding, match)
+
+        return None
+
+    @classmethod
+    def _recognize_interpretation(cls, encoding: str) -> Optional[Token]:
+        if encoding == '*':
+            return SimpleToken(encoding, TokenCategory.EMPTY)
+        if _CLEF_PATTERN.fullmatch(encoding):
+            return ClefToken(encoding)
+        if _TIME_SIGNATURE_PATTERN.fullmatch(encoding):
+            return TimeSignatureToken(encoding)
+        if _KEY_SIGNATURE_PATTERN.fullmatch(encoding):
+            return KeySignatureToken(encoding)
+        return None
+
+    @classmethod
+    def _recognize_barline(cls, encoding: str) -> Optional[Token]:
+        match = _BARLINE_PATTERN.fullmatch(encoding)
+        if not match:
+            return None
+
+        txt_without_number = match.group('equals') + (match.group('bar_line_type') or '') + match.group('fermata')
+        # same corrections as the ANTLR listener
+        if txt_without_number == ':!:':
+            txt_without_number = ':|!|:'
+
+        token = BarToken(txt_without_number)
+        token.hidden = match.group('hidden') == '-'
+        return token
+
+    @classmethod
+    def _duration_subtokens(cls, match: re.Match) -> List[Subtoken]:
+        if match.group('duration') is None:
+            return []
+        subtokens = [Subtoken(match.group('duration'), TokenCategory.DURATION)]
+        for _ in match.group('dots'):
+            subtokens.append(Subtoken('.', TokenCategory.DURATION))
+        return subtokens
+
+    @classmethod
+    def _decoration_subtokens(cls, decorations: str) -> List[Subtoken]:
+        # Keep the first occurrence of each decoration, as BaseANTLRSpineParserListener._add_decoration does
+        subtokens = []
+        seen = set()
+        for decoration in decorations:
+            if decoration in seen:
+                continue
+            seen.add(decoration)
+            subtokens.append(Subtoken(decoration, TokenCategory.DECORATION))
+        return subtokens
+
+    @classmethod
+    def _build_note(cls, encoding: str, match: re.Match) -> Token:
+        pitch_duration_subtokens = cls._duration_subtokens(match)
+        pitch_duration_subtokens.append(Subtoken(match.group('pitch'), TokenCategory.PITCH))
+        if match.group('alteration'):
+            pitch_duration_subtokens.append(Subtoken(match.group('alteration'), TokenCategory.ALTERATION))
+
+        decorations = (match.group('before_duration') + match.group('before_pitch')
+                       + match.group('before_alteration') + match.group('after_alteration'))
+        return NoteRestToken(encoding, pitch_duration_subtokens, cls._decoration_subtokens(decorations))
+
+    @classmethod
+    def _build_rest(cls, encoding: str, match: re.Match) -> Token:
+        pitch_duration_subtokens = cls._duration_subtokens(match)
+        pitch_duration_subtokens.append(Subtoken('r', TokenCategory.REST))
+        return NoteRestToken(encoding, pitch_duration_subtokens, cls._decoration_subtokens(match.group('decorations')))
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import threading
 from typing import List
 
 from antlr4 import InputStream, CommonTokenStream, ParseTreeWalker, BailErrorStrategy, \
-    PredictionMode
+    PredictionMode, DFA, PredictionContextCache
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from typing import Optional
 
 from .base_antlr_importer import BaseANTLRListenerImporter
 from .base_antlr_spine_parser_listener import BaseANTLRSpineParserListener
 from .error_listener import ErrorListener
+from .kern_fast_recognizer import KernFastRecognizer
 from .generated.kernSpineLexer import kernSpineLexer
 from .generated.kernSpineParser import kernSpineParser
 from .spine_importer import SpineImporter
+from kernpy.util.store_cache import LRUStoreCache, CacheInfo
 from .tokens import SimpleToken, TokenCategory, Subtoken, ChordToken, BoundingBox, \
     BoundingBoxToken, ClefToken, KeySignatureToken, TimeSignatureToken, MeterSymbolToken, BarToken, NoteRestToken, \
     KeyToken, InstrumentToken
@@ -38,37 +45,186 @@ class KernListenerImporter(BaseANTLRListenerImporter):
 
 
 class KernSpineImporter(SpineImporter):
-    def __init__(self, verbose: Optional[bool] = False):
+    """
+    Importer of the tokens of the **kern spines.
+
+    Thread safety: an instance can be used by several threads at the same time. The parse cache is synchronized. \
+    Every thread runs its own ANTLR lexer and parser, with its own error and parse listeners, and the DFA and \
+    prediction context caches of the generated lexer and parser (which the ANTLR runtime does not synchronize) \
+    are kept per thread instead of per class, so the threads parse without a lock. Each thread warms up its own \
+    DFA caches. On regular CPython builds the threads still share the GIL, so parsing does not run in parallel: \
+    use free-threaded Python, or processes (`kp.load_many`), to parse on several cores \
+    (see benchmarks/thread_imports.py).
+    """
+    PARSE_CACHE_SIZE = 8192
+    """
+    Maximum number of distinct encodings kept in the parse cache shared by all the KernSpineImporter instances.
+    """
+
+    _parse_cache = LRUStoreCache(maxsize=PARSE_CACHE_SIZE)
+
+    # The generated lexer and parser share their DFA caches between all their instances, and the ANTLR runtime
+    # does not synchronize them: every thread uses its own caches (see _thread_dfa_caches)
+    _thread_caches = threading.local()
+
+    def __init__(
+            self,
+            verbose: Optional[bool] = False,
+            cache: Optional[bool] = True,
+            fast_path: Optional[bool] = True,
+            parity_check: Optional[bool] = False
+    ):
         """
         KernSpineImporter constructor.
 
         Args:
             verbose (Optional[bool]): Level of verbosity for error messages.
+            cache (Optional[bool]): If True, the parsed tokens are stored in a parse cache shared by all the \
+                KernSpineImporter instances, so every distinct encoding is parsed only once. Default is True.
+            fast_path (Optional[bool]): If True, the most frequent encodings (simple notes and rests, nulls, \
+                barlines, clefs, time and key signatures) are recognized without running the ANTLR parser. \
+                Default is True.
+            parity_check (Optional[bool]): If True, every encoding recognized by the fast path is also parsed \
+                with the ANTLR parser, and a ValueError is raised if both tokens are not identical. \
+                It is only intended for testing. Default is False.
         """
         super().__init__(verbose=verbose)
+        self.cache = cache
+        self.verbose = verbose
+        self._local = threading.local()  # the ANTLR objects of every thread
+        self.walker = ParseTreeWalker()
+        self.fast_recognizer = KernFastRecognizer() if fast_path else None
+        self.parity_check = parity_check
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         return KernSpineListener()
 
     def import_token(self, encoding: str):
         self._raise_error_if_wrong_input(encoding)
-        self.error_listener.errors = []
-
-        # self.listenerImporter = KernListenerImporter(token) # TODO ¿Por qué no va esto?
-        # self.listenerImporter.start()
-        lexer = kernSpineLexer(InputStream(encoding))
-        lexer.removeErrorListeners()
-        lexer.addErrorListener(self.error_listener)
-        stream = CommonTokenStream(lexer)
-        parser = kernSpineParser(stream)
-        parser._interp.predictionMode = PredictionMode.SLL  # it improves a lot the parsing
-        parser.removeErrorListeners()
-        parser.addErrorListener(self.error_listener)
-        parser.errHandler = BailErrorStrategy()
-        tree = parser.start()
-        walker = ParseTreeWalker()
-        listener = KernSpineListener()
-        walker.walk(listener, tree)
-        if self.error_listener.getNumberErrorsFound() > 0:
-            raise ValueError(str(self.error_listener).strip())
-        return listener.token
+
+        # Bounding boxes are unique per cell: caching them would only fill the cache
+        if not self.cache or encoding.startswith('*xywh'):
+            return self._parse(encoding)
+
+        # The cached token is frozen and shared: return a copy with its own lists, so the caller token can be changed
+        return KernSpineImporter._parse_cache.request(self._parse_frozen, encoding).unfrozen_copy()
+
+    def _parse_frozen(self, encoding: str):
+        return self._parse(encoding).freeze()
+
+    def _parse(self, encoding: str):
+        fast_token = self.fast_recognizer.recognize(encoding) if self.fast_recognizer else None
+        if fast_token is None:
+            return self._parse_antlr(encoding)
+        if not self.parity_check:
+            return fast_token
+
+        try:
+            antlr_token = self._parse_antlr(encoding)
+        except ValueError as e:
+            raise ValueError(f"Fast path parity error in '{encoding}': "
+                             f"the ANTLR parser failed ({e}) but the fast path built {vars(fast_token)}")
+        if type(fast_token) is not type(antlr_token) or vars(fast_token) != vars(antlr_token):
+            raise ValueError(f"Fast path parity error in '{encoding}': "
+                             f"the fast path built {type(fast_token).__name__} {vars(fast_token)} "
+                             f"but the ANTLR parser built {type(antlr_token).__name__} {vars(antlr_token)}")
+        return antlr_token
+
+    @property
+    def lexer(self) -> Optional[kernSpineLexer]:
+        """
+        The ANTLR lexer of the current thread. None if the thread has not parsed any encoding.
+        """
+        return getattr(self._local, 'lexer', None)
+
+    @property
+    def parser(self) -> Optional[kernSpineParser]:
+        """
+        The ANTLR parser of the current thread. None if the thread has not parsed any encoding.
+        """
+        return getattr(self._local, 'parser', None)
+
+    @classmethod
+    def _thread_dfa_caches(cls):
+        # The DFA and prediction context caches of the current thread, shared by all the instances in the thread
+        caches = cls._thread_caches
+        if not hasattr(caches, 'parser_dfa'):
+            caches.lexer_dfa = [DFA(state, i) for i, state in enumerate(kernSpineLexer.atn.decisionToState)]
+            caches.parser_dfa = [DFA(state, i) for i, state in enumerate(kernSpineParser.atn.decisionToState)]
+            caches.parser_context_cache = PredictionContextCache()
+        return caches
+
+    def _create_parser(self):
+        # The lexer, token stream and parser of the thread are created once and reset for every new input
+        caches = self._thread_dfa_caches()
+        local = self._local
+        local.error_listener = ErrorListener(verbose=self.verbose)
+        local.import_listener = type(self).import_listener(self)  # the attribute shadows the factory method
+
+        local.lexer = kernSpineLexer(InputStream(''))
+        local.lexer._interp = LexerATNSimulator(local.lexer, local.lexer.atn, caches.lexer_dfa,
+                                                PredictionContextCache())
+        local.lexer.removeErrorListeners()
+        local.lexer.addErrorListener(local.error_listener)
+        local.token_stream = CommonTokenStream(local.lexer)
+        local.parser = kernSpineParser(local.token_stream)
+        local.parser._interp = ParserATNSimulator(local.parser, local.parser.atn, caches.parser_dfa,
+                                                  caches.parser_context_cache)
+        local.parser.removeErrorListeners()
+        local.parser.addErrorListener(local.error_listener)
+
+    def _parse_antlr(self, encoding: str):
+        local = self._local
+        if getattr(local, 'parser', None) is None:
+            self._create_parser()
+        lexer, token_stream, parser = local.lexer, local.token_stream, local.parser
+        error_listener = local.error_listener
+
+        error_listener.errors = []
+        lexer.inputStream = InputStream(encoding)
+        token_stream.setTokenSource(lexer)
+
+        # Two-stage parsing: SLL is much faster, but it may fail on inputs that full LL accepts
+        parser.setTokenStream(token_stream)
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            tree = parser.start()
+        except ParseCancellationException:
+            # Keep the lexer errors (they have no offending token), the parser errors are found again in the LL stage
+            error_listener.errors = [error for error in error_listener.errors if error.offendingSymbol is None]
+            token_stream.seek(0)
+            parser.setTokenStream(token_stream)
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
+            tree = parser.start()
+
+        if error_listener.getNumberErrorsFound() > 0:
+            raise ValueError(str(error_listener).strip())
+
+        self.walker.walk(local.import_listener, tree)
+        return local.import_listener.token
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """
+        Get the statistics of the parse cache shared by all the KernSpineImporter instances.
+
+        Returns (CacheInfo): A named tuple with the hits, misses, maxsize and current size of the cache.
+
+        Examples:
+            >>> KernSpineImporter.cache_clear()
+            >>> importer = KernSpineImporter()
+            >>> _ = importer.import_token('4c')
+            >>> _ = importer.import_token('4c')
+            >>> KernSpineImporter.cache_info()
+            CacheInfo(hits=1, misses=1, maxsize=8192, currsize=1)
+        """
+        return cls._parse_cache.info()
+
+    @classmethod
+    def cache_clear(cls):
+        """
+        Remove all the tokens of the parse cache shared by all the KernSpineImporter instances and reset its statistics.
+        """
+        cls._parse_cache.clear()
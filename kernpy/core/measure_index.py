@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import threading
+from copy import copy
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from kernpy.core.tokens import HeaderToken, SpineOperationToken, NoteRestToken, TokenCategory
+
+if TYPE_CHECKING:
+    from kernpy.core.document import Document, Node, SignatureNodes
+    from kernpy.core.exporter import ExportOptions
+
+
+__all__ = ['MeasureIndex', 'MeasureView']
+
+
+class MeasureIndex:
+    """
+    Index of the measures of a document, built once so that a range of measures is found without scanning the tree.
+
+    For every measure the index stores its stage range, the spine ids of the nodes of its first stage (the active \
+    spines) and their active signature nodes. The header and spine operation rows that precede a measure (its \
+    context rows) are computed the first time they are requested, incrementally from the context rows of the \
+    previous measure, and kept for the next requests.
+
+    The index belongs to the tree and the `measure_start_tree_stages` it was built from. \
+    Use `Document.measure_index` to get an up-to-date index.
+
+    The index also answers where the active signatures (clef, key signature, meter...) of a node are replaced \
+    (see `signature_override_stage`). The table is built the first time it is requested, once for the whole tree.
+
+    Measures are numbered from 1, like `ExportOptions.from_measure` and `ExportOptions.to_measure`.
+
+    Attributes:
+        stage_ranges (List[Tuple[int, int]]): First and last stage of every measure. The last measure \
+            ends at the last stage of the tree.
+        spine_ids (List[Tuple[Optional[int], ...]]): Spine id of every active spine at the first stage of \
+            every measure, from left to right.
+        signature_nodes (List[Tuple[SignatureNodes, ...]]): Active signature nodes of every active spine \
+            at the first stage of every measure, from left to right.
+
+    Examples:
+        >>> document, _ = kp.load('score.krn')
+        >>> document.measure_index.stage_range(3)
+        (25, 33)
+        >>> document.measure_index.spine_ids[3 - 1]
+        (0, 1, 1, 2)
+    """
+
+    def __init__(self, document: Document):
+        """
+        Build the index of the measures of a document.
+
+        Args:
+            document (Document): The document. The index must be rebuilt if its tree or its measures change.
+        """
+        tree = document.tree
+        self._tree = tree
+        self._stage_count = len(tree.stages)
+        self._measure_start_tree_stages = document.measure_start_tree_stages
+        self._measures_count = len(document.measure_start_tree_stages)
+
+        starts = list(document.measure_start_tree_stages)
+        ends = [start - 1 for start in starts[1:]] + [self._stage_count - 1]
+        self.stage_ranges = list(zip(starts, ends))
+        self.spine_ids = []
+        self.signature_nodes = []
+        for start in starts:
+            columns = tree.stages[start]
+            self.spine_ids.append(tuple(
+                node.header_node.token.spine_id if node.header_node else None for node in columns))
+            self.signature_nodes.append(tuple(node.last_signature_nodes for node in columns))
+
+        self._context_rows = []
+        self._aligned_context_rows = []  # whether all the columns reach the root at the same time
+        self._signature_overrides = None  # node id -> {signature token class -> first override stage}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_context_node(node: Node) -> bool:
+        # The pending tokens of lazy nodes are content cells: they are not imported here
+        if getattr(node, 'is_token_pending', False):
+            return False
+        return isinstance(node.token, (HeaderToken, SpineOperationToken))
+
+    def is_valid_for(self, document: Document) -> bool:
+        """
+        Check whether the index still describes the document.
+
+        Args:
+            document (Document): The document.
+
+        Returns (bool): True if the tree and the measures of the document are the ones the index was built from.
+        """
+        return (self._tree is document.tree
+                and self._stage_count == len(document.tree.stages)
+                and self._measure_start_tree_stages is document.measure_start_tree_stages
+                and self._measures_count == len(document.measure_start_tree_stages))
+
+    def __len__(self) -> int:
+        return len(self.stage_ranges)
+
+    def _check_measure(self, measure: int) -> None:
+        if not 1 <= measure <= len(self.stage_ranges):
+            raise ValueError(f'measure must be between 1 and {len(self.stage_ranges)} but {measure} was found. ')
+
+    def stage_range(self, measure: int) -> Tuple[int, int]:
+        """
+        Get the first and the last stage of a measure.
+
+        Args:
+            measure (int): The measure, starting from 1.
+
+        Returns (Tuple[int, int]): The first and the last stage of the measure, both included.
+
+        Raises:
+            ValueError: If the measure does not exist.
+        """
+        self._check_measure(measure)
+        return self.stage_ranges[measure - 1]
+
+    def from_stage(self, measure: int) -> int:
+        """
+        Get the first stage of a measure.
+
+        Args:
+            measure (int): The measure, starting from 1.
+
+        Returns (int): The first stage of the measure.
+
+        Raises:
+            ValueError: If the measure does not exist.
+        """
+        return self.stage_range(measure)[0]
+
+    def columns(self, measure: int) -> List[Node]:
+        """
+        Get the nodes of the first stage of a measure, one for every active spine.
+
+        Args:
+            measure (int): The measure, starting from 1.
+
+        Returns (List[Node]): The nodes, from left to right.
+
+        Raises:
+            ValueError: If the measure does not exist.
+        """
+        return self._tree.stages[self.from_stage(measure)]
+
+    def context_rows(self, measure: int) -> Tuple[Tuple[Node, ...], ...]:
+        """
+        Get the header and spine operation rows that precede a measure, restricted to its active spines.
+
+        The rows are built walking back to the root from the nodes of the first stage of the measure: every row \
+        contains the parents of the nodes of the next row. A parent appears several times in a row if its spine \
+        was split after the row.
+
+        Args:
+            measure (int): The measure, starting from 1.
+
+        Returns (Tuple[Tuple[Node, ...], ...]): The nodes of every row, from the headers to the first stage \
+            of the measure.
+
+        Raises:
+            ValueError: If the measure does not exist.
+        """
+        self._check_measure(measure)
+        with self._lock:
+            while len(self._context_rows) < measure:
+                self._add_context_rows(len(self._context_rows) + 1)
+            return self._context_rows[measure - 1]
+
+    def signature_override_stage(self, node: Node, signature_class: type) -> Optional[int]:
+        """
+        Get the first stage where a signature of a class appears in the spines that follow a node, before their \
+        next note or rest. From that stage on, the active signature of that class at the node is replaced.
+
+        This is the lookup version of `Exporter.is_signature_cancelled`: the signature of a node is cancelled in \
+        an export that ends at `to_stage` if the override stage is not None and not greater than `to_stage`.
+
+        Args:
+            node (Node): The node. It must belong to the tree of the index.
+            signature_class (type): The class of the signature token (e.g. `ClefToken`).
+
+        Returns (Optional[int]): The first stage, which is the stage of the node if its token is of that class. \
+            None if no signature of that class follows the node before a note or a rest.
+        """
+        signature_overrides = self._signature_overrides
+        if signature_overrides is None:
+            with self._lock:
+                if self._signature_overrides is None:
+                    self._signature_overrides = self._compute_signature_overrides()
+                signature_overrides = self._signature_overrides
+
+        overrides = signature_overrides.get(node.id)
+        return overrides.get(signature_class) if overrides is not None else None
+
+    def _compute_signature_overrides(self) -> dict:
+        # Walk up from every signature node, in stage order, marking the ancestors that reach it without a note or
+        # a rest between them. The walk stops at the ancestors already marked by a previous signature of the same
+        # class, so every node is marked once per class. The signature nodes are structural: they are never pending.
+        signature_nodes = self._tree.node_index.nodes(TokenCategory.valid(include={TokenCategory.SIGNATURES}))
+        signature_nodes.sort(key=lambda signature_node: signature_node.stage)
+
+        signature_overrides = {}
+        root = self._tree.root
+        for signature_node in signature_nodes:
+            signature_class = signature_node.token.__class__
+            stage = signature_node.stage
+            node = signature_node
+            while node is not None and node is not root:
+                overrides = signature_overrides.get(node.id)
+                if overrides is not None and signature_class in overrides:
+                    break  # and its ancestors, by a signature of a previous stage
+                if node is not signature_node and isinstance(node.token, NoteRestToken):
+                    break
+                if overrides is None:
+                    overrides = signature_overrides[node.id] = {}
+                overrides[signature_class] = stage
+                node = node.parent
+        return signature_overrides
+
+    def _add_context_rows(self, measure: int) -> None:
+        stages = self._tree.stages
+        root = self._tree.root
+        nodes = list(stages[self.stage_ranges[measure - 1][0]])
+        positions = {}
+        if measure > 1 and self._aligned_context_rows[measure - 2]:
+            previous_columns = stages[self.stage_ranges[measure - 2][0]]
+            positions = {id(node): position for position, node in enumerate(previous_columns)}
+
+        # Walk back to the columns of the previous measure, and reuse its rows for the rest of the way
+        rows = []
+        aligned = True
+        ancestor_positions = None
+        while nodes and nodes[0] is not root:
+            if positions:
+                ancestor_positions = [positions.get(id(node)) for node in nodes]
+                if None not in ancestor_positions:
+                    break
+                ancestor_positions = None
+            aligned = aligned and all(node.stage == nodes[0].stage for node in nodes)
+            if any(self._is_context_node(node) for node in nodes):
+                rows.append(tuple(nodes))
+            nodes = [node.parent for node in nodes]
+        rows.reverse()
+
+        if ancestor_positions is not None:
+            previous_rows = self._context_rows[measure - 2]
+            if ancestor_positions != list(range(len(positions))):
+                previous_rows = tuple(tuple(row[position] for position in ancestor_positions) for row in previous_rows)
+            self._context_rows.append(previous_rows + tuple(rows))
+        else:
+            self._context_rows.append(tuple(rows))
+        self._aligned_context_rows.append(aligned)
+
+
+class MeasureView:
+    """
+    Read-only view of a range of measures of a document.
+
+    The view is created in constant time from the `MeasureIndex` of the document. Iterate it to get the nodes of \
+    every stage of the measures, or export it like a document: `kp.dumps(document.measures(3, 5))`. The export \
+    uses the measures of the view instead of `from_measure` and `to_measure`.
+
+    Attributes:
+        document (Document): The document.
+        from_measure (int): The first measure of the view, starting from 1.
+        to_measure (int): The last measure of the view, included.
+        from_stage (int): The first stage of the view.
+        to_stage (int): The last stage of the view, included.
+
+    Examples:
+        >>> document, _ = kp.load('score.krn')
+        >>> view = document.measure(3)
+        >>> view.spine_ids
+        (0, 1)
+        >>> for nodes in view:
+        ...     print([node.token.encoding for node in nodes])
+        >>> kp.dumps(view)
+    """
+
+    def __init__(self, document: Document, from_measure: int, to_measure: int):
+        """
+        Create a view of a range of measures.
+
+        Args:
+            document (Document): The document.
+            from_measure (int): The first measure, starting from 1.
+            to_measure (int): The last measure, included.
+
+        Raises:
+            ValueError: If the range of measures is not in the document.
+        """
+        index = document.measure_index
+        if to_measure < from_measure:
+            raise ValueError(f'to_measure must be >= from_measure but {to_measure} < {from_measure} was found. ')
+        self.document = document
+        self.from_measure = from_measure
+        self.to_measure = to_measure
+        self.from_stage = index.stage_range(from_measure)[0]
+        self.to_stage = index.stage_range(to_measure)[1]
+        self._index = index
+
+    @property
+    def columns(self) -> List[Node]:
+        """
+        The nodes of the first stage of the view, one for every active spine.
+        """
+        return self._index.columns(self.from_measure)
+
+    @property
+    def spine_ids(self) -> Tuple[Optional[int], ...]:
+        """
+        The spine id of every active spine at the first stage of the view, from left to right.
+        """
+        return self._index.spine_ids[self.from_measure - 1]
+
+    @property
+    def signature_nodes(self) -> Tuple[SignatureNodes, ...]:
+        """
+        The active signature nodes of every active spine at the first stage of the view, from left to right.
+        """
+        return self._index.signature_nodes[self.from_measure - 1]
+
+    def measures_count(self) -> int:
+        """
+        Get the number of measures of the view.
+
+        Returns (int): The number of measures.
+        """
+        return self.to_measure - self.from_measure + 1
+
+    def export_options(self, options: ExportOptions) -> ExportOptions:
+        """
+        Get a copy of the export options with the measures of the view.
+
+        Args:
+            options (ExportOptions): The export options.
+
+        Returns (ExportOptions): The new export options.
+        """
+        result = copy(options)
+        result.from_measure = self.from_measure
+        result.to_measure = self.to_measure
+        return result
+
+    def __iter__(self) -> Iterator[List[Node]]:
+        stages = self.document.tree.stages
+        for stage in range(self.from_stage, self.to_stage + 1):
+            yield stages[stage]
+
+    def __repr__(self) -> str:
+        return f'MeasureView(from_measure={self.from_measure}, to_measure={self.to_measure})'
@@ -8,6 +8,15 @@ from .tokens import MHXMToken, Token, TokenCategory, SimpleToken
 
 
 class MxhmSpineImporter(SpineImporter):
+    ACCEPTED_CATEGORIES_MASK = TokenCategory.valid_mask(include={
+        TokenCategory.STRUCTURAL,
+        TokenCategory.SIGNATURES,
+        TokenCategory.EMPTY,
+        TokenCategory.IMAGE_ANNOTATIONS,
+        TokenCategory.BARLINES,
+        TokenCategory.COMMENTS,
+    })
+
     def __init__(self, verbose: Optional[bool] = False):
         """
         KernSpineImporter constructor.
@@ -16,6 +25,7 @@ class MxhmSpineImporter(SpineImporter):
             verbose (Optional[bool]): Level of verbosity for error messages.
         """
         super().__init__(verbose=verbose)
+        self.kern_spine_importer = KernSpineImporter(verbose=verbose)
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         return KernSpineListener()
@@ -24,21 +34,11 @@ class MxhmSpineImporter(SpineImporter):
         self._raise_error_if_wrong_input(encoding)
 
         try:
-            kern_spine_importer = KernSpineImporter()
-            token = kern_spine_importer.import_token(encoding)
+            token = self.kern_spine_importer.import_token(encoding)
         except Exception as e:
             return SimpleToken(encoding, TokenCategory.HARMONY)
 
-        ACCEPTED_CATEGORIES = {
-            TokenCategory.STRUCTURAL,
-            TokenCategory.SIGNATURES,
-            TokenCategory.EMPTY,
-            TokenCategory.IMAGE_ANNOTATIONS,
-            TokenCategory.BARLINES,
-            TokenCategory.COMMENTS,
-        }
-
-        if any(TokenCategory.is_child(child=token.category, parent=cat) for cat in ACCEPTED_CATEGORIES):
+        if token.category.bit & self.ACCEPTED_CATEGORIES_MASK:
             return SimpleToken(encoding, TokenCategory.HARMONY)
 
         return token
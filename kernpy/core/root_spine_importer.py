@@ -43,6 +43,7 @@ class RootSpineImporter(SpineImporter):
             verbose (Optional[bool]): Level of verbosity for error messages.
         """
         super().__init__(verbose=verbose)
+        self.kern_spine_importer = KernSpineImporter(verbose=verbose)
 
     def import_listener(self) -> BaseANTLRSpineParserListener:
         #return RootSpineListener() # TODO: Create a custom functional listener for RootSpineImporter
@@ -51,8 +52,7 @@ class RootSpineImporter(SpineImporter):
     def import_token(self, encoding: str) -> Token:
         self._raise_error_if_wrong_input(encoding)
 
-        kern_spine_importer = KernSpineImporter()
-        token = kern_spine_importer.import_token(encoding)
+        token = self.kern_spine_importer.import_token(encoding)
 
         return token  # The **root spine tokens are always a subset of the **kern spine tokens
 
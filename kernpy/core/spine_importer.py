@@ -14,6 +14,11 @@ from .tokens import Token
 
 
 class SpineImporter(ABC):
+    STRUCTURAL_PREFIXES = ('*', '=', '!', '.')
+    """
+    First characters of the encodings that may be interpretations, barlines, comments, nulls or bounding boxes.
+    """
+
     def __init__(self, verbose: Optional[bool] = False):
         """
         SpineImporter constructor.
@@ -33,6 +38,21 @@ class SpineImporter(ABC):
     def import_token(self, encoding: str) -> Token:
         pass
 
+    @classmethod
+    def _may_be_structural(cls, encoding: str) -> bool:
+        """
+        Cheap pre-classifier for the spines that are not parsed with their own grammar.
+
+        Only interpretations, barlines, comments, nulls and bounding boxes are parsed by those spine importers. \
+        Any other encoding is directly imported with the default category of the spine.
+
+        Args:
+            encoding (str): The encoding of the cell.
+
+        Returns (bool): True if the encoding must be parsed, False if it cannot be a structural token.
+        """
+        return encoding.startswith(cls.STRUCTURAL_PREFIXES)
+
     @classmethod
     def _raise_error_if_wrong_input(cls, encoding: str):
         if encoding is None:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Callable, Optional
+
+from kernpy.core.tokens import AbstractToken
+
+
+__all__ = ['TokenPool']
+
+
+class TokenPool:
+    """
+    Pool of shared immutable tokens (flyweights), keyed by the spine type and the encoding of the cell.
+
+    Equal cells of the same spine type (e.g. `4c` or `=` in a **kern spine) resolve to one frozen token instance, \
+    shared by all the nodes of a document and by all the documents imported in the process. The pool holds weak \
+    references: a token is discarded when no document uses it anymore.
+
+    Frozen tokens raise AttributeError when they are modified. Modify a copy instead: `copy.copy(token)` \
+    is not frozen.
+
+    Examples:
+        >>> pool = TokenPool()
+        >>> first = pool.request('**kern', '4c', lambda: KernSpineImporter().import_token('4c'))
+        >>> second = pool.request('**kern', '4c', lambda: KernSpineImporter().import_token('4c'))
+        >>> first is second
+        True
+        >>> first.is_frozen
+        True
+    """
+
+    def __init__(self):
+        """
+        Create an empty pool.
+        """
+        self._tokens = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> TokenPool:
+        """
+        Get the pool shared by all the `Importer` instances of the process.
+
+        Returns (TokenPool): The shared pool.
+        """
+        return _SHARED_POOL
+
+    def get(self, spine_type: str, encoding: str) -> Optional[AbstractToken]:
+        """
+        Get the token of a cell, if it is in the pool.
+
+        Args:
+            spine_type (str): The header of the spine of the cell, e.g. '**kern'.
+            encoding (str): The encoding of the cell.
+
+        Returns (Optional[AbstractToken]): The shared token, or None if it is not in the pool.
+        """
+        return self._tokens.get((spine_type, encoding))
+
+    def request(self, spine_type: str, encoding: str, create: Callable[[], AbstractToken]) -> AbstractToken:
+        """
+        Get the token of a cell from the pool. If it is not in the pool, it is created, frozen and added to the pool.
+
+        Args:
+            spine_type (str): The header of the spine of the cell, e.g. '**kern'.
+            encoding (str): The encoding of the cell.
+            create (Callable[[], AbstractToken]): Function that creates the token when it is not in the pool.
+
+        Returns (AbstractToken): The shared token.
+        """
+        token = self._tokens.get((spine_type, encoding))
+        if token is not None:
+            return token
+        return self.intern(spine_type, create(), encoding)
+
+    def intern(self, spine_type: str, token: AbstractToken, encoding: Optional[str] = None) -> AbstractToken:
+        """
+        Get the shared token of a cell. If there is none, the token is frozen and added to the pool.
+
+        Args:
+            spine_type (str): The header of the spine of the cell, e.g. '**kern'.
+            token (AbstractToken): The token of the cell.
+            encoding (Optional[str]): The encoding of the cell. It may differ from the encoding of the token \
+                (e.g. the barline '=12' is imported as the token '='). If None, the encoding of the token is used.
+
+        Returns (AbstractToken): The shared token.
+        """
+        key = (spine_type, token.encoding if encoding is None else encoding)
+        with self._lock:
+            shared_token = self._tokens.get(key)
+            if shared_token is None:
+                shared_token = self._tokens[key] = token.freeze()
+            return shared_token
+
+    def clear(self):
+        """
+        Remove all the tokens from the pool. The tokens already shared by the documents are still frozen.
+        """
+        with self._lock:
+            self._tokens.clear()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+_SHARED_POOL = TokenPool()
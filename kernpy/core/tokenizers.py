@@ -64,6 +64,10 @@ class Tokenizer(ABC):
     Tokenizer interface. All tokenizers must implement this interface.
 
     Tokenizers are responsible for converting a token into a string representation.
+
+    Thread safety: tokenizers are not modified after they are created, so they can be shared by several threads. \
+    Create a tokenizer once and reuse it for every token: the nested tokenizers and the category filter are \
+    built in the constructor.
     """
     def __init__(self, *, token_categories: Set['TokenCategory']):
         """
@@ -77,6 +81,7 @@ class Tokenizer(ABC):
             raise ValueError('Categories must be provided. Found None.')
 
         self.token_categories = token_categories
+        self._category_filter = frozenset(token_categories).__contains__
 
 
     @abstractmethod
@@ -105,6 +110,7 @@ class KernTokenizer(Tokenizer):
             token_categories (Set[TokenCategory]): List of categories to be tokenized. If None will raise an exception.
         """
         super().__init__(token_categories=token_categories)
+        self._ekern_tokenizer = EkernTokenizer(token_categories=token_categories)
 
     def tokenize(self, token: Token) -> str:
         """
@@ -122,7 +128,7 @@ class KernTokenizer(Tokenizer):
             >>> KernTokenizer().tokenize(token)
             '2.bb-_L'
         """
-        return EkernTokenizer(token_categories=self.token_categories).tokenize(token).replace(TOKEN_SEPARATOR, '').replace(DECORATION_SEPARATOR, '')
+        return self._ekern_tokenizer.tokenize(token).replace(TOKEN_SEPARATOR, '').replace(DECORATION_SEPARATOR, '')
 
 
 class EkernTokenizer(Tokenizer):
@@ -155,7 +161,7 @@ class EkernTokenizer(Tokenizer):
             '2@.@bb@-·_·L'
 
         """
-        return token.export(filter_categories=lambda cat: cat in self.token_categories)
+        return token.export(filter_categories=self._category_filter)
 
 
 class BekernTokenizer(Tokenizer):
@@ -187,7 +193,7 @@ class BekernTokenizer(Tokenizer):
             >>> BekernTokenizer().tokenize(token)
             '2@.@bb@-'
         """
-        ekern_content = token.export(filter_categories=lambda cat: cat in self.token_categories)
+        ekern_content = token.export(filter_categories=self._category_filter)
 
         if DECORATION_SEPARATOR not in ekern_content:
             return ekern_content
@@ -214,7 +220,7 @@ class BkernTokenizer(Tokenizer):
             token_categories (Set[TokenCategory]): List of categories to be tokenized. If None will raise an exception.
         """
         super().__init__(token_categories=token_categories)
-
+        self._bekern_tokenizer = BekernTokenizer(token_categories=token_categories)
 
     def tokenize(self, token: Token) -> str:
         """
@@ -228,7 +234,7 @@ class BkernTokenizer(Tokenizer):
             >>> token.encoding
             '2@.@bb@-·_·L'
         """
-        return BekernTokenizer(token_categories=self.token_categories).tokenize(token).replace(TOKEN_SEPARATOR, '')
+        return self._bekern_tokenizer.tokenize(token).replace(TOKEN_SEPARATOR, '')
 
 
 class AEKernTokenizer(Tokenizer):
@@ -254,6 +260,15 @@ class AEKernTokenizer(Tokenizer):
         """
         super().__init__(token_categories=token_categories)
         self.last_clef = last_clef
+        self._clef = ClefFactory.create_clef(last_clef) if last_clef is not None else None
+        self._pitch_importer = PitchImporterFactory.create('kern')
+
+    def _convert_pitch_subtoken_to_agnostic(self, pitch_subtoken: str) -> str:
+        if self._clef is None:
+            raise ValueError("Clef must be provided to convert pitch subtoken to an agnostic pitch representation.")
+
+        agnostic_pitch: AgnosticPitch = self._pitch_importer.import_pitch(pitch_subtoken)
+        return pitch_to_gkern_string(agnostic_pitch, self._clef)
 
     def tokenize(self, token: Token, **kwargs) -> str:
         """
@@ -263,23 +278,9 @@ class AEKernTokenizer(Tokenizer):
 
         Returns (str): **aekern string representation.
         """
-        clef = ClefFactory.create_clef(self.last_clef) if self.last_clef is not None else None
-
-
-
-    # Create a callback function to pass it dynamically to the export method
-        def callback_convert_pitch_subtoken_to_agnostic(pitch_subtoken: str) -> str:
-            if clef is None:
-                raise ValueError("Clef must be provided to convert pitch subtoken to an agnostic pitch representation.")
-
-            pitch_importer = PitchImporterFactory.create('kern')
-            agnostic_pitch: AgnosticPitch = pitch_importer.import_pitch(pitch_subtoken)
-            return pitch_to_gkern_string(agnostic_pitch, clef)  # Reading clef as a major scope variable
-
-
         return token.export(
-            filter_categories=lambda cat: cat in self.token_categories,
-            convert_pitch_to_agnostic=callback_convert_pitch_subtoken_to_agnostic,
+            filter_categories=self._category_filter,
+            convert_pitch_to_agnostic=self._convert_pitch_subtoken_to_agnostic,
         )
 
 
@@ -302,6 +303,7 @@ class AKernTokenizer(Tokenizer):
         """
         super().__init__(token_categories=token_categories)
         self.last_clef = last_clef
+        self._aekern_tokenizer = AEKernTokenizer(token_categories=token_categories, last_clef=last_clef)
 
     def tokenize(self, token: Token) -> str:
         """
@@ -311,10 +313,7 @@ class AKernTokenizer(Tokenizer):
 
         Returns (str): **akern string representation.
         """
-        return ((AEKernTokenizer(
-            token_categories=self.token_categories,
-            last_clef=self.last_clef)
-        ).tokenize(token)
+        return (self._aekern_tokenizer.tokenize(token)
                 .replace(TOKEN_SEPARATOR, '')
                 .replace(DECORATION_SEPARATOR, ''))
 
@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from enum import Enum, auto
 import copy
-from typing import List, Dict, Set, Union, Optional
+from typing import Iterable, List, Dict, Set, Union, Optional
 from unittest import result
 
 TOKEN_SEPARATOR = '@'
@@ -226,6 +226,58 @@ class TokenCategory(Enum):
         """
         return TokenCategoryHierarchyMapper.match(category=target, include=include, exclude=exclude)
 
+    @property
+    def bit(self) -> int:
+        """
+        The bit of the category in the masks of `TokenCategory.mask` and `TokenCategory.valid_mask`.
+
+        Returns (int): An integer with only the bit of the category set.
+        """
+        return 1 << self._value_
+
+    @classmethod
+    def mask(cls, categories: Optional[Iterable[TokenCategory]]) -> int:
+        """
+        Compile some categories to a bitmask. Only the given categories are set, not their children: \
+        use `valid_mask` to include the children.
+
+        Args:
+            categories (Optional[Iterable[TokenCategory]]): The categories. If None, all categories are set.
+
+        Returns (int): The bitmask. `category.bit & mask` is not 0 if the category is one of the given ones.
+
+        Examples:
+            >>> mask = TokenCategory.mask([TokenCategory.NOTE_REST, TokenCategory.BARLINES])
+            >>> bool(TokenCategory.NOTE_REST.bit & mask), bool(TokenCategory.NOTE.bit & mask)
+            (True, False)
+        """
+        if categories is None:
+            return TokenCategoryHierarchyMapper.valid_mask()
+        mask = 0
+        for category in categories:
+            mask |= category.bit
+        return mask
+
+    @classmethod
+    def valid_mask(cls, *, include: Optional[Set[TokenCategory]] = None, exclude: Optional[Set[TokenCategory]] = None) -> int:
+        """
+        Get the bitmask of the valid categories based on the include and exclude sets, like `valid`.
+
+        Args:
+            include (Optional[Set[TokenCategory]]): The set of categories to include. Defaults to None. \
+                If None, all categories are included.
+            exclude (Optional[Set[TokenCategory]]): The set of categories to exclude. Defaults to None. \
+                If None, no categories are excluded.
+
+        Returns (int): The bitmask of the valid categories.
+
+        Examples:
+            >>> mask = TokenCategory.valid_mask(include={TokenCategory.CORE}, exclude={TokenCategory.REST})
+            >>> bool(TokenCategory.NOTE.bit & mask), bool(TokenCategory.REST.bit & mask)
+            (True, False)
+        """
+        return TokenCategoryHierarchyMapper.valid_mask(include=include, exclude=exclude)
+
     def __str__(self):
         """
         Get the string representation of the category.
@@ -258,6 +310,9 @@ class TokenCategoryHierarchyMapper:
     Mapping of the TokenCategory hierarchy.
 
     This class is used to define the hierarchy of the TokenCategory. Useful related methods are provided.
+
+    The hierarchy is compiled once to bitmasks (see `TokenCategory.bit`): the subtree, the ancestors and the direct \
+    children of every category. The methods are bit operations on these masks.
     """
     """
     The hierarchy of the TokenCategory is a recursive dictionary that defines the parent-child relationships \
@@ -311,38 +366,52 @@ class TokenCategoryHierarchyMapper:
         TokenCategory.ROOT: {},
     }
 
+    _subtree_masks: Dict[TokenCategory, int] = {}  # the category and its descendants
+    _ancestor_masks: Dict[TokenCategory, int] = {}  # the category and its ancestors
+    _children_masks: Dict[TokenCategory, int] = {}  # the direct children of the category
+    _bits: Dict[TokenCategory, int] = {}
+    _leaves_mask = 0
+    _all_mask = 0
+    _categories_by_mask: Dict[int, frozenset] = {}
+
     @classmethod
-    def _is_child(cls, parent: TokenCategory, child: TokenCategory, *, tree: '_hierarchy_typing') -> bool:
+    def _compile(cls, tree: '_hierarchy_typing', ancestors_mask: int = 0) -> int:
         """
-        Recursively check if `child` is in the subtree of `parent`.
+        Compile the masks of the categories of a subtree of the hierarchy.
 
         Args:
-            parent (TokenCategory): The parent category.
-            child (TokenCategory): The category to check.
-            tree (_hierarchy_typing): The subtree to check.
+            tree (_hierarchy_typing): The subtree.
+            ancestors_mask (int): The mask of the ancestors of the categories of the subtree.
+
+        Returns (int): The mask of all the categories of the subtree.
+        """
+        tree_mask = 0
+        for category, children in tree.items():
+            bit = category.bit
+            cls._bits[category] = bit
+            cls._ancestor_masks[category] = ancestors_mask | bit
+            cls._children_masks[category] = TokenCategory.mask(children.keys())
+            cls._subtree_masks[category] = bit | cls._compile(children, ancestors_mask | bit)
+            if not children:
+                cls._leaves_mask |= bit
+            tree_mask |= cls._subtree_masks[category]
+        return tree_mask
 
-        Returns:
-            bool: True if `child` is a descendant of `parent`, False otherwise.
+    @classmethod
+    def _categories(cls, mask: int) -> Set[TokenCategory]:
         """
-        # Base case: the parent is empty.
-        if len(tree.keys()) == 0:
-            return False
-
-        # Recursive case: explore the direct children of the parent.
-        return any(
-            direct_child == child or cls._is_child(direct_child, child, tree=tree[parent])
-            for direct_child in tree.get(parent, {})
-        )
-        # Vectorized version of the following code:
-        #direct_children = tree.get(parent, dict())
-        #for direct_child in direct_children.keys():
-        #    if direct_child == child or cls._is_child(direct_child, child, tree=tree[parent]):
-        #        return True
+        Get the categories of a mask.
+        """
+        categories = cls._categories_by_mask.get(mask)
+        if categories is None:
+            categories = frozenset(category for category, bit in cls._bits.items() if mask & bit)
+            cls._categories_by_mask[mask] = categories
+        return set(categories)
 
     @classmethod
     def is_child(cls, parent: TokenCategory, child: TokenCategory) -> bool:
         """
-        Recursively check if `child` is in the subtree of `parent`. If `parent` is the same as `child`, return True.
+        Check if `child` is in the subtree of `parent`. If `parent` is the same as `child`, return True.
 
         Args:
             parent (TokenCategory): The parent category.
@@ -353,7 +422,7 @@ class TokenCategoryHierarchyMapper:
         """
         if parent == child:
             return True
-        return cls._is_child(parent, child, tree=cls.hierarchy)
+        return bool(cls._subtree_masks.get(parent, 0) & cls._bits.get(child, 0))
 
     @classmethod
     def children(cls, parent: TokenCategory) -> Set[TokenCategory]:
@@ -366,31 +435,20 @@ class TokenCategoryHierarchyMapper:
         Returns:
             Set[TokenCategory]: The list of children categories of the parent category.
         """
-        return set(cls.hierarchy.get(parent, {}).keys())
+        return cls._categories(cls._children_masks.get(parent, 0))
 
     @classmethod
-    def _nodes(cls, tree: _hierarchy_typing) -> Set[TokenCategory]:
-        """
-        Recursively get all nodes in the given hierarchy tree.
+    def ancestors(cls, target: TokenCategory) -> Set[TokenCategory]:
         """
-        nodes = set(tree.keys())
-        for child in tree.values():
-            nodes.update(cls._nodes(child))
-        return nodes
+        Get the ancestors of the target category, from its parent to the root of the hierarchy.
 
-    @classmethod
-    def _find_subtree(cls, tree: '_hierarchy_typing', parent: TokenCategory) -> Optional['_hierarchy_typing']:
-        """
-        Recursively find the subtree for the given parent category.
-        """
-        if parent in tree:
-            return tree[parent]  # Return subtree if parent is found at this level
-        for child, sub_tree in tree.items():
-            result = cls._find_subtree(sub_tree, parent)
-            if result is not None:
-                return result
-        return None  # Return None if parent is not found. It won't happer never
+        Args:
+            target (TokenCategory): The target category.
 
+        Returns:
+            Set[TokenCategory]: The ancestors of the target category, without the target category.
+        """
+        return cls._categories(cls._ancestor_masks.get(target, 0) & ~cls._bits.get(target, 0))
 
     @classmethod
     def nodes(cls, parent: TokenCategory) -> Set[TokenCategory]:
@@ -403,8 +461,7 @@ class TokenCategoryHierarchyMapper:
         Returns:
             List[TokenCategory]: The list of nodes of the subtree of the parent category.
         """
-        subtree = cls._find_subtree(cls.hierarchy, parent)
-        return cls._nodes(subtree) if subtree is not None else set()
+        return cls._categories(cls._subtree_masks.get(parent, 0) & ~cls._bits.get(parent, 0))
 
     @classmethod
     def valid(cls,
@@ -421,24 +478,34 @@ class TokenCategoryHierarchyMapper:
 
         Returns (Set[TokenCategory]): The list of valid categories based on the include and exclude sets.
         """
-        include = cls._validate_include(include)
-        exclude = cls._validate_exclude(exclude)
-
-        included_nodes = set.union(*[(cls.nodes(cat) | {cat}) for cat in include]) if len(include) > 0 else include
-        excluded_nodes = set.union(*[(cls.nodes(cat) | {cat}) for cat in exclude]) if len(exclude) > 0 else exclude
-        return included_nodes - excluded_nodes
+        return cls._categories(cls.valid_mask(include=include, exclude=exclude))
 
     @classmethod
-    def _leaves(cls, tree: '_hierarchy_typing') -> Set[TokenCategory]:
+    def valid_mask(cls,
+                   include: Optional[Set[TokenCategory]] = None,
+                   exclude: Optional[Set[TokenCategory]] = None) -> int:
         """
-        Recursively get all leaves (nodes without children) in the hierarchy tree.
+        Get the bitmask of the valid categories based on the include and exclude sets.
+
+        Args:
+            include (Optional[Set[TokenCategory]]): The set of categories to include. Defaults to None. \
+                If None, all categories are included.
+            exclude (Optional[Set[TokenCategory]]): The set of categories to exclude. Defaults to None. \
+                If None, no categories are excluded.
+
+        Returns (int): The bitmask of the valid categories.
         """
-        if not tree:
-            return set()
-        leaves = {node for node, children in tree.items() if not children}
-        for node, children in tree.items():
-            leaves.update(cls._leaves(children))
-        return leaves
+        if include is None:
+            included_mask = cls._all_mask
+        else:
+            included_mask = 0
+            for category in cls._validate_include(include):
+                included_mask |= cls._subtree_masks.get(category, category.bit)
+        excluded_mask = 0
+        if exclude is not None:
+            for category in cls._validate_exclude(exclude):
+                excluded_mask |= cls._subtree_masks.get(category, category.bit)
+        return included_mask & ~excluded_mask
 
     @classmethod
     def leaves(cls, target: TokenCategory) -> Set[TokenCategory]:
@@ -450,9 +517,7 @@ class TokenCategoryHierarchyMapper:
 
         Returns (List[TokenCategory]): The list of leaf categories of the target category.
         """
-        tree = cls._find_subtree(cls.hierarchy, target)
-        return cls._leaves(tree)
-
+        return cls._categories(cls._subtree_masks.get(target, 0) & cls._leaves_mask & ~cls._bits.get(target, 0))
 
     @classmethod
     def _match(cls, category: TokenCategory, *,
@@ -462,12 +527,10 @@ class TokenCategoryHierarchyMapper:
         Check if a category matches include/exclude criteria.
         """
         # Include the category itself along with its descendants.
-        target_nodes = cls.nodes(category) | {category}
-
-        valid_categories = cls.valid(include=include, exclude=exclude)
+        target_mask = cls._subtree_masks.get(category, category.bit)
 
         # Check if any node in the target set is in the valid categories.
-        return len(target_nodes & valid_categories) > 0
+        return bool(target_mask & cls.valid_mask(include=include, exclude=exclude))
 
     @classmethod
     def _validate_include(cls, include: Optional[Set[TokenCategory]]) -> Set[TokenCategory]:
@@ -543,7 +606,7 @@ class TokenCategoryHierarchyMapper:
         Returns:
             Set[TokenCategory]: The set of all categories in the hierarchy.
         """
-        return cls._nodes(cls.hierarchy)
+        return cls._categories(cls._all_mask)
 
     @classmethod
     def tree(cls) -> str:
@@ -594,6 +657,9 @@ class TokenCategoryHierarchyMapper:
         return "\n".join(lines)
 
 
+TokenCategoryHierarchyMapper._all_mask = TokenCategoryHierarchyMapper._compile(TokenCategoryHierarchyMapper.hierarchy)
+
+
 class PitchRest:
     """
     Represents a name or a rest in a note.
@@ -1319,7 +1385,77 @@ class DurationClassical(Duration):
             return False
 
 
-class Subtoken:
+class FreezableMixin:
+    """
+    Mixin of the objects that can be made immutable to be shared, like the tokens interned by `TokenPool`.
+
+    Setting or deleting an attribute of a frozen object raises AttributeError, and its lists (e.g. the subtokens \
+    of a token) become tuples. Copies of a frozen object (copy.copy, copy.deepcopy or pickle) are not frozen: \
+    they get their own lists.
+    """
+    _FROZEN_ATTRIBUTE = '_frozen'
+    _FROZEN_LISTS_ATTRIBUTE = '_frozen_lists'
+
+    def freeze(self):
+        """
+        Make the object immutable, together with the subtokens and tokens it contains.
+
+        Returns: The object itself.
+        """
+        if self.__dict__.get(self._FROZEN_ATTRIBUTE, False):
+            return self
+        frozen_lists = []
+        for name, value in list(vars(self).items()):
+            values = value if isinstance(value, (list, tuple)) else (value,)
+            for item in values:
+                if isinstance(item, FreezableMixin):
+                    item.freeze()
+            if isinstance(value, list):
+                self.__dict__[name] = tuple(value)
+                frozen_lists.append(name)
+        self.__dict__[self._FROZEN_LISTS_ATTRIBUTE] = tuple(frozen_lists)
+        self.__dict__[self._FROZEN_ATTRIBUTE] = True
+        return self
+
+    def unfrozen_copy(self):
+        """
+        Create a copy that is not frozen, like copy.copy, faster. The lists of the object are copied, so they can be \
+        changed; their items (e.g. the subtokens of a token) are shared, and they stay frozen.
+
+        Returns: The copy.
+        """
+        result = object.__new__(self.__class__)
+        result.__dict__.update(self.__getstate__())
+        return result
+
+    @property
+    def is_frozen(self) -> bool:
+        """
+        Whether the object is immutable.
+        """
+        return self.__dict__.get(self._FROZEN_ATTRIBUTE, False)
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get(self._FROZEN_ATTRIBUTE, False):
+            raise AttributeError(f"Cannot set the attribute '{name}' of the frozen {type(self).__name__} "
+                                 f"'{self.encoding}': it is shared. Modify a copy instead (copy.copy).")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self.__dict__.get(self._FROZEN_ATTRIBUTE, False):
+            raise AttributeError(f"Cannot delete the attribute '{name}' of the frozen {type(self).__name__} "
+                                 f"'{self.encoding}': it is shared. Modify a copy instead (copy.copy).")
+        super().__delattr__(name)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop(self._FROZEN_ATTRIBUTE, None)
+        for name in state.pop(self._FROZEN_LISTS_ATTRIBUTE, ()):
+            state[name] = list(state[name])
+        return state
+
+
+class Subtoken(FreezableMixin):
     """
     Subtoken class. Thhe subtokens are the smallest units of categories. ComplexToken objects are composed of subtokens.
 
@@ -1380,7 +1516,7 @@ class Subtoken:
         """
         return hash((self.encoding, self.category))
 
-class AbstractToken(ABC):
+class AbstractToken(FreezableMixin, ABC):
     """
     An abstract base class representing a token.
 
@@ -1795,7 +1931,7 @@ class CompoundToken(ComplexToken):
         return TOKEN_SEPARATOR.join(parts) if len(parts) > 0 else EMPTY_TOKEN
 
     def __eq__(self, other):
-        return super().__eq__(other) and self.subtokens == other.subtokens
+        return super().__eq__(other) and list(self.subtokens) == list(other.subtokens)
 
 
 class NoteRestToken(ComplexToken):
@@ -1919,8 +2055,8 @@ class NoteRestToken(ComplexToken):
 
     def __eq__(self, other):
         return super().__eq__(other) and \
-            self.pitch_duration_subtokens == other.pitch_duration_subtokens and \
-            self.decoration_subtokens == other.decoration_subtokens
+            list(self.pitch_duration_subtokens) == list(other.pitch_duration_subtokens) and \
+            list(self.decoration_subtokens) == list(other.decoration_subtokens)
 
 
 class ChordToken(SimpleToken):
@@ -1957,7 +2093,7 @@ class ChordToken(SimpleToken):
         return result
 
     def __eq__(self, other):
-        return super().__eq__(other) and self.notes_tokens == other.notes_tokens
+        return super().__eq__(other) and list(self.notes_tokens) == list(other.notes_tokens)
 
 
 class BoundingBox:
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Union
+
+from kernpy.core._io import _open_for_writing
+
+if TYPE_CHECKING:
+    from kernpy.core.document import Document
+    from kernpy.core.exporter import ExportOptions
+
+
+__all__ = ['Vocabulary']
+
+
+class Vocabulary:
+    """
+    Vocabulary of the exported tokens, for machine learning models.
+
+    Maps every exported cell (e.g. '4c', '*clefG2', '=') to an integer id. The ids 0, 1 and 2 are reserved for \
+    `UNKNOWN`, `COLUMN_SEPARATOR` and `ROW_SEPARATOR`; the other tokens get consecutive ids in the order they are \
+    added. Use `fit` to add the tokens of a corpus, document by document, and `Exporter.export_ids` to convert \
+    documents to ids.
+
+    Examples:
+        >>> import kernpy as kp
+        >>> options = kp.ExportOptions(kern_type=kp.Encoding.eKern)
+        >>> vocabulary = kp.Vocabulary()
+        >>> for path in paths:
+        ...     document, _ = kp.load(path)
+        ...     vocabulary.fit(document, options)
+        >>> vocabulary.save('vocabulary.json')
+        >>> vocabulary = kp.Vocabulary.load('vocabulary.json')
+        >>> ids = kp.Exporter().export_ids(document, options, vocabulary)
+    """
+
+    UNKNOWN = '<unk>'
+    COLUMN_SEPARATOR = '<t>'
+    ROW_SEPARATOR = '<n>'
+    SPECIAL_TOKENS = (UNKNOWN, COLUMN_SEPARATOR, ROW_SEPARATOR)
+
+    unknown_id = 0
+    column_separator_id = 1
+    row_separator_id = 2
+
+    def __init__(self, tokens: Optional[Iterable[str]] = None):
+        """
+        Create a vocabulary.
+
+        Args:
+            tokens (Optional[Iterable[str]]): The tokens to add, in order, after the special tokens.
+        """
+        self._tokens: List[str] = list(self.SPECIAL_TOKENS)
+        self._ids: Dict[str, int] = {token: token_id for token_id, token in enumerate(self._tokens)}
+        if tokens is not None:
+            for token in tokens:
+                self.add(token)
+
+    def add(self, token: str) -> int:
+        """
+        Add a token to the vocabulary.
+
+        Args:
+            token (str): The token.
+
+        Returns (int): The id of the token. The id it already had if it was in the vocabulary.
+        """
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self._tokens)
+            self._tokens.append(token)
+        return token_id
+
+    def get_id(self, token: str) -> int:
+        """
+        Get the id of a token.
+
+        Args:
+            token (str): The token.
+
+        Returns (int): The id of the token, or `unknown_id` if it is not in the vocabulary.
+        """
+        return self._ids.get(token, self.unknown_id)
+
+    def get_token(self, token_id: int) -> str:
+        """
+        Get the token of an id.
+
+        Args:
+            token_id (int): The id.
+
+        Returns (str): The token.
+
+        Raises:
+            ValueError: If the id is not in the vocabulary.
+        """
+        if not 0 <= token_id < len(self._tokens):
+            raise ValueError(f'Id {token_id} is not in the vocabulary of {len(self._tokens)} tokens.')
+        return self._tokens[token_id]
+
+    @property
+    def tokens(self) -> List[str]:
+        """
+        The tokens of the vocabulary, in id order, including the special tokens.
+        """
+        return list(self._tokens)
+
+    def id_getter(self, unknown: str = 'map') -> Callable[[str], int]:
+        """
+        Get the function that converts the tokens to ids. Used by `Exporter.export_ids`.
+
+        Args:
+            unknown (str): What to do with the tokens that are not in the vocabulary. 'map' to return `unknown_id`, \
+                'add' to add them to the vocabulary, 'raise' to raise a ValueError.
+
+        Returns (Callable[[str], int]): The function.
+
+        Raises:
+            ValueError: If `unknown` is not 'map', 'add' or 'raise'.
+        """
+        if unknown == 'map':
+            ids = self._ids
+            unknown_id = self.unknown_id
+            return lambda token: ids.get(token, unknown_id)
+        if unknown == 'add':
+            return self.add
+        if unknown == 'raise':
+            return self._get_id_or_raise
+        raise ValueError(f"Invalid value for unknown: {unknown!r}. Expected 'map', 'add' or 'raise'.")
+
+    def _get_id_or_raise(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            raise ValueError(f'Token {token!r} is not in the vocabulary.')
+        return token_id
+
+    def fit(self, document: Document, options: Optional[ExportOptions] = None) -> Vocabulary:
+        """
+        Add the exported tokens of a document to the vocabulary.
+
+        Call it once per document of the corpus, with the options that will be used by `Exporter.export_ids`.
+
+        Args:
+            document (Document): The document. It can also be a `MeasureView` or a `ColumnarDocument`.
+            options (Optional[ExportOptions]): The export options, or an `ExportPlan` of the document. \
+                The default `ExportOptions` if None.
+
+        Returns (Vocabulary): The vocabulary itself.
+        """
+        from kernpy.core.exporter import Exporter, ExportOptions
+
+        Exporter().export_ids(document, options if options is not None else ExportOptions(), self, unknown='add')
+        return self
+
+    def merge(self, other: Vocabulary) -> Vocabulary:
+        """
+        Merge two vocabularies.
+
+        Args:
+            other (Vocabulary): The other vocabulary.
+
+        Returns (Vocabulary): A new vocabulary with the tokens of this vocabulary, with the same ids, followed by \
+            the tokens of `other` that are not in this vocabulary.
+        """
+        return Vocabulary(self._tokens[len(self.SPECIAL_TOKENS):] + other._tokens[len(self.SPECIAL_TOKENS):])
+
+    def decode(self, ids: Iterable[int]) -> str:
+        """
+        Convert ids to the exported text.
+
+        Args:
+            ids (Iterable[int]): The ids, e.g. the result of `Exporter.export_ids`.
+
+        Returns (str): The text. The separators are converted to tabs and newlines.
+
+        Raises:
+            ValueError: If an id is not in the vocabulary.
+        """
+        tokens = list(self._tokens)
+        tokens[self.column_separator_id] = '\t'
+        tokens[self.row_separator_id] = '\n'
+        try:
+            return ''.join([tokens[token_id] if token_id >= 0 else self.get_token(token_id) for token_id in ids])
+        except IndexError:
+            raise ValueError(f'The ids are not in the vocabulary of {len(self._tokens)} tokens.')
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Store the vocabulary in a JSON file.
+
+        Args:
+            path (Union[str, Path]): Path to the file.
+
+        Returns: None
+        """
+        with _open_for_writing(path) as f:
+            json.dump({'tokens': self._tokens}, f, ensure_ascii=False, indent=0)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Vocabulary:
+        """
+        Load a vocabulary stored with `save`.
+
+        Args:
+            path (Union[str, Path]): Path to the file.
+
+        Returns (Vocabulary): The vocabulary, with the same ids.
+
+        Raises:
+            ValueError: If the file is not a vocabulary.
+        """
+        with open(path, 'r') as f:
+            content = json.load(f)
+
+        tokens = content.get('tokens') if isinstance(content, dict) else None
+        if not isinstance(tokens, list) or tuple(tokens[:len(cls.SPECIAL_TOKENS)]) != cls.SPECIAL_TOKENS \
+                or len(set(tokens)) != len(tokens):
+            raise ValueError(f'{path} is not a vocabulary.')
+        return cls(tokens[len(cls.SPECIAL_TOKENS):])
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._ids
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vocabulary):
+            return False
+        return self._tokens == other._tokens
+
+    def __repr__(self) -> str:
+        return f'Vocabulary({len(self._tokens)} tokens)'
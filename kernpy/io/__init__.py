@@ -2,6 +2,10 @@ from .public import *
 
 __all__ = [
     'load',
+    'load_many',
+    'iter_measures',
+    'iter_fragments',
+    'generate_fragments',
     'loads',
     'dump',
     'dumps',
@@ -6,7 +6,7 @@ The main functions for handling the input and output of **kern files are provide
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional, Any, Union, Tuple, Sequence
+from typing import List, Optional, Any, Union, Tuple, Sequence, Iterable, Iterator, TextIO
 
 from kernpy import Encoding
 from kernpy.core import (
@@ -23,6 +23,7 @@ def load(
     raise_on_errors: Optional[bool] = False,
     raise_on_duration_mismatch: bool = False,
     meter_signature_fallback_if_not_found: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
     **kwargs,
 ) -> (Document, List[str]):
     """
@@ -36,6 +37,9 @@ def load(
             signature and raise a ValueError on mismatch.
         meter_signature_fallback_if_not_found (Optional[str]): Fallback meter signature encoding (for example '*M4/4')
             used when no time signature token is available for a measure.
+        cache_dir (Optional[Union[str, Path]]): Directory of the parsed documents cache. When it is set, the \
+            document is restored from the cache if the bytes of the file have not changed since it was stored, \
+            skipping the parser. Otherwise, the file is parsed and stored in the cache. When None, no cache is used.
 
     Returns ((Document, List[str])): A tuple containing the Document object and a list of messages representing \
         grammar errors detected during parsing. If the list is empty,\
@@ -56,11 +60,248 @@ def load(
         >>>     print(document)
         <kernpy.core.document.Document object at 0x7f8b3b7b3d90>
     """
+    cache_options = {} if cache_dir is None else {'cache_dir': cache_dir}
     return generic.Generic.read(
         path=fp,
         strict=raise_on_errors,
         error_on_duration_mismatch=raise_on_duration_mismatch,
         meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+        **cache_options,
+    )
+
+
+def load_many(
+    paths: Iterable[Union[str, Path]],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    raise_on_duration_mismatch: bool = False,
+    meter_signature_fallback_if_not_found: Optional[str] = None,
+) -> Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]:
+    """
+    Load many Humdrum **kern files in parallel using a pool of processes.
+
+    Every worker process is started once, with the parser already loaded and warmed up. The results are streamed \
+    back as soon as they are available. A file that cannot be loaded does not stop the others: its document is None \
+    and its errors contain the exception message.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The paths of the **kern files.
+        workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+            When 1, the files are loaded in the current process.
+        chunksize (int): Number of files sent to a worker at once. Use larger values for many small files.
+        ordered (bool): If True, the results are yielded in the same order as the paths. Otherwise, they are \
+            yielded as soon as every chunk is loaded.
+        raise_on_duration_mismatch (bool): If True, validate per-measure rhythmic duration against the active meter
+            signature. The first mismatch fails the file: its document is None and its errors contain the \
+            ValueError message.
+        meter_signature_fallback_if_not_found (Optional[str]): Fallback meter signature encoding (for example '*M4/4')
+            used when no time signature token is available for a measure.
+
+    Returns (Iterator[Tuple[Union[str, Path], Optional[Document], List[str]]]): An iterator of tuples \
+        (path, document, errors), where errors is the list of messages of the grammar errors detected during parsing.
+
+    Examples:
+        >>> import kernpy as kp
+        >>> for path, document, errors in kp.load_many(['score_1.krn', 'score_2.krn'], workers=8, chunksize=16):
+        ...     if document is None:
+        ...         print(f"{path} could not be loaded: {errors}")
+        ...     else:
+        ...         print(path, document.measures_count())
+        score_1.krn 24
+        score_2.krn 31
+    """
+    return generic.Generic.read_many(
+        paths=paths,
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        error_on_duration_mismatch=raise_on_duration_mismatch,
+        meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+    )
+
+
+def iter_measures(
+    fp: Union[str, Path, Any],
+    *,
+    window: int = 1,
+    raise_on_duration_mismatch: bool = False,
+    meter_signature_fallback_if_not_found: Optional[str] = None,
+) -> Iterator[Tuple[int, int, Document]]:
+    """
+    Load a Humdrum **kern file as a stream of fragments of `window` measures.
+
+    The fragments are yielded as soon as they are parsed, and only the rows of the current fragment are kept in \
+    memory, so the memory does not grow with the length of the score. Every fragment is a self-contained Document: \
+    it starts with the header, the spine layout (splits) and the signatures (clef, key signature, key and meter) \
+    active at its first measure.
+
+    Args:
+        fp (Union[str, Path, Any]): The path of the **kern file, or a text file-like object opened with newline=''.
+        window (int): Number of measures of every fragment. The last fragment may have fewer measures.
+        raise_on_duration_mismatch (bool): If True, validate per-measure rhythmic duration against the active meter
+            signature and raise ValueError on mismatch.
+        meter_signature_fallback_if_not_found (Optional[str]): Fallback meter signature encoding (for example '*M4/4')
+            used when no time signature token is available for a measure.
+
+    Returns (Iterator[Tuple[int, int, Document]]): An iterator of tuples (from_measure, to_measure, document). \
+        The measures are numbered from 1.
+
+    Raises:
+        ValueError: If the window is not a positive integer, or a fragment could not be parsed.
+
+    Examples:
+        >>> import kernpy as kp
+        >>> for from_measure, to_measure, document in kp.iter_measures('long_score.krn', window=8):
+        ...     print(from_measure, to_measure, len(document.get_all_tokens()))
+        1 8 224
+        9 16 231
+    """
+    return generic.Generic.iter_measures(
+        path=fp,
+        window=window,
+        error_on_duration_mismatch=raise_on_duration_mismatch,
+        meter_signature_fallback_if_not_found=meter_signature_fallback_if_not_found,
+    )
+
+
+def iter_fragments(
+    document: Document,
+    *,
+    window: int,
+    stride: int = 1,
+    spine_types: [str] = None,
+    include: [TokenCategory] = None,
+    exclude: [TokenCategory] = None,
+    encoding: Encoding = None,
+    instruments: [str] = None,
+    spine_ids: [int] = None,
+) -> Iterator[Tuple[int, int, str]]:
+    """
+    Export all the fragments of `window` measures of a Document, starting every `stride` measures.
+
+    The fragments are exported in one pass over the document. Every fragment is self-contained: it starts with the \
+    headers, the spine layout and the signatures active at its first measure, it includes the barlines that open \
+    and close its measures, and it ends with the spine terminators.
+
+    Args:
+        document (Document): The Document object to export.
+        window (int): Number of measures of every fragment.
+        stride (int): Number of measures between the first measures of two consecutive fragments.
+        spine_types (Iterable): **kern, **mens, etc...
+        include (Iterable): The token categories to include in the fragments. When None, all the token categories will be exported.
+        exclude (Iterable): The token categories to exclude from the fragments. When None, no token categories will be excluded.
+        encoding (Encoding): The type of the **kern fragments.
+        instruments (Iterable): The instruments to export. If None, all the instruments will be exported.
+        spine_ids (Iterable): The ids of the spines to export. When None, all the spines will be exported.
+
+    Returns (Iterator[Tuple[int, int, str]]): An iterator of tuples (from_measure, to_measure, content). \
+        The measures are numbered from 1. A document with fewer than `window` measures has no fragments.
+
+    Raises:
+        ValueError: If the window or the stride are not positive integers, or the fragments could not be exported.
+
+    Examples:
+        >>> import kernpy as kp
+        >>> document, _ = kp.load('score.krn')
+        >>> for from_measure, to_measure, content in kp.iter_fragments(document, window=4, stride=2):
+        ...     print(from_measure, to_measure)
+        1 4
+        3 6
+    """
+    options = generic.Generic.parse_options_to_ExportOptions(
+        spine_types=spine_types,
+        include=include,
+        exclude=exclude,
+        kern_type=encoding,
+        instruments=instruments,
+        spine_ids=spine_ids,
+    )
+    return generic.Generic.iter_fragments(
+        document=document,
+        options=options,
+        window=window,
+        stride=stride,
+    )
+
+
+def generate_fragments(
+    paths: Iterable[Union[str, Path]],
+    output_directory: Union[str, Path],
+    *,
+    window: int,
+    stride: int = 1,
+    extension: str = 'krn',
+    root: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    spine_types: [str] = None,
+    include: [TokenCategory] = None,
+    exclude: [TokenCategory] = None,
+    encoding: Encoding = None,
+    instruments: [str] = None,
+    spine_ids: [int] = None,
+) -> Iterator[Tuple[Union[str, Path], int, List[str]]]:
+    """
+    Export the fragments of many Humdrum **kern files in parallel using a pool of processes.
+
+    The fragments of every file are the ones of `iter_fragments`. They are written to \
+    `<output_directory>/<file stem>/from-<from_measure>-to-<to_measure>.<extension>`, or to \
+    `<output_directory>/<path relative to root, without extension>/...` when `root` is given. A file that cannot be \
+    exported does not stop the others: its errors contain the exception message.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The paths of the **kern files.
+        output_directory (Union[str, Path]): The directory of the fragments.
+        window (int): Number of measures of every fragment.
+        stride (int): Number of measures between the first measures of two consecutive fragments.
+        extension (str): The extension of the fragment files.
+        root (Optional[Union[str, Path]]): The directory of the files. When given, the directories of the \
+            fragments mirror the tree of the files under it, so files with the same name in different folders do \
+            not collide.
+        workers (Optional[int]): Number of worker processes. When None, the number of CPUs is used. \
+            When 1, the files are processed in the current process.
+        chunksize (int): Number of files sent to a worker at once. Use larger values for many small files.
+        spine_types (Iterable): **kern, **mens, etc...
+        include (Iterable): The token categories to include in the fragments. When None, all the token categories will be exported.
+        exclude (Iterable): The token categories to exclude from the fragments. When None, no token categories will be excluded.
+        encoding (Encoding): The type of the **kern fragments.
+        instruments (Iterable): The instruments to export. If None, all the instruments will be exported.
+        spine_ids (Iterable): The ids of the spines to export. When None, all the spines will be exported.
+
+    Returns (Iterator[Tuple[Union[str, Path], int, List[str]]]): An iterator of tuples \
+        (path, fragments count, errors), in the same order as the paths.
+
+    Raises:
+        ValueError: If the window, the stride, the workers or the chunksize are not positive integers, or if the \
+            fragments of two files would be written to the same directory (files with the same stem and no `root`).
+
+    Examples:
+        >>> import kernpy as kp
+        >>> for path, count, errors in kp.generate_fragments(['score_1.krn', 'score_2.krn'], 'fragments', window=4):
+        ...     print(path, count, errors)
+        score_1.krn 21 []
+        score_2.krn 28 []
+    """
+    options = generic.Generic.parse_options_to_ExportOptions(
+        spine_types=spine_types,
+        include=include,
+        exclude=exclude,
+        kern_type=encoding,
+        instruments=instruments,
+        spine_ids=spine_ids,
+    )
+    return generic.Generic.generate_fragments(
+        paths=paths,
+        output_directory=output_directory,
+        options=options,
+        window=window,
+        stride=stride,
+        extension=extension,
+        root=root,
+        workers=workers,
+        chunksize=chunksize,
     )
 
 
@@ -111,7 +352,7 @@ def loads(
     )
 
 
-def dump(document: Document, fp: Union[str, Path], *,
+def dump(document: Document, fp: Union[str, Path, TextIO], *,
          spine_types: [str] = None,
          include: [TokenCategory] = None,
          exclude: [TokenCategory] = None,
@@ -126,7 +367,8 @@ def dump(document: Document, fp: Union[str, Path], *,
 
     Args:
         document (Document): The Document object to write to the file.
-        fp (Union[str, Path]): The file path to write the Document object.
+        fp (Union[str, Path, TextIO]): The file path to write the Document object, or an open text stream. The rows \
+            are written while they are exported, so the whole exported content is never kept in memory.
         spine_types (Iterable): **kern, **mens, etc...
         include (Iterable): The token categories to include in the exported file. When None, all the token categories will be exported.
         exclude (Iterable): The token categories to exclude from the exported file. When None, no token categories will be excluded.
@@ -399,11 +641,8 @@ def is_monophonic(
         >>> kp.is_monophonic(document_b)
         False
     """
-    number_of_kern_spines = len(spine_types(document, headers=['**kern']))
-    number_of_chord_tokens = len(document.get_all_tokens(filter_by_categories=[TokenCategory.CHORD]))
-    there_is_any_note_rest_token = len(document.get_all_tokens(filter_by_categories=[TokenCategory.NOTE_REST])) > 0
-
-    return (number_of_kern_spines == 1
-            and number_of_chord_tokens == 0
-            and there_is_any_note_rest_token)
+    structure = document.structure
+    return (structure.count_spines('**kern') == 1
+            and not structure.has_chords
+            and structure.has_notes)
 
@@ -9,6 +9,8 @@ This module contains utility functions for the kernpy package.
 from .store_cache import *
 
 __all__ = [
-    'StoreCache'
+    'StoreCache',
+    'LRUStoreCache',
+    'CacheInfo',
 ]
 
@@ -1,3 +1,7 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+
 class StoreCache:
     """
     A simple cache that stores the result of a callback function
@@ -33,3 +37,89 @@ class StoreCache:
             self.memory[request] = result
             return result
 
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUStoreCache:
+    """
+    A bounded cache that stores the result of a callback function and discards the least recently used entries \
+    when it is full. It keeps track of the hits and misses.
+
+    It can be shared by several threads. The callback runs outside the lock, so it may run more than once for \
+    the same request when several threads miss it at the same time.
+    """
+    def __init__(self, maxsize: int = 4096):
+        """
+        Constructor
+
+        Args:
+            maxsize (int): Maximum number of entries stored. When a new entry is stored in a full cache, \
+                the least recently used one is removed.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer. Found {maxsize}")
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def request(self, callback, request):
+        """
+        Request a value from the cache. If the value is not in the cache, it will be calculated by the callback function
+        Args:
+            callback (function): The callback function that will be called to calculate the value
+            request (any): The request that will be passed to the callback function
+
+        Returns (any): The value that was requested
+
+        Examples:
+            >>> def add_five(x):
+            ...     return x + 5
+            >>> store_cache = LRUStoreCache(maxsize=2)
+            >>> store_cache.request(add_five, 5)  # Call the callback function
+            10
+            >>> store_cache.request(add_five, 5)  # Return the value from the cache, without calling the callback function
+            10
+            >>> store_cache.info()
+            CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+        """
+        with self._lock:
+            if request in self.memory:
+                self.hits += 1
+                self.memory.move_to_end(request)
+                return self.memory[request]
+            self.misses += 1
+
+        result = callback(request)
+        with self._lock:
+            self.memory[request] = result
+            if len(self.memory) > self.maxsize:
+                self.memory.popitem(last=False)
+        return result
+
+    def info(self) -> CacheInfo:
+        """
+        Get the statistics of the cache.
+
+        Returns (CacheInfo): A named tuple with the hits, misses, maxsize and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self.memory))
+
+    def clear(self):
+        """
+        Remove all the entries of the cache and reset its statistics.
+        """
+        with self._lock:
+            self.memory.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self.memory)
+
+    def __contains__(self, request):
+        return request in self.memory
@@ -0,0 +1,68 @@
+import unittest
+
+import kernpy as kp
+
+
+class ColumnarDocumentTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.document, _ = kp.load('test/resources/legacy/chor048.krn')
+        cls.columnar_document = kp.ColumnarDocument(cls.document)
+
+    @staticmethod
+    def summary(tokens):
+        return [(type(token).__name__, token.encoding, token.category) for token in tokens]
+
+    def test_is_a_document(self):
+        self.assertIsInstance(self.columnar_document, kp.Document)
+        self.assertEqual(self.document.measures_count(), self.columnar_document.measures_count())
+        self.assertEqual(self.document.get_spine_count(), self.columnar_document.get_spine_count())
+        self.assertEqual(kp.spine_types(self.document), kp.spine_types(self.columnar_document))
+
+    def test_tokens_are_interned(self):
+        self.assertEqual(sum(len(stage) for stage in self.document.tree.stages), len(self.columnar_document.token_ids))
+        self.assertLess(len(self.columnar_document.tokens), len(self.columnar_document.token_ids))
+
+    def test_queries_match_the_document(self):
+        for categories in [None, [kp.TokenCategory.CORE], [kp.TokenCategory.NOTE_REST],
+                           [kp.TokenCategory.SIGNATURES, kp.TokenCategory.BARLINES]]:
+            with self.subTest(categories=categories):
+                self.assertEqual(self.summary(self.document.get_all_tokens(categories)),
+                                 self.summary(self.columnar_document.get_all_tokens(categories)))
+                self.assertEqual(self.summary(self.document.get_unique_tokens(categories)),
+                                 self.summary(self.columnar_document.get_unique_tokens(categories)))
+                self.assertEqual(self.document.frequencies(categories), self.columnar_document.frequencies(categories))
+        self.assertEqual(self.document.get_metacomments(), self.columnar_document.get_metacomments())
+
+    def test_export_matches_the_document(self):
+        for options in [{}, {'include': {kp.TokenCategory.CORE}}, {'spine_types': ['**kern']},
+                        {'encoding': kp.Encoding.eKern}, {'from_measure': 2, 'to_measure': 3}]:
+            with self.subTest(options=options):
+                self.assertEqual(kp.dumps(self.document, **options), kp.dumps(self.columnar_document, **options))
+
+    def test_to_document(self):
+        document = self.columnar_document.to_document()
+
+        self.assertNotIsInstance(document, kp.ColumnarDocument)
+        self.assertEqual(kp.dumps(self.document), kp.dumps(document))
+        tokens = document.get_all_tokens([kp.TokenCategory.NOTE_REST])
+        self.assertEqual(len(tokens), len({id(token) for token in tokens}))
+
+    def test_is_read_only(self):
+        columnar_document = kp.ColumnarDocument(self.document)
+        node = next(columnar_document.iter_nodes(categories=[kp.TokenCategory.NOTE_REST]))
+        expected = kp.dumps(columnar_document)
+
+        with self.assertRaises(ValueError):
+            columnar_document.replace_token(node, kp.KernSpineImporter().import_token('4ddd'))
+        with self.assertRaises(ValueError):
+            columnar_document.clone()
+        with self.assertRaises(ValueError):
+            columnar_document.add(self.document)
+        self.assertEqual(expected, kp.dumps(columnar_document))
+
+        # The operations that return a new document return a Document
+        for document in [columnar_document.to_transposed('P4'), *columnar_document.split(),
+                         kp.Document.to_concat(columnar_document, columnar_document)]:
+            self.assertNotIsInstance(document, kp.ColumnarDocument)
+        self.assertEqual(kp.dumps(self.document.to_transposed('P4')), kp.dumps(columnar_document.to_transposed('P4')))
@@ -1,10 +1,12 @@
 import os
 import unittest
+import unittest.mock
 import logging
 import sys
 from pathlib import Path
 from tempfile import TemporaryDirectory
 import json
+import pickle
 
 import kernpy as kp
 
@@ -213,3 +215,84 @@ class DocumentTestCase(unittest.TestCase):
         self.assertEqual(expected_content, real_content)
 
 
+
+    def test_pickle_document(self):
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(500)  # the tree must not be pickled recursively
+        try:
+            restored = pickle.loads(pickle.dumps(self.doc_piano))
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        self.assertEqual(kp.dumps(self.doc_piano), kp.dumps(restored))
+        self.assertEqual(self.doc_piano.measure_start_tree_stages, restored.measure_start_tree_stages)
+        self.assertEqual(len(self.doc_piano.tree.stages), len(restored.tree.stages))
+        self.assertIs(restored.tree.root, restored.tree.stages[0][0])
+        self.assertIsNot(self.doc_piano.tree.root, restored.tree.root)
+
+    def test_signature_nodes_are_shared_until_a_signature_changes(self):
+        doc, _ = kp.loads('**kern\n*clefG2\n4c\n4d\n*clefF4\n4e\n*-\n')
+        header, clef_g, c, d, clef_f, e, _ = [stage[0] for stage in doc.tree.stages[1:]]
+
+        self.assertIsNot(header.last_signature_nodes, clef_g.last_signature_nodes)
+        self.assertIs(clef_g.last_signature_nodes, c.last_signature_nodes)
+        self.assertIs(c.last_signature_nodes, d.last_signature_nodes)
+        self.assertIsNot(d.last_signature_nodes, clef_f.last_signature_nodes)
+        self.assertIs(clef_g, d.last_signature_nodes.nodes['ClefToken'])
+        self.assertIs(clef_f, e.last_signature_nodes.nodes['ClefToken'])
+        self.assertEqual({}, header.last_signature_nodes.nodes)
+
+    def test_nodes_have_slots(self):
+        node = self.doc_piano.tree.stages[5][0]
+        with self.assertRaises(AttributeError):
+            node.unknown_attribute = 1
+
+    def test_node_ids_are_allocated_per_tree(self):
+        doc, _ = kp.loads('**kern\t**kern\n4c\t4d\n*-\t*-\n')
+        other_doc, _ = kp.loads('**kern\t**kern\n4c\t4d\n*-\t*-\n')
+        nodes = [node for stage in doc.tree.stages for node in stage]
+        other_nodes = [node for stage in other_doc.tree.stages for node in stage]
+
+        self.assertEqual(list(range(len(nodes))), [node.id for node in nodes])
+        self.assertEqual([node.id for node in nodes], [node.id for node in other_nodes])
+        self.assertNotEqual(nodes[1], other_nodes[1])
+        self.assertEqual([node.id for node in nodes],
+                         [node.id for stage in pickle.loads(pickle.dumps(doc)).tree.stages for node in stage])
+
+    def test_structure_summarizes_the_spines(self):
+        content = ('**kern\t**kern\t**text\n*clefF4\t*clefG2\t*\n=1\t=1\t=1\n4C\t4c\tla\n4D\t4d 4f\tli\n'
+                   '=2\t=2\t=2\n2E\t2e\tlo\n*-\t*-\t*-\n')
+        doc, _ = kp.loads(content)
+
+        for document in (doc, kp.ColumnarDocument(doc)):
+            structure = document.structure
+            self.assertEqual(('**kern', '**kern', '**text'), structure.spine_types)
+            self.assertEqual(['**kern', '**kern', '**text'], [token.encoding for token in structure.header_tokens])
+            self.assertEqual((0, 1, 2), structure.spine_ids)
+            self.assertEqual((1,) + (3,) * 8, structure.spine_counts)
+            self.assertTrue(structure.has_notes)
+            self.assertTrue(structure.has_chords)
+            self.assertEqual(len(doc.measure_start_tree_stages), structure.measures_count)
+            self.assertEqual(2, structure.count_spines('**kern'))
+            self.assertIs(structure, document.structure)
+
+    def test_structure_queries_do_not_export_the_document(self):
+        with unittest.mock.patch.object(kp.Exporter, 'export_lines', side_effect=AssertionError('exported')):
+            self.assertEqual(['**kern', '**kern', '**kern', '**kern'], kp.spine_types(self.doc_organ_4_voices, ['**kern']))
+            self.assertFalse(kp.is_monophonic(self.doc_organ_4_voices))
+            self.assertTrue(kp.Document.match(self.doc_organ_4_voices, self.doc_organ_4_voices.clone()))
+
+    def test_structure_is_computed_again_when_the_document_changes(self):
+        doc, _ = kp.loads('**kern\n*clefG2\n=1\n4c\n4d\n*-\n')
+        structure = doc.structure
+        self.assertTrue(kp.is_monophonic(doc))
+
+        variant = doc.clone()
+        note_node = next(variant.iter_nodes(categories=[kp.TokenCategory.NOTE_REST]))
+        variant.replace_token(note_node, kp.KernSpineImporter().import_token('4d 4f'))
+        self.assertFalse(kp.is_monophonic(variant))
+        self.assertIs(structure, doc.structure)
+
+        doc.add(kp.loads('**kern\n*clefG2\n=2\n4e\n*-\n')[0])
+        self.assertIsNot(structure, doc.structure)
+        self.assertEqual(len(doc.measure_start_tree_stages), doc.structure.measures_count)
@@ -0,0 +1,96 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import kernpy as kp
+
+
+class BinaryDocumentFormatTestCase(unittest.TestCase):
+    paths = [
+        'test/resources/legacy/chor048.krn',
+        'test/resources/mozart/concerto-piano-12-allegro.krn',
+        'test/resources/polish/test1/pl-wn--mus-iii-118-771--003_badarzewska-tekla--mazurka-brillante.krn',
+    ]
+
+    def test_round_trip(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                document, errors = kp.load(path)
+                restored_document, restored_errors = kp.BinaryDocumentFormat.loads(
+                    kp.BinaryDocumentFormat.dumps(document, errors))
+
+                self.assertEqual(kp.dumps(document), kp.dumps(restored_document))
+                self.assertEqual(errors, restored_errors)
+                self.assertEqual(document.measure_start_tree_stages, restored_document.measure_start_tree_stages)
+                self.assertEqual(document.page_bounding_boxes.keys(), restored_document.page_bounding_boxes.keys())
+                self.assertEqual(document.header_stage, restored_document.header_stage)
+
+    def test_restored_tokens_are_independent(self):
+        document = kp.Importer(intern_tokens=False).import_string('**kern\n4c\n4c\n*-\n')
+        restored_document, _ = kp.BinaryDocumentFormat.loads(kp.BinaryDocumentFormat.dumps(document),
+                                                             intern_tokens=False)
+
+        first, second = restored_document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        self.assertEqual(first.encoding, second.encoding)
+        self.assertIsNot(first, second)
+        self.assertFalse(first.is_frozen)
+
+    def test_restored_tokens_are_shared_with_the_imported_ones(self):
+        document = kp.Importer(intern_tokens=True).import_string('**kern\n=1\n4c\n4c\n=2\n*-\n')
+        restored_document, _ = kp.BinaryDocumentFormat.loads(kp.BinaryDocumentFormat.dumps(document),
+                                                              intern_tokens=True)
+
+        notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        restored_notes = restored_document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        self.assertIs(notes[0], restored_notes[0])
+        self.assertIs(restored_notes[0], restored_notes[1])
+        self.assertEqual(kp.dumps(document), kp.dumps(restored_document))
+
+    def test_rejects_invalid_content(self):
+        with self.assertRaises(ValueError):
+            kp.BinaryDocumentFormat.loads(b'not a document')
+
+        content = kp.BinaryDocumentFormat.dumps(kp.loads('**kern\n4c\n*-\n')[0])
+        with self.assertRaises(ValueError):
+            kp.BinaryDocumentFormat.loads(kp.BinaryDocumentFormat.MAGIC + b'\xff\xff' + content[len(kp.BinaryDocumentFormat.MAGIC) + 2:])
+        with self.assertRaises(ValueError):
+            kp.BinaryDocumentFormat.loads(content[:-10])
+
+
+class DocumentCacheTestCase(unittest.TestCase):
+    path = 'test/resources/legacy/chor048.krn'
+
+    def test_load_with_cache_dir_skips_the_importer(self):
+        expected_document, expected_errors = kp.load(self.path)
+
+        with TemporaryDirectory() as cache_dir:
+            document, errors = kp.load(self.path, cache_dir=cache_dir)
+            self.assertEqual(kp.dumps(expected_document), kp.dumps(document))
+            self.assertEqual(1, len([name for name in os.listdir(cache_dir) if name.endswith(kp.DocumentCache.EXTENSION)]))
+
+            with patch.object(kp.Importer, 'import_file', side_effect=AssertionError('The importer must not run')):
+                document, errors = kp.load(self.path, cache_dir=cache_dir)
+
+            self.assertEqual(kp.dumps(expected_document), kp.dumps(document))
+            self.assertEqual(expected_errors, errors)
+
+    def test_key_depends_on_content_and_options(self):
+        cache = kp.DocumentCache('unused')
+        content = Path(self.path).read_bytes()
+
+        self.assertEqual(cache.key(content), cache.key(content))
+        self.assertNotEqual(cache.key(content), cache.key(content + b'\n'))
+        self.assertNotEqual(cache.key(content), cache.key(content, error_on_duration_mismatch=True))
+
+    def test_corrupted_entry_is_replaced(self):
+        with TemporaryDirectory() as cache_dir:
+            cache = kp.DocumentCache(cache_dir)
+            cache_path = Path(cache_dir) / (cache.key(Path(self.path).read_bytes()) + kp.DocumentCache.EXTENSION)
+            cache_path.write_bytes(b'corrupted')
+
+            document, _ = cache.load(self.path)
+
+            self.assertEqual(kp.dumps(kp.load(self.path)[0]), kp.dumps(document))
+            kp.BinaryDocumentFormat.loads(cache_path.read_bytes())
@@ -0,0 +1,81 @@
+import pickle
+import unittest
+
+import kernpy as kp
+from kernpy.core.document_cache import BinaryDocumentFormat
+
+
+class DocumentCloneTestCase(unittest.TestCase):
+    content = '**kern\t**text\n*clefG2\t*\n=1\t=1\n4c\tla\n4d\tle\n=2\t=2\n4e\tli\n*-\t*-\n'
+
+    def test_clones_share_the_tree(self):
+        document = kp.Importer().import_string(self.content)
+        clone = document.clone()
+
+        self.assertIs(document.tree, clone.tree)
+        self.assertEqual(kp.dumps(document), kp.dumps(clone))
+
+    def test_replaced_tokens_only_change_the_clone(self):
+        document = kp.Importer().import_string(self.content)
+        clone = document.clone()
+        node = document.tree.stages[4][0]
+
+        clone.replace_token(node, kp.KernSpineImporter().import_token('8g'))
+
+        self.assertEqual('4c', node.token.encoding)
+        self.assertEqual('4c', document.get_token(node).encoding)
+        self.assertEqual('8g', clone.get_token(node).encoding)
+        self.assertEqual(['8g', '4d', '4e'],
+                         kp.Document.tokens_to_encodings(clone.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+        self.assertEqual(['4c', '4d', '4e'],
+                         kp.Document.tokens_to_encodings(document.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+        self.assertIn('8g\tla', kp.dumps(clone))
+        self.assertNotIn('8g', kp.dumps(document))
+
+    def test_replaced_tokens_can_change_the_category(self):
+        document = kp.Importer().import_string(self.content)
+        clone = document.clone()
+        node = document.tree.stages[4][0]
+
+        clone.replace_token(node, kp.SimpleToken('4c', kp.TokenCategory.OTHER))
+
+        self.assertEqual(['4d', '4e'],
+                         kp.Document.tokens_to_encodings(clone.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+        self.assertEqual(['4c'], kp.Document.tokens_to_encodings(clone.get_all_tokens([kp.TokenCategory.OTHER])))
+        self.assertEqual(3, len(document.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+
+    def test_transposed_documents_share_the_untouched_nodes(self):
+        document = kp.Importer().import_string(self.content)
+        original = kp.dumps(document)
+
+        transposed = document.to_transposed('M2', 'up')
+
+        self.assertIs(document.tree, transposed.tree)
+        self.assertEqual(3, len(transposed._replaced_tokens))
+        self.assertIn('4d\tla\n4e\tle', kp.dumps(transposed))
+        self.assertEqual(original, kp.dumps(document))
+
+    def test_copies_keep_the_replaced_tokens(self):
+        document = kp.Importer().import_string(self.content)
+        transposed = document.to_transposed('M2', 'up')
+        expected = kp.dumps(transposed)
+
+        restored = pickle.loads(pickle.dumps(transposed))
+        self.assertIsNot(document.tree, restored.tree)
+        self.assertEqual({}, restored._replaced_tokens)
+        self.assertEqual(expected, kp.dumps(restored))
+        self.assertEqual(expected, kp.dumps(kp.ColumnarDocument(transposed)))
+        self.assertEqual(expected, kp.dumps(BinaryDocumentFormat.loads(BinaryDocumentFormat.dumps(transposed))[0]))
+
+    def test_replace_token_rejects_foreign_nodes(self):
+        document = kp.Importer().import_string(self.content)
+        other_document = kp.Importer().import_string(self.content)
+
+        with self.assertRaises(ValueError):
+            document.replace_token(other_document.tree.stages[4][0], kp.KernSpineImporter().import_token('4c'))
+        with self.assertRaises(ValueError):
+            document.replace_token(document.tree.root, kp.KernSpineImporter().import_token('4c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import itertools
+import unittest
+
+import kernpy as kp
+from kernpy.core.document import TokensTraversal
+
+
+class DocumentIterationTestCase(unittest.TestCase):
+    content = ('!!!COM: Anonymous\n**kern\t**text\n*Ipiano\t*\n*clefG2\t*\n=1\t=1\n*^\t*\n4c\t4e\tla\n'
+               '4d\t4f\tle\n*v\t*v\t*\n!! a comment\n=2\t=2\n4g\tli\n4g\tlo\n*-\t*-\n')
+
+    def test_dfs_order_is_the_order_of_get_all_tokens(self):
+        document = kp.Importer().import_string(self.content)
+
+        for categories in [None, [kp.TokenCategory.NOTE_REST], [kp.TokenCategory.CORE, kp.TokenCategory.BARLINES]]:
+            self.assertEqual(kp.Document.tokens_to_encodings(document.get_all_tokens(categories)),
+                             kp.Document.tokens_to_encodings(document.iter_tokens(categories=categories)))
+        self.assertEqual(['4c', '4d', '4g', '4e', '4f'], kp.Document.tokens_to_encodings(
+            document.iter_tokens(categories=[kp.TokenCategory.NOTE_REST], unique=True)))
+
+    def test_stage_order_follows_the_rows(self):
+        document = kp.Importer().import_string(self.content)
+
+        self.assertEqual(['4c', '4e', '4d', '4f', '4g', '4g'], kp.Document.tokens_to_encodings(
+            document.iter_tokens('stage', categories=[kp.TokenCategory.NOTE_REST])))
+        self.assertEqual([7, 8, 12, 13], [node.stage for node in
+                                          document.iter_nodes('stage', categories=[kp.TokenCategory.LYRICS])])
+
+    def test_nodes_are_filtered_by_spine_and_measure(self):
+        document = kp.Importer().import_string(self.content)
+
+        for order in ['dfs', 'stage']:
+            self.assertEqual(['**text', '*', '*', '=', '*', 'la', 'le', '*', '=', 'li', 'lo', '*-'],
+                             kp.Document.tokens_to_encodings(document.iter_tokens(order, spines=[1])))
+            self.assertEqual(['li', 'lo'], kp.Document.tokens_to_encodings(
+                document.iter_tokens(order, categories=[kp.TokenCategory.LYRICS], spines=[1], measures=3)))
+
+        first_stage, last_stage = document.measure_index.stage_range(2)
+        self.assertTrue(all(first_stage <= node.stage <= last_stage for node in document.iter_nodes(measures=(2, 2))))
+        self.assertEqual(sorted(document.iter_nodes(measures=2), key=lambda node: node.id),
+                         sorted(document.iter_nodes('stage', measures=2), key=lambda node: node.id))
+
+    def test_stage_order_stops_importing_at_early_exit(self):
+        document = kp.Importer(lazy_tokens=True, intern_tokens=False).import_string(self.content)
+
+        first_notes = list(itertools.islice(document.iter_tokens('stage', categories=[kp.TokenCategory.NOTE_REST]), 2))
+        self.assertEqual(['4c', '4e'], kp.Document.tokens_to_encodings(first_notes))
+        self.assertTrue(all(node.is_token_pending for node in document.tree.stages[13]))
+
+    def test_iteration_follows_the_replaced_tokens(self):
+        document = kp.Importer().import_string(self.content)
+        transposed = document.to_transposed('M2', 'up')
+
+        for order in ['dfs', 'stage']:
+            self.assertEqual([transposed.get_token(node) for node in transposed.iter_nodes(order)],
+                             list(transposed.iter_tokens(order)))
+        self.assertIn(next(transposed.iter_tokens(categories=[kp.TokenCategory.NOTE_REST])),
+                      transposed._replaced_tokens.values())
+
+    def test_invalid_arguments_raise_value_error(self):
+        document = kp.Importer().import_string(self.content)
+
+        with self.assertRaises(ValueError):
+            document.iter_nodes('bfs')
+        with self.assertRaises(ValueError):
+            document.iter_tokens(measures=(3, 1))
+        with self.assertRaises(ValueError):
+            document.iter_tokens(measures=10)
+
+    def test_tokens_traversal_skips_repeated_encodings(self):
+        document = kp.Importer().import_string(self.content)
+        traversal = TokensTraversal(True, [kp.TokenCategory.NOTE_REST])
+
+        document.tree.dfs_iterative(traversal)
+        self.assertEqual(['4c', '4d', '4g', '4e', '4f'], kp.Document.tokens_to_encodings(traversal.tokens))
+
+
+if __name__ == '__main__':
+    unittest.main()
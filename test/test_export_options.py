@@ -30,3 +30,64 @@ class TestExportOptions(unittest.TestCase):
         self.assertNotEqual(a, b)
 
 
+
+    def test_token_categories_compile_to_a_mask(self):
+        options = kp.ExportOptions(token_categories=[kp.TokenCategory.NOTE_REST])
+        self.assertEqual(kp.TokenCategory.NOTE_REST.bit, options.token_categories_mask)
+
+        options.token_categories = kp.BEKERN_CATEGORIES
+        self.assertEqual(kp.TokenCategory.mask(kp.BEKERN_CATEGORIES), options.token_categories_mask)
+        self.assertFalse(kp.TokenCategory.NOTE_REST.bit & options.token_categories_mask)
+
+    def test_compiled_plans_export_like_the_options(self):
+        document, _ = kp.load('test/resources/legacy/chor048.krn')
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=kp.Encoding.eKern,
+                                   token_categories=kp.TokenCategory.valid(include=kp.BEKERN_CATEGORIES))
+        plan = options.compile(document)
+        exporter = kp.Exporter()
+
+        self.assertEqual(exporter.export_string(document, options), exporter.export_string(document, plan))
+        for measure in range(1, 5):
+            self.assertEqual(exporter.export_string(document.measure(measure), options),
+                             exporter.export_string(document.measure(measure), plan))
+        self.assertEqual(exporter.export_many(document, options, [kp.Encoding.bKern, kp.Encoding.agnosticKern]),
+                         exporter.export_many(document, plan, [kp.Encoding.bKern, kp.Encoding.agnosticKern]))
+        self.assertEqual(list(exporter.export_fragments(document, options, 3)),
+                         list(exporter.export_fragments(document, plan, 3)))
+        self.assertEqual(exporter.export_string(document, options),
+                         exporter.export_string(document, plan.to_options()))
+
+        columnar_document = kp.ColumnarDocument(document)
+        self.assertEqual(exporter.export_string(document, options),
+                         exporter.export_string(columnar_document, options.compile(columnar_document)))
+
+    def test_compiled_plans_are_immutable_and_hashable(self):
+        document, _ = kp.load('test/resources/legacy/chor048.krn')
+        options = kp.ExportOptions(spine_types=['**kern'], instruments=['piano'])
+        plan = options.compile(document)
+
+        with self.assertRaises(AttributeError):
+            plan.kern_type = kp.Encoding.eKern
+        options.spine_types.append('**harm')
+        self.assertEqual(frozenset(['**kern']), plan.spine_types)
+
+        self.assertEqual(plan, kp.ExportOptions(spine_types=['**kern'], instruments=['piano']).compile(document))
+        self.assertEqual(1, len({plan, kp.ExportOptions(spine_types=['**kern'], instruments=['piano']).compile(document)}))
+        self.assertNotEqual(plan, kp.ExportOptions(spine_types=['**kern']).compile(document))
+        self.assertNotEqual(plan, options.compile(kp.load('test/resources/legacy/chor048.krn')[0]))
+
+    def test_plans_are_validated_for_their_document(self):
+        document, _ = kp.load('test/resources/legacy/chor048.krn')
+        other_document, _ = kp.load('test/resources/legacy/chor048.krn')
+
+        with self.assertRaises(ValueError):
+            kp.ExportOptions(to_measure=1000).compile(document)
+
+        plan = kp.ExportOptions().compile(document)
+        with self.assertRaises(ValueError):
+            kp.Exporter().export_string(other_document, plan)
+
+        document.add(other_document)
+        with self.assertRaises(ValueError):
+            kp.Exporter().export_string(document, plan)
+        kp.Exporter().export_string(document, kp.ExportOptions().compile(document))
@@ -1,5 +1,8 @@
+import io
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 import kernpy as kp
 
@@ -148,3 +151,97 @@ class ExporterTestCase(unittest.TestCase):
 
 
 
+
+    def test_export_to_writes_the_same_rows_as_export_string(self):
+        class RecordingStream:
+            def __init__(self):
+                self.lines = []
+
+            def write(self, content):
+                self.lines.append(content)
+
+            def writelines(self, lines):
+                for line in lines:
+                    self.write(line)
+
+        exporter = kp.Exporter()
+        for document in [self.doc_piano, kp.ColumnarDocument(self.doc_piano)]:
+            for options in [kp.ExportOptions(kern_type=kp.Encoding.eKern),
+                            kp.ExportOptions(from_measure=2, to_measure=4),
+                            kp.ExportOptions(to_measure=3, token_categories=kp.BEKERN_CATEGORIES)]:
+                stream = RecordingStream()
+                exporter.export_to(document, options, stream)
+                self.assertEqual(exporter.export_string(document, options), ''.join(stream.lines))
+                self.assertTrue(all(line.count('\n') == 1 and line.endswith('\n') for line in stream.lines))
+
+    def test_dump_writes_to_streams_and_validates_before_creating_the_file(self):
+        buffer = io.StringIO()
+        kp.dump(self.doc_piano, buffer, encoding=kp.Encoding.eKern)
+        self.assertEqual(kp.dumps(self.doc_piano, encoding=kp.Encoding.eKern), buffer.getvalue())
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, 'nested', 'score.krn')
+            kp.dump(self.doc_piano, path, from_measure=2, to_measure=3)
+            with open(path) as f:
+                self.assertEqual(kp.dumps(self.doc_piano, from_measure=2, to_measure=3), f.read())
+
+            invalid_path = os.path.join(output_dir, 'invalid.krn')
+            with self.assertRaises(ValueError):
+                kp.dump(self.doc_piano, invalid_path, from_measure=-1)
+            self.assertFalse(os.path.exists(invalid_path))
+
+    def test_export_many_is_the_export_of_every_encoding(self):
+        exporter = kp.Exporter()
+        for document in [self.doc_piano, kp.ColumnarDocument(self.doc_piano)]:
+            for options in [kp.ExportOptions(),
+                            kp.ExportOptions(from_measure=2, to_measure=4, token_categories=kp.BEKERN_CATEGORIES)]:
+                contents = exporter.export_many(document, options)
+
+                self.assertEqual(list(kp.Encoding), list(contents.keys()))
+                for encoding, content in contents.items():
+                    options.kern_type = encoding
+                    self.assertEqual(exporter.export_string(document, options), content)
+
+    def test_export_many_renders_every_token_once_per_encoding(self):
+        document = kp.Importer().import_string('**kern\t**kern\n*clefG2\t*clefG2\n=1\t=1\n4c\t4c\n4c\t4c\n*-\t*-\n')
+        encodings = [kp.Encoding.eKern, kp.Encoding.bKern]
+        buffers = {encoding: io.StringIO() for encoding in encodings}
+
+        with patch.object(kp.Exporter, '_export_token_with_clef',
+                          wraps=kp.Exporter._export_token_with_clef) as export_token_with_clef:
+            kp.Exporter().export_many_to(document, kp.ExportOptions(), buffers)
+
+        distinct_tokens = {id(node.token) for stage in document.tree.stages[1:] for node in stage}
+        self.assertEqual(len(encodings) * len(distinct_tokens), export_token_with_clef.call_count)
+        for encoding in encodings:
+            self.assertEqual(kp.dumps(document, encoding=encoding), buffers[encoding].getvalue())
+
+    def test_export_many_validates_the_options(self):
+        with self.assertRaises(ValueError):
+            kp.Exporter().export_many(self.doc_piano, kp.ExportOptions(from_measure=-1))
+
+    def test_tokenizers_are_reused_between_exports(self):
+        options = kp.ExportOptions(kern_type=kp.Encoding.bKern)
+
+        with patch.object(kp.TokenizerFactory, 'create', wraps=kp.TokenizerFactory.create) as create:
+            first = kp.Exporter().export_string(self.doc_piano, options)
+            created = create.call_count
+            second = kp.Exporter().export_string(self.doc_piano, kp.ExportOptions(kern_type=kp.Encoding.bKern))
+
+        self.assertEqual(first, second)
+        self.assertLessEqual(created, 1)
+        self.assertEqual(created, create.call_count)
+
+    def test_repeated_tokens_are_rendered_once(self):
+        document = kp.Importer(intern_tokens=True).import_string(
+            '**kern\t**kern\n*clefG2\t*clefG2\n=1\t=1\n4c\t4c\n4c\t4c\n*-\t*-\n')
+        exporter = kp.Exporter()
+
+        for encoding in [kp.Encoding.eKern, kp.Encoding.agnosticKern]:
+            with patch.object(kp.Exporter, '_export_token_with_clef',
+                              wraps=kp.Exporter._export_token_with_clef) as export_token_with_clef:
+                content = exporter.export_string(document, kp.ExportOptions(kern_type=encoding))
+            self.assertEqual(content, kp.dumps(document, encoding=encoding))
+            distinct_tokens = {id(node.token) for stage in document.tree.stages[1:] for node in stage}
+            self.assertEqual(len(distinct_tokens), export_token_with_clef.call_count)
+            self.assertLess(export_token_with_clef.call_count, 2 * (len(document.tree.stages) - 1))
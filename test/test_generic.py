@@ -286,6 +286,42 @@ class GenericTestCase(unittest.TestCase):
         self.assertFalse(kp.is_monophonic(doc), "Document should not be monophonic")
 
 
+class LoadManyTestCase(unittest.TestCase):
+    paths = [
+        'test/resources/legacy/chor001.krn',
+        'test/resources/legacy/chor048.krn',
+        'test/resources/samples/wrong_header.krn',
+        'test/resources/legacy/non_existing_file.krn',
+    ]
+
+    def test_load_many_matches_load(self):
+        results = list(kp.load_many(self.paths[:2], workers=2))
+
+        self.assertEqual(self.paths[:2], [path for path, _, _ in results])
+        for path, document, errors in results:
+            expected_document, expected_errors = kp.load(path)
+            self.assertEqual(kp.dumps(expected_document), kp.dumps(document))
+            self.assertEqual(expected_errors, errors)
+
+    def test_load_many_collects_exceptions(self):
+        results = {path: (document, errors) for path, document, errors in
+                   kp.load_many(self.paths, workers=2, chunksize=2, ordered=False)}
+
+        self.assertEqual(set(self.paths), set(results.keys()))
+        document, errors = results['test/resources/legacy/non_existing_file.krn']
+        self.assertIsNone(document)
+        self.assertEqual(1, len(errors))
+        self.assertIsNotNone(results['test/resources/legacy/chor001.krn'][0])
+
+    def test_load_many_in_current_process(self):
+        results = list(kp.load_many(self.paths, workers=1))
+        self.assertEqual(self.paths, [path for path, _, _ in results])
+
+    def test_load_many_wrong_workers(self):
+        with self.assertRaises(ValueError):
+            list(kp.load_many(self.paths, workers=0))
+
+
 class MergeInternalStrategiesTestCase(unittest.TestCase):
     MERGE_RESOURCES_DIR = Path('test/resources/merge')
     GRANDSTAFF_PATH = Path('test/resources/grandstaff/5901766.krn')
@@ -772,4 +808,135 @@ class MergeSpineOperationsTestCase(unittest.TestCase):
         # Assert
         self.assertIsInstance(doc, kp.Document)
         self.assertEqual(2, len(indexes))
-        self.assertIn('**kern', kp.dumps(doc))
\ No newline at end of file
+        self.assertIn('**kern', kp.dumps(doc))
+
+class IterMeasuresTestCase(unittest.TestCase):
+    path = 'test/resources/legacy/chor048.krn'
+
+    @staticmethod
+    def note_encodings(document, from_stage=0, to_stage=None):
+        return [node.token.encoding for stage in document.tree.stages[from_stage:to_stage] for node in stage
+                if node.token is not None and node.token.category == kp.TokenCategory.NOTE_REST]
+
+    def test_fragments_match_the_measures_of_the_document(self):
+        document, _ = kp.load(self.path)
+        starts = document.measure_start_tree_stages
+
+        fragments = list(kp.iter_measures(self.path, window=3))
+
+        self.assertEqual(1, fragments[0][0])
+        for (_, to_measure, _), (from_measure, _, _) in zip(fragments, fragments[1:]):
+            self.assertEqual(to_measure + 1, from_measure)
+        for from_measure, to_measure, fragment in fragments:
+            self.assertLessEqual(to_measure - from_measure + 1, 3)
+            to_stage = starts[to_measure] if to_measure < len(starts) else None
+            self.assertEqual(self.note_encodings(document, starts[from_measure - 1], to_stage),
+                             self.note_encodings(fragment))
+
+    def test_fragments_are_self_contained(self):
+        content = ('**kern\t**kern\n*clefF4\t*clefG2\n*k[b-]\t*k[b-]\n*M3/4\t*M3/4\n'
+                   '2.C\t2.c\n=1\t=1\n*\t*^\n2.D\t4d\t2f\n.\t2e\t.\n=2\t=2\t=2\n'
+                   '*clefG2\t*\t*\n2.E\t2.g\t2.a\n=3\t=3\t=3\n*-\t*-\t*-\n')
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'score.krn'
+            path.write_text(content)
+            fragments = list(kp.iter_measures(path))
+
+        self.assertEqual([(1, 1), (2, 2), (3, 3)], [(a, b) for a, b, _ in fragments])
+        self.assertEqual(
+            '**kern\t**kern\n*\t*^\n*clefF4\t*clefG2\t*clefG2\n*k[b-]\t*k[b-]\t*k[b-]\n*M3/4\t*M3/4\t*M3/4\n'
+            '*clefG2\t*\t*\n2.E\t2.g\t2.a\n=\t=\t=\n*-\t*-\t*-\n',
+            kp.dumps(fragments[2][2]))
+
+    def test_fragments_are_yielded_while_reading(self):
+        consumed = []
+
+        def lines():
+            with open(self.path, newline='', encoding='utf-8') as file:
+                for line in file:
+                    consumed.append(line)
+                    yield line
+
+        total = len(Path(self.path).read_text(encoding='utf-8').splitlines())
+        iterator = kp.iter_measures(lines(), window=2)
+        next(iterator)
+        self.assertLess(len(consumed), total / 2)
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            kp.iter_measures(self.path, window=0)
+
+
+class IterFragmentsTestCase(unittest.TestCase):
+    resources = Path('test/resources/fragments')
+
+    def test_fragments_match_the_expected_files(self):
+        for stem, window in [('chor001', 3), ('chor002', 5)]:
+            document, _ = kp.load(self.resources / 'input' / 'sub' / f'{stem}.krn')
+
+            fragments = list(kp.iter_fragments(document, window=window, spine_types=['**kern'],
+                                               include=kp.BEKERN_CATEGORIES))
+
+            expected_files = sorted((self.resources / 'output' / stem).iterdir(),
+                                    key=lambda file: int(file.stem.split('-')[1]))
+            self.assertEqual([file.stem for file in expected_files],
+                             [f'from-{from_measure}-to-{to_measure}' for from_measure, to_measure, _ in fragments])
+            for file, (_, _, content) in zip(expected_files, fragments):
+                self.assertEqual(file.read_text(), content)
+
+    def test_fragments_follow_the_stride_and_the_encoding(self):
+        document, _ = kp.load(self.resources / 'input' / 'sub' / 'chor002.krn')
+        options = dict(spine_types=['**kern'], include=kp.BEKERN_CATEGORIES, encoding=kp.Encoding.eKern)
+
+        fragments = list(kp.iter_fragments(document, window=3, stride=2, **options))
+
+        self.assertEqual([(1, 3), (3, 5), (5, 7), (7, 9)], [(a, b) for a, b, _ in fragments])
+        expected = kp.Exporter().export_fragments(
+            document, Generic.parse_options_to_ExportOptions(spine_types=['**kern'], include=kp.BEKERN_CATEGORIES,
+                                                             kern_type=kp.Encoding.normalizedKern), 3, 2)
+        for (_, _, content), (_, _, kern_content) in zip(fragments, expected):
+            self.assertTrue(content.startswith('**ekern'))
+            self.assertEqual(kern_content, kp.get_kern_from_ekern(content))
+
+    def test_no_fragments_when_the_document_is_shorter_than_the_window(self):
+        document, _ = kp.load(self.resources / 'input' / 'sub' / 'chor002.krn')
+        self.assertEqual([], list(kp.iter_fragments(document, window=100)))
+
+    def test_invalid_window_and_stride(self):
+        document, _ = kp.load(self.resources / 'input' / 'sub' / 'chor002.krn')
+        with self.assertRaises(ValueError):
+            kp.iter_fragments(document, window=0)
+        with self.assertRaises(ValueError):
+            kp.iter_fragments(document, window=2, stride=0)
+
+    def test_generate_fragments_of_many_files(self):
+        paths = [self.resources / 'input' / 'sub' / 'chor001.krn', self.resources / 'input' / 'sub' / 'chor002.krn',
+                 self.resources / 'input' / 'missing.krn']
+        with TemporaryDirectory() as directory:
+            results = list(kp.generate_fragments(paths, directory, window=5, workers=2, spine_types=['**kern'],
+                                                 include=kp.BEKERN_CATEGORIES))
+
+            self.assertEqual(paths, [path for path, _, _ in results])
+            self.assertEqual([20, 5, 0], [count for _, count, _ in results])
+            self.assertTrue(results[2][2])
+            self.assertEqual((self.resources / 'output' / 'chor002' / 'from-2-to-6.krn').read_text(),
+                             (Path(directory) / 'chor002' / 'from-2-to-6.krn').read_text())
+
+    def test_generate_fragments_validates_its_arguments_when_called(self):
+        paths = [self.resources / 'input' / 'sub' / 'chor001.krn']
+        with TemporaryDirectory() as directory:
+            for arguments in [dict(window=0), dict(window=4, stride=0), dict(window=4, workers=0),
+                              dict(window=4, chunksize=0)]:
+                with self.assertRaises(ValueError):
+                    kp.generate_fragments(paths, directory, **arguments)
+            with self.assertRaises(ValueError):
+                kp.generate_fragments(paths + [Path('test/resources/legacy/chor001.krn')], directory, window=4)
+            with self.assertRaises(ValueError):
+                kp.load_many(paths, workers=0)
+            self.assertEqual([], list(Path(directory).iterdir()))
+
+            results = list(kp.generate_fragments(paths + [Path('test/resources/legacy/chor001.krn')], directory,
+                                                 window=4, root='test/resources', workers=1))
+            self.assertEqual([21, 21], [count for _, count, _ in results])
+            self.assertEqual(21, len(list((Path(directory) / 'fragments' / 'input' / 'sub' / 'chor001').iterdir())))
+            self.assertEqual(21, len(list((Path(directory) / 'legacy' / 'chor001').iterdir())))
@@ -174,3 +174,38 @@ f'*ClefF2. '
         self.assertIsNotNone(document)
         self.assertEqual([], errors)
 
+
+    def test_lazy_tokens_import_the_same_document(self):
+        input_kern_file = 'test/resources/legacy/chor048.krn'
+        document = kp.Importer().import_file(input_kern_file)
+
+        lazy_document = kp.Importer(lazy_tokens=True).import_file(input_kern_file)
+
+        self.assertEqual(document.measures_count(), lazy_document.measures_count())
+        self.assertEqual(kp.spine_types(document), kp.spine_types(lazy_document))
+        self.assertEqual(kp.dumps(document), kp.dumps(lazy_document))
+
+    def test_lazy_tokens_are_parsed_when_accessed(self):
+        content = "**kern\t**text\n*clefG2\t*\n=1\t=1\n4c\tla\n4d\tle\n=2\t=2\n*-\t*-\n"
+        measures_count = kp.Importer().import_string(content).measures_count()
+
+        with patch.object(kp.KernSpineImporter, 'import_token', autospec=True,
+                          side_effect=kp.KernSpineImporter.import_token) as mocked_import_token:
+            document = kp.Importer(lazy_tokens=True, intern_tokens=False).import_string(content)
+            structural_calls = mocked_import_token.call_count
+
+            self.assertEqual(measures_count, document.measures_count())
+            self.assertEqual(structural_calls, mocked_import_token.call_count)
+
+            notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+            self.assertEqual(['4c', '4d'], [note.encoding for note in notes])
+            self.assertEqual(structural_calls + 2, mocked_import_token.call_count)
+
+    def test_lazy_tokens_raise_when_an_invalid_token_is_accessed(self):
+        content = "**kern\n*clefG2\n=1\n4c\n4Z\n=2\n*-\n"
+
+        document = kp.Importer(lazy_tokens=True).import_string(content)
+
+        with self.assertRaises(ValueError) as context:
+            document.get_all_tokens()
+        self.assertIn("'4Z'", str(context.exception))
@@ -5,10 +5,12 @@ from pathlib import Path
 from unittest import mock
 from unittest.mock import patch
 
+import kernpy as kp
 from kernpy.__main__ import (
     handle_ekern2kern,
     handle_kern2ekern,
     handle_polish_exporter,
+    handle_generate_fragments,
 )
 
 
@@ -115,6 +117,40 @@ class MainTestCase(unittest.TestCase):
         handle_polish_exporter(args)
         mock_polish_main.assert_called_once()
 
+    def test_generate_fragments_writes_the_expected_fragments(self):
+        resources = Path('test/resources/fragments')
+        args = mock.Mock(input_path=str(resources / 'input'), output_path=str(self.temp_path / 'fragments'),
+                         window=3, stride=1, encoding='kern', workers=1, verbose=0)
+
+        handle_generate_fragments(args)
+
+        expected_files = sorted(file.name for file in (resources / 'output' / 'chor001').iterdir())
+        fragments_directory = self.temp_path / 'fragments' / 'sub' / 'chor001'
+        self.assertEqual(expected_files, sorted(file.name for file in fragments_directory.iterdir()))
+        for name in expected_files:
+            self.assertEqual((resources / 'output' / 'chor001' / name).read_text(),
+                             (fragments_directory / name).read_text())
+
+    def test_generate_fragments_keeps_files_with_the_same_name_apart(self):
+        input_path = self.temp_path / 'input'
+        (input_path / 'a').mkdir(parents=True)
+        (input_path / 'b').mkdir()
+        shutil.copy('test/resources/legacy/chor001.krn', input_path / 'a' / 'chor.krn')
+        shutil.copy('test/resources/legacy/chor048.krn', input_path / 'b' / 'chor.krn')
+        shutil.copy('test/resources/legacy/chor048.krn', input_path / 'chor.krn')
+        args = mock.Mock(input_path=str(input_path), output_path=str(self.temp_path / 'fragments'),
+                         window=4, stride=1, encoding='kern', workers=1, verbose=0)
+
+        handle_generate_fragments(args)
+
+        for relative_path in ['a/chor.krn', 'b/chor.krn', 'chor.krn']:
+            document, _ = kp.load(input_path / relative_path)
+            expected = {f'from-{a}-to-{b}.krn': content for a, b, content in kp.iter_fragments(
+                document, window=4, spine_types=['**kern'], include=kp.BEKERN_CATEGORIES)}
+            fragments_directory = self.temp_path / 'fragments' / Path(relative_path).with_suffix('')
+            self.assertEqual(expected, {file.name: file.read_text() for file in fragments_directory.iterdir()
+                                        if file.is_file()})
+
 
 if __name__ == "__main__":
     unittest.main()
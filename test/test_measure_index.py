@@ -0,0 +1,119 @@
+import pickle
+import unittest
+
+import kernpy as kp
+
+
+class MeasureIndexTestCase(unittest.TestCase):
+    content = ('**kern\t**kern\n*clefF4\t*clefG2\n*M2/4\t*M2/4\n=1\t=1\n4C\t4c\n4D\t4d\n=2\t=2\n*\t*^\n'
+               '4E\t4e\t4g\n4F\t4f\t4a\n=3\t=3\t=3\n*\t*v\t*v\n4G\t4g\n4A\t4a\n=4\t=4\n2B\t2b\n*-\t*-\n')
+
+    def test_stage_ranges_cover_the_measures(self):
+        document = kp.Importer().import_string(self.content)
+        measure_index = document.measure_index
+
+        self.assertEqual(4, len(measure_index))
+        self.assertEqual(document.measure_start_tree_stages, [first for first, _ in measure_index.stage_ranges])
+        for (_, last), (next_first, _) in zip(measure_index.stage_ranges, measure_index.stage_ranges[1:]):
+            self.assertEqual(next_first - 1, last)
+        self.assertEqual(len(document.tree.stages) - 1, measure_index.stage_ranges[-1][1])
+
+    def test_views_keep_the_active_spines(self):
+        document = kp.Importer().import_string(self.content)
+
+        self.assertEqual((0, 1), document.measure(2).spine_ids)
+        self.assertEqual((0, 1, 1), document.measure(3).spine_ids)
+        self.assertEqual((0, 1), document.measure(4).spine_ids)
+        self.assertEqual(3, len(document.measure(3).signature_nodes))
+        self.assertEqual(['*', '*v', '*v'], [node.token.encoding for node in document.measure(3).columns])
+
+    def test_views_iterate_the_stages_of_the_measures(self):
+        document = kp.Importer().import_string(self.content)
+        view = document.measures(2, 3)
+
+        stages = list(view)
+        self.assertEqual(2, view.measures_count())
+        self.assertEqual(document.tree.stages[view.from_stage:view.to_stage + 1], stages)
+        self.assertEqual(['*', '*^'], [node.token.encoding for node in stages[0]])
+        self.assertEqual(['4A', '4a'], [node.token.encoding for node in stages[-2]])
+        self.assertEqual(['=', '='], [node.token.encoding for node in stages[-1]])
+
+    def test_views_export_like_the_measure_options(self):
+        document = kp.Importer().import_file('test/resources/legacy/base_tuplet_longer.krn')
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=kp.Encoding.normalizedKern)
+        measure_options = kp.ExportOptions(spine_types=['**kern'], kern_type=kp.Encoding.normalizedKern,
+                                           from_measure=2, to_measure=4)
+
+        self.assertEqual(kp.Exporter().export_string(document, measure_options),
+                         kp.Exporter().export_string(document.measures(2, 4), options))
+        self.assertIsNone(options.from_measure)
+        for measure in range(1, document.measures_count() + 1):
+            self.assertEqual(
+                kp.dumps(document, from_measure=measure, to_measure=measure),
+                kp.dumps(document.measure(measure)))
+
+    def test_context_rows_follow_the_spine_operations(self):
+        document = kp.Importer().import_string(self.content)
+        options = kp.ExportOptions(from_measure=3, to_measure=3)
+
+        self.assertEqual(
+            '**kern\t**kern\t**kern\n*\t*^\t*^\n*clefF4\t*clefG2\t*clefG2\n*M2/4\t*M2/4\t*M2/4\n'
+            '*\t*v\t*v\n4G\t4g\n4A\t4a\n=\t=\n2B\t2b\n*-\t*-\n',
+            kp.Exporter().export_string(document, options))
+        self.assertIs(document.measure_index.context_rows(3), document.measure_index.context_rows(3))
+
+    def test_signature_overrides_match_the_subtree_walk(self):
+        content = ('**kern\t**kern\n*clefF4\t*clefG2\n*M2/4\t*M2/4\n=1\t=1\n4C\t4c\n4D\t4d\n=2\t=2\n'
+                   '*clefG2\t*\n*M3/4\t*M3/4\n4E\t4e\n4F\t4f\n4G\t4g\n=3\t=3\n2A\t2a\n4B\t4b\n*-\t*-\n')
+        document = kp.Importer().import_string(content)
+        measure_index = document.measure_index
+        exporter = kp.Exporter()
+
+        for from_stage, _ in measure_index.stage_ranges:
+            for node in document.tree.stages[from_stage]:
+                for signature_node in node.last_signature_nodes.nodes.values():
+                    for to_stage in range(from_stage, len(document.tree.stages)):
+                        override_stage = measure_index.signature_override_stage(node, signature_node.token.__class__)
+                        self.assertEqual(
+                            bool(exporter.is_signature_cancelled(signature_node, node, from_stage, to_stage)),
+                            override_stage is not None and override_stage <= to_stage)
+
+        self.assertEqual('**kern\t**kern\n*clefG2\n*clefG2\t*\n*M3/4\t*M3/4\n4E\t4e\n4F\t4f\n4G\t4g\n=\t=\n'
+                         '2A\t2a\n4B\t4b\n*-\t*-\n',
+                         kp.Exporter().export_string(document, kp.ExportOptions(from_measure=2, to_measure=2)))
+
+    def test_signature_overrides_of_long_scores(self):
+        # the recursive walk of Exporter.is_signature_cancelled exceeded the recursion limit in long scores
+        document, _ = kp.load('test/resources/samples/piano-beethoven-sonata21-3.krn')
+        last_measure = len(document.measure_index)
+
+        measure = kp.dumps(document, from_measure=2, to_measure=last_measure)
+
+        self.assertTrue(measure.startswith('**kern'))
+
+    def test_missing_measures_raise_value_error(self):
+        document = kp.Importer().import_string(self.content)
+
+        with self.assertRaises(ValueError):
+            document.measure(0)
+        with self.assertRaises(ValueError):
+            document.measure(5)
+        with self.assertRaises(ValueError):
+            document.measures(3, 2)
+
+    def test_index_is_rebuilt_when_the_document_changes(self):
+        document = kp.Importer().import_string(self.content)
+        measure_index = document.measure_index
+        self.assertIs(measure_index, document.measure_index)
+
+        document.add(kp.Importer().import_string(self.content))
+        self.assertIsNot(measure_index, document.measure_index)
+        self.assertEqual(8, len(document.measure_index))
+
+        restored_document = pickle.loads(pickle.dumps(document))
+        self.assertIsNone(restored_document._measure_index)
+        self.assertEqual(kp.dumps(document.measure(6)), kp.dumps(restored_document.measure(6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import pickle
+import unittest
+
+import kernpy as kp
+from kernpy.core.document import TokensTraversal, TreeTraversalInterface
+
+
+class NodesTraversal(TreeTraversalInterface):
+    def __init__(self):
+        self.nodes = []
+
+    def visit(self, node):
+        self.nodes.append(node)
+
+
+class NodeIndexTestCase(unittest.TestCase):
+    content = ('!!!COM: Anonymous\n**kern\t**text\n*Ipiano\t*\n*clefG2\t*\n=1\t=1\n*^\t*\n4c\t4e\tla\n'
+               '4d\t4f\tle\n*v\t*v\t*\n!! a comment\n=2\t=2\n4g\tli\n*-\t*-\n')
+
+    @staticmethod
+    def traverse_tokens(document, categories):
+        traversal = TokensTraversal(False, categories)
+        document.tree.dfs_iterative(traversal)
+        return traversal.tokens
+
+    @staticmethod
+    def traverse_document_tokens(document):
+        traversal = NodesTraversal()
+        document.tree.dfs_iterative(traversal)
+        return [document.get_token(node) for node in traversal.nodes if document.get_token(node)]
+
+    def test_nodes_are_returned_in_document_order(self):
+        document = kp.Importer().import_string(self.content)
+
+        for categories in [None, [kp.TokenCategory.NOTE_REST], [kp.TokenCategory.NOTE_REST, kp.TokenCategory.LYRICS,
+                                                                kp.TokenCategory.BARLINES]]:
+            expected_tokens = self.traverse_tokens(document, categories)
+            actual_tokens = [node.token for node in document.tree.node_index.nodes(categories)]
+            self.assertEqual([id(token) for token in expected_tokens], [id(token) for token in actual_tokens])
+
+    def test_queries_use_the_index(self):
+        document = kp.Importer().import_string(self.content)
+
+        # The notes of the first subspine are followed by the notes after the join
+        self.assertEqual(['4c', '4d', '4g', '4e', '4f'],
+                         kp.Document.tokens_to_encodings(document.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+        self.assertEqual(['**kern', '**text'], [token.encoding for token in document.get_header_nodes()])
+        self.assertEqual(['!!!COM: Anonymous', '!! a comment'], document.get_metacomments())
+        self.assertEqual(['*Ipiano'], kp.Document.tokens_to_encodings(document.get_voices()))
+
+    def test_spine_tokens(self):
+        document = kp.Importer().import_string(self.content)
+
+        self.assertEqual(['**text', '*', '*', '=', '*', 'la', 'le', '*', '=', 'li', '*-'],
+                         kp.Document.tokens_to_encodings(document.get_spine_tokens(1)))
+        self.assertEqual(['4c', '4d', '4g', '4e', '4f'],
+                         kp.Document.tokens_to_encodings(document.get_spine_tokens(0, [kp.TokenCategory.NOTE_REST])))
+        self.assertEqual([], document.get_spine_tokens(2))
+
+    def test_structural_queries_do_not_import_pending_tokens(self):
+        document = kp.Importer(lazy_tokens=True, intern_tokens=False).import_string(self.content)
+
+        document.get_voices()
+        document.get_header_nodes()
+        document.get_metacomments()
+        self.assertTrue(all(node.is_token_pending for node in document.tree.stages[7]))
+
+        notes = document.get_all_tokens([kp.TokenCategory.NOTE_REST])
+        self.assertEqual(['4c', '4d', '4g', '4e', '4f'], kp.Document.tokens_to_encodings(notes))
+        self.assertFalse(any(node.is_token_pending for node in document.tree.stages[7]))
+
+    def test_reindex_moves_replaced_tokens(self):
+        document = kp.Importer().import_string(self.content)
+        node = document.tree.stages[7][0]
+        previous_category = node.token.category
+
+        node.token = kp.SimpleToken('4c', kp.TokenCategory.OTHER)
+        document.tree.node_index.reindex(node, previous_category)
+
+        self.assertEqual(['4d', '4g', '4e', '4f'],
+                         kp.Document.tokens_to_encodings(document.get_all_tokens([kp.TokenCategory.NOTE_REST])))
+        self.assertEqual(['4c'], kp.Document.tokens_to_encodings(document.get_all_tokens([kp.TokenCategory.OTHER])))
+
+    def test_contains_checks_the_node_ids(self):
+        document = kp.Importer().import_string(self.content)
+        other_document = kp.Importer().import_string(self.content)
+        node_index = document.tree.node_index
+
+        self.assertTrue(all(node_index.contains(node) for stage in document.tree.stages for node in stage))
+        self.assertFalse(any(node_index.contains(node) for stage in other_document.tree.stages for node in stage))
+
+        last_node = document.tree.stages[-1][0]
+        node = document.tree.add_node(len(document.tree.stages), last_node, None, None, None)
+        self.assertTrue(node_index.contains(node))
+        self.assertFalse(other_document.tree.node_index.contains(node))
+
+    def test_copies_have_their_own_index(self):
+        document = kp.Importer().import_string(self.content)
+
+        for copied_document in [document.clone(), pickle.loads(pickle.dumps(document)),
+                                document.to_transposed('M2', 'up')]:
+            notes = copied_document.get_all_tokens([kp.TokenCategory.NOTE_REST])
+            self.assertEqual(5, len(notes))
+            self.assertTrue(all(copied_document.get_token(node) is token for node, token in zip(
+                copied_document.tree.node_index.nodes([kp.TokenCategory.NOTE_REST]), notes)))
+            self.assertEqual(self.traverse_document_tokens(copied_document), copied_document.get_all_tokens())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -62,4 +62,11 @@ class DynSpineImporterTest(unittest.TestCase):
     def test_normal_dynamics(self):
         encoding_input = "random string"
         self.do_test_token_exported(encoding_input, "random string")
-        self.do_test_token_category(encoding_input, kp.TokenCategory.DYNAMICS)
\ No newline at end of file
+        self.do_test_token_category(encoding_input, kp.TokenCategory.DYNAMICS)
+
+    def test_dynamics_importer_is_reused(self):
+        importer = kp.DynSpineImporter()
+        dynam_importer = importer.dynam_importer
+        importer.import_token("ff")
+        importer.import_token("=")
+        self.assertIs(dynam_importer, importer.dynam_importer)
@@ -143,6 +143,111 @@ class KernSpineImporterTest(unittest.TestCase):
     def test_load_instrument_with_string(self):
         self.do_test_token_category("*I\"Cklav", kp.TokenCategory.INSTRUMENTS)
 
+    def test_parse_cache_hits_and_misses(self):
+        kp.KernSpineImporter.cache_clear()
+        importer = kp.KernSpineImporter()
+        importer.import_token("4c")
+        importer.import_token("4c")
+        kp.KernSpineImporter().import_token("4c")
+
+        info = kp.KernSpineImporter.cache_info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(2, info.hits)
+        self.assertEqual(1, info.currsize)
+
+    def test_parse_cache_returns_copies(self):
+        importer = kp.KernSpineImporter()
+        first = importer.import_token("=-")
+        second = importer.import_token("=-")
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+        first.hidden = False
+        self.assertTrue(second.hidden)
+
+    def test_parse_cache_is_not_changed_by_the_returned_tokens(self):
+        importer = kp.KernSpineImporter()
+        for encoding in ["8dd", "4c 4e"]:
+            expected = importer.import_token(encoding).export()
+            token = importer.import_token(encoding)
+            for container in vars(token).values():
+                if isinstance(container, list):
+                    container.append(kp.Subtoken("x", kp.TokenCategory.DECORATION))
+            self.assertFalse(token.is_frozen)
+
+            self.assertEqual(expected, importer.import_token(encoding).export())
+            self.assertEqual(expected, kp.KernSpineImporter().import_token(encoding).export())
+
+        subtoken = importer.import_token("8dd").pitch_duration_subtokens[0]
+        with self.assertRaises(AttributeError):
+            subtoken.encoding = "4"
+
+    def test_parse_cache_does_not_store_errors(self):
+        kp.KernSpineImporter.cache_clear()
+        importer = kp.KernSpineImporter()
+        with self.assertRaises(ValueError):
+            importer.import_token("ñ")
+        self.assertEqual(0, kp.KernSpineImporter.cache_info().currsize)
+
+    def test_parse_cache_does_not_share_bounding_boxes(self):
+        importer = kp.KernSpineImporter()
+        first = importer.import_token("*xywh-P1:10,20,30,40")
+        second = importer.import_token("*xywh-P1:10,20,30,40")
+        self.assertIsNot(first.bounding_box, second.bounding_box)
+
+    def test_parse_cache_disabled(self):
+        kp.KernSpineImporter.cache_clear()
+        importer = kp.KernSpineImporter(cache=False)
+        importer.import_token("4c")
+        importer.import_token("4c")
+        self.assertEqual(0, kp.KernSpineImporter.cache_info().currsize)
+
+    def test_parser_is_reused_between_tokens(self):
+        importer = kp.KernSpineImporter(cache=False, fast_path=False)
+        chord = importer.import_token("4c 4e")
+        parser = importer.parser
+
+        with self.assertRaises(ValueError):
+            importer.import_token("ñ")
+        note = importer.import_token("4f)")
+
+        self.assertIs(parser, importer.parser)
+        self.assertEqual(kp.TokenCategory.CHORD, chord.category)
+        self.assertEqual(kp.TokenCategory.NOTE_REST, note.category)
+        self.assertEqual("4@f·)", note.export())
+
+    def test_fast_path_builds_simple_tokens(self):
+        recognizer = kp.KernSpineImporter().fast_recognizer
+        self.assertIsInstance(recognizer.recognize("4.cc#L"), kp.NoteRestToken)
+        self.assertEqual(kp.TokenCategory.BARLINES, recognizer.recognize("=12").category)
+        self.assertIsNone(recognizer.recognize("4c 4e"))
+        self.assertIsNone(recognizer.recognize("*ped"))
+
+    def test_fast_path_parity_with_antlr(self):
+        importer = kp.KernSpineImporter(cache=False, parity_check=True)
+        fast_recognizer = importer.fast_recognizer
+
+        encodings = set()
+        for path in Path('test/resources').rglob('*.krn'):
+            is_kern_column = None
+            for line in path.read_text(encoding='utf-8', errors='ignore').splitlines():
+                columns = line.split('\t')
+                if line.startswith('**'):
+                    is_kern_column = [column == '**kern' for column in columns]
+                elif is_kern_column and len(columns) == len(is_kern_column) and not line.startswith('!'):
+                    encodings.update(column for column, is_kern in zip(columns, is_kern_column)
+                                     if is_kern and column and column not in kp.core.tokens.SPINE_OPERATIONS)
+
+        recognized = [encoding for encoding in encodings if fast_recognizer.recognize(encoding) is not None]
+        self.assertGreater(len(recognized), 0)
+        parity_errors = []
+        for encoding in recognized:
+            try:
+                importer.import_token(encoding)
+            except ValueError as e:
+                parity_errors.append(str(e))
+        self.assertEqual([], parity_errors)
+
 
 if __name__ == '__main__':
     unittest.main()
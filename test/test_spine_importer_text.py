@@ -1,6 +1,7 @@
 import unittest
 import logging
 import sys
+from unittest.mock import patch
 
 import kernpy as kp
 
@@ -62,4 +63,19 @@ class TextSpineImporterTest(unittest.TestCase):
     def test_normal_lyrics(self):
         encoding_input = "Don't stop me now"
         self.do_test_token_exported(encoding_input, "Don't stop me now")
-        self.do_test_token_category(encoding_input, kp.TokenCategory.LYRICS)
\ No newline at end of file
+        self.do_test_token_category(encoding_input, kp.TokenCategory.LYRICS)
+
+    def test_lyrics_are_not_parsed(self):
+        importer = kp.TextSpineImporter()
+        with patch.object(importer.kern_spine_importer, 'import_token') as kern_import_token:
+            token = importer.import_token("Don't")
+        kern_import_token.assert_not_called()
+        self.assertEqual(kp.TokenCategory.LYRICS, token.category)
+
+    def test_null_is_parsed(self):
+        importer = kp.TextSpineImporter()
+        with patch.object(importer.kern_spine_importer, 'import_token',
+                          wraps=importer.kern_spine_importer.import_token) as kern_import_token:
+            token = importer.import_token(".")
+        kern_import_token.assert_called_once_with(".")
+        self.assertEqual(kp.TokenCategory.EMPTY, token.category)
@@ -0,0 +1,77 @@
+import glob
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import kernpy as kp
+
+
+class ThreadSafetyTestCase(unittest.TestCase):
+    lazy_path = 'test/resources/mozart/concerto-piano-12-allegro.krn'
+    paths = sorted(glob.glob('test/resources/legacy/*.krn')) + [lazy_path]
+    workers = 8
+
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = {path: kp.dumps(kp.Importer().import_file(path)) for path in cls.paths}
+
+    def import_in_threads(self, **importer_options):
+        def import_file(path):
+            document = kp.Importer(**importer_options).import_file(path)
+            return path, kp.dumps(document), [node.id for stage in document.tree.stages for node in stage]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(import_file, self.paths * 2))
+
+        for path, content, node_ids in results:
+            self.assertEqual(self.expected[path], content, path)
+            self.assertEqual(list(range(len(node_ids))), node_ids, path)
+
+    def test_import_in_threads(self):
+        self.import_in_threads()
+
+    def test_import_in_threads_without_caches(self):
+        # Every thread runs the ANTLR parser
+        kp.KernSpineImporter.cache_clear()
+        self.import_in_threads(intern_tokens=False)
+
+    def test_import_in_threads_with_lazy_tokens(self):
+        self.import_in_threads(lazy_tokens=True, intern_tokens=False)
+
+    def test_read_lazy_tokens_in_threads(self):
+        document = kp.Importer(lazy_tokens=True, intern_tokens=False).import_file(self.lazy_path)
+        kp.KernSpineImporter.cache_clear()  # every thread parses the lazy tokens with its own ANTLR parser
+        barrier = threading.Barrier(self.workers)
+
+        def export(_):
+            barrier.wait()
+            return kp.dumps(document)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(export, range(self.workers)))
+
+        self.assertEqual([self.expected[self.lazy_path]] * self.workers, results)
+
+    def test_every_thread_has_its_own_parser(self):
+        importer = kp.KernSpineImporter(cache=False, fast_path=False)
+        barrier = threading.Barrier(self.workers)
+
+        def parse(_):
+            barrier.wait()
+            self.assertEqual('4c', importer.import_token('4c').encoding)
+            return importer.parser
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            parsers = list(executor.map(parse, range(self.workers)))
+
+        self.assertEqual(self.workers, len({id(parser) for parser in parsers}))
+        self.assertEqual(self.workers, len({id(parser._interp.decisionToDFA) for parser in parsers}))
+
+    def test_importer_can_be_reused(self):
+        importer = kp.Importer()
+        first = importer.import_file(self.paths[0])
+        second = importer.import_file(self.paths[1])
+
+        self.assertEqual(self.expected[self.paths[0]], kp.dumps(first))
+        self.assertEqual(self.expected[self.paths[1]], kp.dumps(second))
+        self.assertIsNot(first.tree, second.tree)
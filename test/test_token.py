@@ -52,6 +52,32 @@ class TokenCategoryHierarchyTestCase(unittest.TestCase):
         self.assertTrue(kp.TokenCategoryHierarchyMapper.is_child(kp.TokenCategory.CORE, kp.TokenCategory.CORE))
         self.assertTrue(kp.TokenCategoryHierarchyMapper.is_child(kp.TokenCategory.HARMONY, kp.TokenCategory.HARMONY))
 
+    def test_is_child_of_nested_categories(self):
+        self._is_child(kp.TokenCategory.NOTE_REST, kp.TokenCategory.NOTE)
+        self._is_child(kp.TokenCategory.NOTE_REST, kp.TokenCategory.PITCH)
+        self._is_child(kp.TokenCategory.NOTE, kp.TokenCategory.DECORATION)
+        self._is_not_child(kp.TokenCategory.NOTE, kp.TokenCategory.NOTE_REST)
+        self._is_not_child(kp.TokenCategory.NOTE, kp.TokenCategory.DURATION)
+
+    def test_hierarchy_queries(self):
+        self.assertSetEqual({kp.TokenCategory.DURATION, kp.TokenCategory.NOTE, kp.TokenCategory.REST},
+                            kp.TokenCategory.children(kp.TokenCategory.NOTE_REST))
+        self.assertSetEqual({kp.TokenCategory.DURATION, kp.TokenCategory.PITCH, kp.TokenCategory.DECORATION,
+                             kp.TokenCategory.ALTERATION, kp.TokenCategory.REST},
+                            kp.TokenCategory.leaves(kp.TokenCategory.NOTE_REST))
+        self.assertSetEqual(set(), kp.TokenCategory.leaves(kp.TokenCategory.PITCH))
+        self.assertSetEqual({kp.TokenCategory.CORE, kp.TokenCategory.NOTE_REST},
+                            kp.TokenCategoryHierarchyMapper.ancestors(kp.TokenCategory.NOTE))
+        self.assertSetEqual(set(kp.TokenCategory), kp.TokenCategory.all())
+
+    def test_masks(self):
+        mask = kp.TokenCategory.valid_mask(include={kp.TokenCategory.CORE}, exclude={kp.TokenCategory.NOTE})
+        self.assertSetEqual(kp.TokenCategory.valid(include={kp.TokenCategory.CORE}, exclude={kp.TokenCategory.NOTE}),
+                            {category for category in kp.TokenCategory if category.bit & mask})
+        self.assertEqual(kp.TokenCategory.NOTE_REST.bit | kp.TokenCategory.BARLINES.bit,
+                         kp.TokenCategory.mask([kp.TokenCategory.NOTE_REST, kp.TokenCategory.BARLINES]))
+        self.assertEqual(kp.TokenCategory.valid_mask(), kp.TokenCategory.mask(None))
+
 
     def test_match_included_category(self):
         """Test that a category matches when it's explicitly included."""
@@ -0,0 +1,87 @@
+import copy
+import pickle
+import unittest
+
+import kernpy as kp
+
+
+class TokenPoolTestCase(unittest.TestCase):
+    content = '**kern\t**text\n*clefG2\t*\n=1\t=1\n4c\tla\n4c\tla\n=2\t=2\n4c\tle\n*-\t*-\n'
+
+    def test_equal_cells_share_one_frozen_token(self):
+        document = kp.Importer(intern_tokens=True).import_string(self.content)
+        other_document = kp.Importer(intern_tokens=True).import_string(self.content)
+
+        notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        other_notes = other_document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        self.assertEqual(1, len({id(note) for note in notes + other_notes}))
+        self.assertTrue(notes[0].is_frozen)
+        self.assertTrue(all(subtoken.is_frozen for subtoken in notes[0].pitch_duration_subtokens))
+
+    def test_spine_types_do_not_share_tokens(self):
+        pool = kp.TokenPool()
+        kern_token = pool.request('**kern', '=', lambda: kp.KernSpineImporter().import_token('='))
+        text_token = pool.request('**text', '=', lambda: kp.TextSpineImporter().import_token('='))
+
+        self.assertIsNot(kern_token, text_token)
+        self.assertIs(kern_token, pool.get('**kern', '='))
+        self.assertIsNone(pool.get('**kern', '4c'))
+
+    def test_frozen_tokens_cannot_be_modified(self):
+        token = kp.TokenPool().request('**kern', '4c', lambda: kp.KernSpineImporter().import_token('4c'))
+
+        with self.assertRaises(AttributeError):
+            token.category = kp.TokenCategory.CORE
+        with self.assertRaises(AttributeError):
+            token.pitch_duration_subtokens[0].encoding = 'd'
+        with self.assertRaises(AttributeError):
+            token.pitch_duration_subtokens.append(kp.Subtoken('x', kp.TokenCategory.DECORATION))
+        self.assertEqual(kp.KernSpineImporter().import_token('4c'), token)
+
+        for token_copy in [copy.copy(token), copy.deepcopy(token), pickle.loads(pickle.dumps(token))]:
+            token_copy.category = kp.TokenCategory.CORE
+            self.assertEqual(kp.TokenCategory.CORE, token_copy.category)
+            token_copy.decoration_subtokens.append(kp.Subtoken('x', kp.TokenCategory.DECORATION))
+        self.assertEqual('4@c', token.export())
+        self.assertEqual(kp.TokenCategory.NOTE_REST, token.category)
+
+    def test_category_projection_does_not_modify_shared_tokens(self):
+        document = kp.Importer(intern_tokens=True).import_string(self.content)
+
+        projected_notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.CORE])
+        notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+
+        self.assertIn(kp.TokenCategory.CORE, {token.category for token in projected_notes})
+        self.assertTrue(all(note.category == kp.TokenCategory.NOTE_REST for note in notes))
+
+    def test_tokens_are_not_shared_by_default(self):
+        path = 'test/resources/legacy/chor001.krn'
+        document, _ = kp.load(path)
+        expected = kp.dumps(document)
+
+        note = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])[0]
+        self.assertFalse(note.is_frozen)
+        note.hidden = True
+        note.decoration_subtokens.append(kp.Subtoken('x', kp.TokenCategory.DECORATION))
+
+        other_document, _ = kp.load(path)
+        other_note = other_document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])[0]
+        self.assertIsNot(note, other_note)
+        self.assertFalse(other_note.hidden)
+        self.assertEqual(expected, kp.dumps(other_document))
+
+    def test_tokens_are_not_shared_when_disabled(self):
+        document = kp.Importer(intern_tokens=False).import_string(self.content)
+
+        notes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.NOTE_REST])
+        self.assertEqual(len(notes), len({id(note) for note in notes}))
+        self.assertFalse(any(note.is_frozen for note in notes))
+
+    def test_page_bounding_box_does_not_modify_the_tokens(self):
+        document = kp.Importer(intern_tokens=True).import_string(
+            '**kern\n*xywh-P1:10,20,30,40\n=1\n4c\n*xywh-P1:0,0,100,100\n4c\n*xywh-P1:10,20,30,40\n*-\n')
+
+        bounding_boxes = document.get_all_tokens(filter_by_categories=[kp.TokenCategory.BOUNDING_BOXES])
+        self.assertEqual(['10,20,30,40', '0,0,100,100', '10,20,30,40'],
+                         [token.bounding_box.xywh() for token in bounding_boxes])
+        self.assertEqual('0,0,100,100', document.page_bounding_boxes['P1'].bounding_box.xywh())
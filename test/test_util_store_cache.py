@@ -65,5 +65,39 @@ class TestStoreCache(unittest.TestCase):
         kp.TokenCategoryHierarchyMapper.nodes = original_nodes
 
 
+class TestLRUStoreCache(unittest.TestCase):
+    def test_request_uses_cache_and_counts_hits(self):
+        callback = Mock(return_value=10)
+        cache = kp.util.LRUStoreCache(maxsize=2)
+
+        self.assertEqual(10, cache.request(callback, 5))
+        self.assertEqual(10, cache.request(callback, 5))
+        callback.assert_called_once_with(5)
+        self.assertEqual(kp.util.CacheInfo(hits=1, misses=1, maxsize=2, currsize=1), cache.info())
+
+    def test_least_recently_used_entry_is_discarded(self):
+        cache = kp.util.LRUStoreCache(maxsize=2)
+        cache.request(lambda x: x + 5, 1)
+        cache.request(lambda x: x + 5, 2)
+        cache.request(lambda x: x + 5, 1)  # 2 is now the least recently used entry
+        cache.request(lambda x: x + 5, 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertIn(1, cache)
+        self.assertIn(3, cache)
+        self.assertNotIn(2, cache)
+
+    def test_clear(self):
+        cache = kp.util.LRUStoreCache()
+        cache.request(lambda x: x + 5, 1)
+        cache.request(lambda x: x + 5, 1)
+        cache.clear()
+        self.assertEqual(kp.util.CacheInfo(hits=0, misses=0, maxsize=4096, currsize=0), cache.info())
+
+    def test_wrong_maxsize(self):
+        with self.assertRaises(ValueError):
+            kp.util.LRUStoreCache(maxsize=0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,95 @@
+import os
+import unittest
+from array import array
+from tempfile import TemporaryDirectory
+
+import kernpy as kp
+
+
+class VocabularyTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.document, _ = kp.load('test/resources/legacy/chor048.krn')
+        cls.other_document, _ = kp.load('test/resources/legacy/chor001.krn')
+
+    def test_special_tokens(self):
+        vocabulary = kp.Vocabulary(['4c', '4d', '4c'])
+
+        self.assertEqual(['<unk>', '<t>', '<n>', '4c', '4d'], vocabulary.tokens)
+        self.assertEqual(5, len(vocabulary))
+        self.assertEqual(3, vocabulary.get_id('4c'))
+        self.assertEqual(kp.Vocabulary.unknown_id, vocabulary.get_id('4e'))
+        self.assertEqual('4d', vocabulary.get_token(4))
+        self.assertIn('4d', vocabulary)
+        self.assertNotIn('4e', vocabulary)
+        with self.assertRaises(ValueError):
+            vocabulary.get_token(5)
+
+    def test_export_ids_decode_to_the_exported_text(self):
+        exporter = kp.Exporter()
+        for encoding in [kp.Encoding.normalizedKern, kp.Encoding.eKern, kp.Encoding.bKern,
+                         kp.Encoding.bEkern]:
+            options = kp.ExportOptions(kern_type=encoding)
+            vocabulary = kp.Vocabulary().fit(self.document, options)
+            ids = exporter.export_ids(self.document, options, vocabulary)
+
+            self.assertIsInstance(ids, array)
+            self.assertEqual('i', ids.typecode)
+            self.assertEqual(exporter.export_string(self.document, options), vocabulary.decode(ids))
+            self.assertEqual(kp.Vocabulary.row_separator_id, ids[-1])
+            self.assertNotIn(kp.Vocabulary.unknown_id, ids)
+
+        options = kp.ExportOptions(spine_types=['**kern'], kern_type=kp.Encoding.eKern,
+                                   token_categories=kp.TokenCategory.valid(include=kp.BEKERN_CATEGORIES))
+        vocabulary = kp.Vocabulary().fit(self.document, options)
+        for document in [self.document.measure(3), kp.ColumnarDocument(self.document)]:
+            self.assertEqual(exporter.export_string(document, options),
+                             vocabulary.decode(exporter.export_ids(document, options, vocabulary)))
+        self.assertEqual(exporter.export_string(self.document, options),
+                         vocabulary.decode(exporter.export_ids(self.document, options.compile(self.document),
+                                                               vocabulary)))
+
+    def test_unknown_tokens(self):
+        options = kp.ExportOptions(kern_type=kp.Encoding.eKern)
+        vocabulary = kp.Vocabulary().fit(self.document, options)
+        exporter = kp.Exporter()
+
+        ids = exporter.export_ids(self.other_document, options, vocabulary)
+        self.assertIn(kp.Vocabulary.unknown_id, ids)
+        self.assertEqual(len(exporter.export_ids(self.other_document, options, kp.Vocabulary().fit(
+            self.other_document, options))), len(ids))
+
+        with self.assertRaises(ValueError):
+            exporter.export_ids(self.other_document, options, vocabulary, unknown='raise')
+        with self.assertRaises(ValueError):
+            exporter.export_ids(self.document, options, vocabulary, unknown='ignore')
+
+        size = len(vocabulary)
+        ids = exporter.export_ids(self.other_document, options, vocabulary, unknown='add')
+        self.assertGreater(len(vocabulary), size)
+        self.assertNotIn(kp.Vocabulary.unknown_id, ids)
+        self.assertEqual(exporter.export_string(self.other_document, options), vocabulary.decode(ids))
+
+    def test_fit_is_incremental_and_merge_keeps_the_ids(self):
+        options = kp.ExportOptions(kern_type=kp.Encoding.eKern)
+        vocabulary = kp.Vocabulary().fit(self.document, options)
+        other_vocabulary = kp.Vocabulary().fit(self.other_document, options)
+        both = kp.Vocabulary().fit(self.document, options).fit(self.other_document, options)
+
+        merged = vocabulary.merge(other_vocabulary)
+        self.assertEqual(both, merged)
+        self.assertEqual(vocabulary.tokens, merged.tokens[:len(vocabulary)])
+        self.assertEqual(set(vocabulary.tokens) | set(other_vocabulary.tokens), set(merged.tokens))
+
+    def test_save_and_load(self):
+        vocabulary = kp.Vocabulary().fit(self.document, kp.ExportOptions(kern_type=kp.Encoding.eKern))
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vocabularies', 'vocabulary.json')
+            vocabulary.save(path)
+            self.assertEqual(vocabulary, kp.Vocabulary.load(path))
+
+            with open(path, 'w') as f:
+                f.write('{"tokens": ["4c", "4d"]}')
+            with self.assertRaises(ValueError):
+                kp.Vocabulary.load(path)